@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Combined build: run inference, charts, fusion and wiki generators in one process.
+
+Each generator normally loads its own RDFManager. Run from here they all share
+one graph from the process-wide registry (see
+:func:`src.rdf_manager.acquire_rdf_manager`), so the ontology is parsed and
+held in memory once per build.
+
+Usage:
+  python -m src.build_all
+  python -m src.build_all --steps infer charts fusion wiki --profile ontology
+  python -m src.build_all --profile-load [tmp/load-profile.json]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.rdf_manager import DEFAULT_LOAD_PROFILE, RDFManager, acquire_rdf_manager, release_rdf_manager, write_load_profile
+
+logger = logging.getLogger(__name__)
+
+# Build steps in the order they run (inference first so later steps see inferred triples)
+STEPS = ("infer", "charts", "fusion", "wiki")
+DEFAULT_STEPS = ("charts", "fusion", "wiki")
+
+
+def run_infer(rdf: RDFManager, args: argparse.Namespace) -> None:
+    """Run inference CONSTRUCT queries and reload any TTL files they rewrote."""
+    from src.infer.run_inference import run_inference
+
+    run_inference(
+        args.infer_sparql_dir,
+        args.infer_out,
+        args.ttl_dir,
+        args.profile,
+        rdf=rdf,
+        fixpoint=args.infer_fixpoint,
+        workers=args.infer_workers,
+        incremental=not args.infer_force,
+        engine=args.infer_engine,
+    )
+    # Inferred TTL usually lands under ttl_dir; pick it up for the remaining steps
+    rdf.refresh()
+
+
+def run_charts(rdf: RDFManager, args: argparse.Namespace) -> None:
+    """Generate Vega-Lite charts for every chart config."""
+    from src.charting.chart_generator import ChartGenerator
+
+    gen = ChartGenerator(ttl_dir=args.ttl_dir, sparql_dir=args.sparql_dir, rdf=rdf)
+    configs = sorted(args.charts_dir.glob("*.yaml")) if args.charts_dir.is_dir() else [args.charts_dir]
+    for config_path in configs:
+        result = gen.process_config(gen.load_config(config_path))
+        gen.write_output(result, args.figures_dir, formats=args.chart_formats)
+    logger.info(f"Generated {len(configs)} chart(s) to {args.figures_dir}")
+
+
+def run_fusion(rdf: RDFManager, args: argparse.Namespace) -> None:
+    """Generate .fuse snippets and the categories summary."""
+    from src.fuse_generator import FuseGenerator
+
+    gen = FuseGenerator(
+        ttl_dir=args.ttl_dir,
+        sparql_dir=args.sparql_dir,
+        output_dir=args.fuse_out,
+        template_path=args.fuse_template,
+        rdf=rdf,
+    )
+    if not gen.generate_all_motifs():
+        raise RuntimeError("no .fuse snippets generated")
+
+
+def run_wiki(rdf: RDFManager, args: argparse.Namespace) -> None:
+    """Generate the wiki site."""
+    from src.wiki.generator import WikiGenerator
+
+    gen = WikiGenerator(args.wiki_config, rdf=rdf)
+    gen.output_dir = args.site_out
+    gen.generate_all()
+
+
+RUNNERS = {"infer": run_infer, "charts": run_charts, "fusion": run_fusion, "wiki": run_wiki}
+
+
+def build_all(args: argparse.Namespace, steps: Optional[List[str]] = None) -> Dict[str, bool]:
+    """Run the requested build steps against one shared ontology graph.
+
+    A failing step is logged and does not stop the remaining ones.
+
+    Args:
+        args: Parsed command line arguments (see :func:`main`)
+        steps: Step names to run (default: DEFAULT_STEPS); always run in STEPS order
+
+    Returns:
+        Mapping of step name -> True if it succeeded
+    """
+    steps = [s for s in STEPS if s in (steps or DEFAULT_STEPS)]
+    rdf = acquire_rdf_manager(args.ttl_dir, profile=args.profile, workers=args.workers, store=args.store, rdfs=args.rdfs)
+    results = {}
+    try:
+        for step in steps:
+            start = time.perf_counter()
+            try:
+                RUNNERS[step](rdf, args)
+                results[step] = True
+                logger.info(f"✓ {step} done in {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                results[step] = False
+                logger.error(f"✗ {step} failed: {e}")
+        info = rdf.result_cache_info()
+        logger.info(f"Query result cache: {info['hits']} hit(s), {info['misses']} miss(es), {info['entries']} entries")
+        if getattr(args, "profile_load", None):
+            write_load_profile(rdf, args.profile_load)
+    finally:
+        release_rdf_manager(rdf)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run inference, chart, fusion and wiki generation against one shared graph")
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(DEFAULT_STEPS), help="Build steps to run")
+    parser.add_argument("--ttl-dir", type=Path, default=Path("ttl"), help="Directory of source TTL files")
+    parser.add_argument("--sparql-dir", type=Path, default=Path("sparql"), help="Directory of SPARQL queries")
+    parser.add_argument("--profile", default=None, help="RDFManager load profile shared by every step")
+    parser.add_argument("--store", choices=("memory", "array", "image"), default="memory", help="Triple store backend")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to parse TTL files (0 = one per CPU)")
+    parser.add_argument("--rdfs", action="store_true", help="Materialize RDFS entailments of the schema files before running the steps")
+    parser.add_argument(
+        "--profile-load",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_LOAD_PROFILE,
+        default=None,
+        metavar="JSON",
+        help=f"Print per-file and per-directory TTL load timings and write them as JSON (default {DEFAULT_LOAD_PROFILE})",
+    )
+    parser.add_argument("--infer-sparql-dir", type=Path, default=Path("sparql/infer"), help="Inference CONSTRUCT queries")
+    parser.add_argument("--infer-out", type=Path, default=Path("ttl/infer"), help="Output directory for inferred TTL")
+    parser.add_argument("--infer-fixpoint", action="store_true", help="Iterate the inference rules until no new triples are inferred")
+    parser.add_argument("--infer-workers", type=int, default=1, help="Independent inference rules run concurrently (0: one per CPU core)")
+    parser.add_argument("--infer-engine", choices=("compiled", "sparql"), default="compiled", help="Inference rule evaluation engine")
+    parser.add_argument("--infer-force", action="store_true", help="Re-run every inference rule even if its inputs are unchanged")
+    parser.add_argument("--charts-dir", type=Path, default=Path("charts"), help="Chart config file or directory")
+    parser.add_argument("--figures-dir", type=Path, default=Path("papers/figures"), help="Chart output directory")
+    parser.add_argument("--chart-formats", nargs="+", default=["json", "html"], help="Chart output formats")
+    parser.add_argument("--fuse-out", type=Path, default=Path("tmp/fuse"), help="Output directory for .fuse snippets")
+    parser.add_argument(
+        "--fuse-template", type=Path, default=Path("src/template/fuse-motifs.mustache"), help="Mustache template for snippets"
+    )
+    parser.add_argument("--wiki-config", type=Path, default=Path("config/wiki.yaml"), help="Wiki configuration file")
+    parser.add_argument("--site-out", type=Path, default=Path("tmp/site"), help="Wiki output directory")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    results = build_all(args, args.steps)
+    failed = [step for step, ok in results.items() if not ok]
+    if failed:
+        print(f"✗ Failed steps: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    print(f"✓ Built {', '.join(results)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
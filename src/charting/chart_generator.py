@@ -22,7 +22,7 @@ import argparse
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from src.rdf_manager import RDFManager
+from src.rdf_manager import RDFManager, acquire_rdf_manager, release_rdf_manager
 
 # rdflib is a dependency of RDFManager; ensure it's available at runtime
 
@@ -41,23 +41,39 @@ log = logging.getLogger(__name__)
 class ChartGenerator:
     """Generate Vega-Lite charts from SPARQL queries and YAML configs."""
 
-    def __init__(self, ttl_dir: Path = None, sparql_dir: Path = None):
+    def __init__(
+        self,
+        ttl_dir: Path = None,
+        sparql_dir: Path = None,
+        profile: Optional[str] = None,
+        rdf: Optional[RDFManager] = None,
+    ):
         """
         Initialize chart generator.
 
         Args:
             ttl_dir: Directory containing TTL files (default from config)
             sparql_dir: Directory containing SPARQL queries (default from config)
+            profile: Optional RDFManager load profile name (default loads all TTL)
+            rdf: Already-loaded RDFManager to query (default: the shared graph for ttl_dir/profile)
         """
         paths = get_paths()
         self.ttl_dir = ttl_dir or paths.get("ttl", Path("ttl"))
         self.sparql_dir = sparql_dir or paths.get("sparql", Path("sparql"))
 
-        # Use modular RDFManager to load and manage TTL ontology
-        self.rdf = RDFManager(self.ttl_dir)
+        # Use modular RDFManager to load and manage TTL ontology (shared across generators)
+        self._shared_rdf = rdf is None
+        self.rdf = rdf or acquire_rdf_manager(self.ttl_dir, profile=profile)
+        # Rows of query files run ahead of time by prefetch(), keyed by resolved query path
+        self._prefetched: Dict[str, List[Dict[str, Any]]] = {}
         stats = self.rdf.graph_stats()
         log.info(f"Ontology loaded: {stats.get('triples', 0)} triples; subjects={stats.get('subjects')}")
 
+    def close(self) -> None:
+        """Release the shared ontology graph acquired by this generator."""
+        if self._shared_rdf:
+            release_rdf_manager(self.rdf)
+            self._shared_rdf = False
 
     def _execute_sparql(self, query_path: str) -> List[Dict[str, Any]]:
         """
@@ -69,6 +85,11 @@ class ChartGenerator:
         Returns:
             List of result rows as dictionaries
         """
+        if query_path in self._prefetched:
+            rows = self._prefetched.pop(query_path)
+            log.info(f"Query returned {len(rows)} rows (prefetched)")
+            return rows
+
         # Try to read as a file first
         query_file = Path(query_path)
         
@@ -117,20 +138,44 @@ class ChartGenerator:
                 raise FileNotFoundError(f"SPARQL file not found: {p}")
 
         if is_inline:
-            result = self.rdf.execute_query(q_text)
+            rows = self.rdf.query_dicts(q_text)
         else:
             # If this is not inline and not an explicit path, resolve strictly relative to
             # the configured SPARQL directory and fail if not present.
             qpath = Path(self.sparql_dir) / q_text
             if qpath.exists():
-                result = self.rdf.execute_query_file(qpath)
+                rows = self.rdf.query_file_dicts(qpath)
             else:
                 raise FileNotFoundError(f"SPARQL file not found: {qpath}")
 
-        rows = self.rdf.results_to_dicts(result)
         log.info(f"Query returned {len(rows)} rows")
         return rows
 
+    def _statistics_rows(self, histogram: str) -> List[Dict[str, Any]]:
+        """
+        Return rows from the graph's maintained histograms instead of a SPARQL aggregate.
+
+        Args:
+            histogram: 'predicates' (one row per predicate with triple and
+                distinct subject/object counts) or 'types' (one row per class
+                with its instance count)
+
+        Returns:
+            List of result rows as dictionaries, largest first
+        """
+        histograms = self.rdf.graph_histograms()
+        if histogram == "predicates":
+            return [
+                {"predicate": RDFManager._extract_localname(iri), "predicate_uri": iri, **counts}
+                for iri, counts in histograms["predicates"].items()
+            ]
+        if histogram == "types":
+            return [
+                {"type": RDFManager._extract_localname(iri), "type_uri": iri, "instances": count}
+                for iri, count in histograms["types"].items()
+            ]
+        raise ValueError(f"Unknown statistics histogram '{histogram}' (expected 'predicates' or 'types')")
+
     def _transform_data(self, data: List[Dict[str, Any]], transform: Optional[Dict]) -> List[Dict]:
         """
         Apply optional transformations to query results.
@@ -227,7 +272,29 @@ class ChartGenerator:
         Returns:
             Result dict with vega_spec and output_path
         """
-        # Execute SPARQL query
+        # Execute SPARQL query, or read a maintained graph histogram
+        if config.get("statistics"):
+            query_data = self._statistics_rows(config["statistics"])
+        else:
+            query_data = self._execute_sparql(self._query_path(config))
+
+        # Transform data
+        transform = config.get("transform")
+        data = self._transform_data(query_data, transform)
+
+        # Generate Vega spec
+        vega_spec = self.generate_vega_spec(config, data)
+
+        return {
+            "title": config.get("title"),
+            "config": config,
+            "query_data": query_data,
+            "transformed_data": data,
+            "vega_spec": vega_spec,
+        }
+
+    def _query_path(self, config: Dict[str, Any]) -> str:
+        """Resolve a figure config's query to a file path, or return inline SPARQL text."""
         query_spec = config.get("query", {})
         if isinstance(query_spec, str):
             # Detect inline SPARQL (multi-line or starts with SPARQL keywords)
@@ -248,23 +315,30 @@ class ChartGenerator:
                     query_path = str(query_file)
         else:
             query_path = str(Path.cwd() / self.sparql_dir / query_spec.get("file", ""))
+        return query_path
 
-        query_data = self._execute_sparql(query_path)
-
-        # Transform data
-        transform = config.get("transform")
-        data = self._transform_data(query_data, transform)
+    def prefetch(self, configs: List[Dict[str, Any]], workers: int = 0) -> int:
+        """
+        Run the query files of several figure configs concurrently, ahead of process_config.
 
-        # Generate Vega spec
-        vega_spec = self.generate_vega_spec(config, data)
+        Args:
+            configs: Figure configurations
+            workers: Concurrent queries (0 uses one per CPU core)
 
-        return {
-            "title": config.get("title"),
-            "config": config,
-            "query_data": query_data,
-            "transformed_data": data,
-            "vega_spec": vega_spec,
-        }
+        Returns:
+            Number of query results held for process_config
+        """
+        paths = {}
+        for config in configs:
+            if config.get("statistics"):
+                continue
+            query_path = self._query_path(config)
+            if "\n" not in query_path and Path(query_path).is_file():
+                paths[query_path] = Path(query_path)
+        for query_path, outcome in self.rdf.execute_many(paths, workers=workers).items():
+            if outcome["type"] == "SELECT" and not outcome["error"]:
+                self._prefetched[query_path] = outcome["result"]
+        return len(self._prefetched)
 
     def write_output(self, result: Dict[str, Any], output_dir: Path, formats: List[str] = None):
         """
@@ -426,11 +500,22 @@ def main():
         default=paths.get("sparql", Path("sparql")),
         help="Directory with SPARQL queries (default from config)",
     )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="RDFManager load profile restricting which TTL subtrees are loaded",
+    )
+    parser.add_argument(
+        "--query-workers",
+        type=int,
+        default=1,
+        help="Run the charts' SPARQL queries concurrently on this many workers first (0: one per CPU core)",
+    )
 
     args = parser.parse_args()
 
     # Initialize generator
-    gen = ChartGenerator(ttl_dir=args.ttl_dir, sparql_dir=args.sparql_dir)
+    gen = ChartGenerator(ttl_dir=args.ttl_dir, sparql_dir=args.sparql_dir, profile=args.profile)
 
     # Collect config files
     if args.config.is_dir():
@@ -439,6 +524,8 @@ def main():
         config_files = [args.config]
 
     log.info(f"Processing {len(config_files)} config(s)")
+    if args.query_workers != 1:
+        gen.prefetch([gen.load_config(p) for p in config_files], workers=args.query_workers)
 
     # Process each config
     spec_entries = []
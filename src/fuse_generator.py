@@ -16,7 +16,7 @@ try:
 except Exception:
     pystache = None
 
-from src.rdf_manager import RDFManager
+from src.rdf_manager import RDFManager, acquire_rdf_manager, release_rdf_manager
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,15 @@ logger = logging.getLogger(__name__)
 class FuseGenerator:
     """Generates .fuse snippets from motif ontology."""
 
-    def __init__(self, ttl_dir: Path, sparql_dir: Path, output_dir: Path, template_path: Optional[Path] = None):
+    def __init__(
+        self,
+        ttl_dir: Path,
+        sparql_dir: Path,
+        output_dir: Path,
+        template_path: Optional[Path] = None,
+        profile: Optional[str] = None,
+        rdf: Optional[RDFManager] = None,
+    ):
         """Initialize Fuse generator.
 
         Args:
@@ -32,11 +40,14 @@ class FuseGenerator:
             sparql_dir: Directory containing SPARQL query files
             output_dir: Output directory for .fuse files
             template_path: Optional mustache template for rendering snippets
+            profile: Optional RDFManager load profile name (default loads all TTL)
+            rdf: Already-loaded RDFManager to query (default: the shared graph for ttl_dir/profile)
         """
         self.ttl_dir = Path(ttl_dir)
         self.sparql_dir = Path(sparql_dir)
         self.output_dir = Path(output_dir)
-        self.rdf = RDFManager(self.ttl_dir)
+        self._shared_rdf = rdf is None
+        self.rdf = rdf or acquire_rdf_manager(self.ttl_dir, profile=profile)
 
         # Load template if provided
         self.template_path = Path(template_path) if template_path else None
@@ -52,6 +63,12 @@ class FuseGenerator:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Fuse generator initialized. Output: {self.output_dir}")
 
+    def close(self) -> None:
+        """Release the shared ontology graph acquired by this generator."""
+        if self._shared_rdf:
+            release_rdf_manager(self.rdf)
+            self._shared_rdf = False
+
     def generate_all_motifs(self) -> int:
         """Generate .fuse snippets for all motifs.
 
@@ -68,8 +85,7 @@ class FuseGenerator:
             logger.debug(f"Using motifs query: {query_file}")
 
         try:
-            result = self.rdf.execute_query_file(query_file)
-            motif_dicts = self.rdf.results_to_dicts(result)
+            motif_dicts = self.rdf.query_file_dicts(query_file)
             logger.info(f"Found {len(motif_dicts)} motifs")
 
             count = 0
@@ -327,6 +343,11 @@ def main():
         default=Path("src/template/fuse-motifs.mustache"),
         help="Path to mustache template for snippet rendering",
     )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="RDFManager load profile restricting which TTL subtrees are loaded",
+    )
     parser.add_argument(
         "--summary",
         action="store_true",
@@ -351,6 +372,7 @@ def main():
         sparql_dir=args.sparql_dir,
         output_dir=args.output_dir,
         template_path=args.template,
+        profile=args.profile,
     )
 
     count = generator.generate_all_motifs()
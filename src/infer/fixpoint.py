@@ -0,0 +1,113 @@
+"""Semi-naive fixpoint evaluation of inference rules.
+
+Rules are evaluated with rdflib's SPARQL algebra against a private overlay of
+the loaded graph (see :class:`~src.rdf_store.OverlayStore`) that holds the
+triples derived so far and the last round's new triples as named graphs, so
+the manager's graph is never modified.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import rdflib
+from rdflib.plugins.sparql.evaluate import evalPart
+from rdflib.plugins.sparql.sparql import QueryContext
+
+from src.infer.rules import Rule, fill_template
+from src.rdf_manager import RDFManager, UnionDataset
+from src.rdf_store import OverlayStore
+
+logger = logging.getLogger(__name__)
+
+# Named graphs holding the triples inferred so far and the last round's new triples during a fixpoint run
+DERIVED_GRAPH = rdflib.URIRef("urn:x-motifs:infer:derived")
+DELTA_GRAPH = rdflib.URIRef("urn:x-motifs:infer:delta")
+
+# Rounds after which a fixpoint run gives up if rules keep producing new triples
+DEFAULT_MAX_ROUNDS = 20
+
+
+def _solutions(graph: Any, rule: Rule, where: Any) -> Iterator[Any]:
+    """Evaluate a rule's (possibly rewritten) WHERE clause against a graph."""
+    ctx = QueryContext(graph, initBindings={})
+    ctx.prologue = rule.query.prologue
+    return evalPart(ctx, where)
+
+
+def run_fixpoint(
+    rdf: RDFManager, rules: List[Rule], max_rounds: int = DEFAULT_MAX_ROUNDS, graph: Optional[rdflib.Dataset] = None
+) -> Tuple[Dict[str, rdflib.Graph], List[Dict[str, Any]]]:
+    """Apply inference rules until no round adds new triples (semi-naive evaluation).
+
+    Round 1 evaluates every rule against the loaded graph. The triples a round
+    derives that are not yet in the graph (its delta) are added before the
+    next round, in which only rules reading a delta predicate run, each joined
+    against the delta (see :meth:`Rule.delta_variants`). A rule fires once per
+    distinct solution, so blank nodes in templates are not minted again for
+    solutions already seen. Rules must be stratified: they may not negate
+    (FILTER NOT EXISTS, MINUS) what rules derive.
+
+    The inferred triples are held in named graphs of a private overlay of the
+    graph (see :class:`~src.rdf_store.OverlayStore`), so the manager's graph,
+    which other tools may share, is never modified and any store (including
+    a read-only ontology image) can be used.
+
+    Args:
+        rdf: Loaded manager
+        rules: Rules to apply
+        max_rounds: Stop after this many rounds even if triples are still added
+        graph: Dataset to evaluate against (default: ``rdf.graph``), e.g. an
+            overlay already holding other rules' inferences
+
+    Returns:
+        Tuple of (rule name -> graph of every triple the rule derived,
+        per-round dicts with 'round', 'added' (new triples), 'rules' (new
+        triples per rule that ran) and 'ms')
+    """
+    view = UnionDataset(store=OverlayStore((graph if graph is not None else rdf.graph).store))
+    outputs = {rule.name: rdflib.Graph() for rule in rules}
+    seen: Dict[str, set] = {rule.name: set() for rule in rules}
+    rounds: List[Dict[str, Any]] = []
+    derived = view.graph(DERIVED_GRAPH)
+    delta_predicates: Optional[set] = None
+    for number in range(1, max_rounds + 1):
+        start = time.perf_counter()
+        new: Dict[Tuple[Any, Any, Any], None] = {}
+        per_rule: Dict[str, int] = {}
+        for rule in rules:
+            if delta_predicates is None:
+                wheres = [rule.where]
+            elif not rule.affected_by(delta_predicates):
+                continue
+            else:
+                wheres = rule.delta_variants(delta_predicates, DELTA_GRAPH)
+                if wheres is None:
+                    wheres = [rule.where]
+            before = len(new)
+            for where in wheres:
+                for solution in _solutions(view, rule, where):
+                    key = rule.solution_key(solution)
+                    if key in seen[rule.name]:
+                        continue
+                    seen[rule.name].add(key)
+                    for triple in fill_template(rule, solution):
+                        outputs[rule.name].add(triple)
+                        if triple not in new and triple not in view:
+                            new[triple] = None
+            per_rule[rule.name] = len(new) - before
+        view.remove_graph(view.graph(DELTA_GRAPH))
+        rounds.append({"round": number, "added": len(new), "rules": per_rule, "ms": (time.perf_counter() - start) * 1000})
+        logger.info(
+            "Round %d: %d new triples in %.1f ms (%s)",
+            number, len(new), rounds[-1]["ms"], ", ".join(f"{n} +{c}" for n, c in per_rule.items()) or "no rules affected",
+        )
+        if not new:
+            break
+        delta = view.graph(DELTA_GRAPH)
+        delta.addN((s, p, o, delta) for s, p, o in new)
+        derived.addN((s, p, o, derived) for s, p, o in new)
+        delta_predicates = {str(p) for _, p, _ in new}
+    else:
+        logger.warning("Inference did not reach a fixpoint within %d rounds", max_rounds)
+    logger.info("Fixpoint after %d round(s), %d triples inferred", len(rounds), sum(r["added"] for r in rounds))
+    return outputs, rounds
@@ -0,0 +1,211 @@
+"""Inference manifest: what each rule's output in ``ttl/infer/`` was derived from.
+
+For every rule the manifest records the hash of its query text, a fingerprint
+of the triples matching each predicate (or ``rdf:type`` class) its WHERE
+clause reads, the evaluation mode and a digest of the triples it produced. A
+rule whose query and read fingerprints are unchanged since the last run is
+skipped, and an output whose triples are unchanged is not rewritten, so
+editing one source file neither re-runs unrelated rules nor touches output
+files (and whatever is built from them) that would come out the same.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.compare import to_isomorphic
+
+from src.infer.rules import Rule
+from src.infer.schedule import read_keys
+from src.rdf_index import RDF_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _matches(graph: Any, pattern: Any, exclude: Set[Any]) -> Iterator[Any]:
+    """Yield the triples of ``graph`` matching ``pattern`` that some graph outside ``exclude`` asserts."""
+    if not exclude:
+        yield from graph.triples(pattern)
+        return
+    for triple, contexts in graph.store.triples(pattern, None):
+        if any(getattr(c, "identifier", c) not in exclude for c in contexts):
+            yield triple
+
+
+def _bnode_lines(graph: Any, triples: Iterable[Any], exclude: Set[Any]) -> List[str]:
+    """Render triples with blank nodes without their labels, keeping the structure around them.
+
+    The triples are extended by every triple reachable through their blank
+    nodes, and each blank node is named by a hash of its neighbourhood,
+    refined until the hashes stop telling more nodes apart (colour refinement).
+    """
+    closure = set()
+    pending = []
+    for triple in triples:
+        closure.add(triple)
+        pending.extend(t for t in (triple[0], triple[2]) if isinstance(t, BNode))
+    seen = set()
+    while pending:
+        node = pending.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        for triple in (*_matches(graph, (node, None, None), exclude), *_matches(graph, (None, None, node), exclude)):
+            closure.add(triple)
+            pending.extend(t for t in (triple[0], triple[2]) if isinstance(t, BNode) and t not in seen)
+
+    label = {node: "" for node in seen}
+
+    def name(term: Any) -> str:
+        return "_:" + label[term] if isinstance(term, BNode) else term.n3()
+
+    distinct = 1
+    while True:
+        edges: Dict[BNode, List[str]] = {node: [label[node]] for node in seen}
+        for s, p, o in closure:
+            if isinstance(s, BNode):
+                edges[s].append(f"> {p.n3()} {name(o)}")
+            if isinstance(o, BNode):
+                edges[o].append(f"< {name(s)} {p.n3()}")
+        label = {node: _sha1("\n".join(sorted(lines))) for node, lines in edges.items()}
+        if len(set(label.values())) <= distinct:
+            break
+        distinct = len(set(label.values()))
+    return sorted(" ".join(name(t) for t in triple) for triple in closure)
+
+
+def read_fingerprints(graph: Any, keys: Iterable[Optional[str]], exclude: Iterable[Any] = ()) -> Dict[str, str]:
+    """Fingerprint the triples of a graph matching each dependency key.
+
+    Blank node labels change whenever a file is re-parsed, so triples with
+    blank nodes are fingerprinted with the structure around them (see
+    :func:`_bnode_lines`): they and every triple reachable through their blank nodes
+    (e.g. the ``m:name`` of a ``m:part [ m:name "x" ]`` for key ``m:part``,
+    and which resource the node hangs off for key ``m:name``).
+
+    Args:
+        graph: Graph the rules query
+        keys: Keys from :func:`~src.infer.schedule.read_keys` (a predicate IRI,
+            ``"<rdf:type> <class>"``, or None for every triple)
+        exclude: Identifiers of named graphs to leave out (e.g. the files
+            holding the rules' own earlier outputs); triples also asserted by
+            another graph are kept
+
+    Returns:
+        Mapping of key (``"*"`` for None) -> sha1 of the sorted matching
+        triples (and those reachable through their blank nodes)
+    """
+    exclude = set(exclude)
+    fingerprints = {}
+    for key in set(keys):
+        if key is None:
+            pattern = (None, None, None)
+        elif " " in key:
+            pattern = (None, URIRef(RDF_TYPE), URIRef(key.split(" ", 1)[1]))
+        else:
+            pattern = (None, URIRef(key), None)
+        lines = []
+        blank = []
+        for triple in _matches(graph, pattern, exclude):
+            if isinstance(triple[0], BNode) or isinstance(triple[2], BNode):
+                blank.append(triple)
+            else:
+                lines.append(" ".join(t.n3() for t in triple))
+        lines.sort()
+        if blank:
+            lines.extend(_bnode_lines(graph, blank, exclude))
+        fingerprints[key or "*"] = _sha1("\n".join(lines))
+    return fingerprints
+
+
+def output_digest(graph: Graph) -> str:
+    """Return a digest of a rule output that does not depend on blank node labels."""
+    return format(to_isomorphic(graph).graph_digest(), "x")
+
+
+class InferenceManifest:
+    """Per-rule inputs and output digests for an inference output directory, persisted as JSON."""
+
+    FILENAME = ".manifest.json"
+
+    def __init__(self, out_dir: Path):
+        """Initialize inference manifest.
+
+        Args:
+            out_dir: Directory of inferred TTL files the manifest describes
+        """
+        self.out_dir = Path(out_dir)
+        self.path = self.out_dir / self.FILENAME
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.rules = json.load(f).get("rules", {})
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable inference manifest {self.path}: {e}")
+
+    @staticmethod
+    def inputs(rule: Rule, fingerprints: Dict[str, str], mode: str) -> Dict[str, Any]:
+        """Return what a rule's output depends on.
+
+        Args:
+            rule: Rule
+            fingerprints: Output of :func:`read_fingerprints` covering the rule's read keys
+            mode: 'single' or 'fixpoint' (rules see each other's inferences in the latter)
+        """
+        return {
+            "query": hashlib.sha1(rule.text.encode("utf-8")).hexdigest(),
+            "reads": {key or "*": fingerprints[key or "*"] for key in sorted(read_keys(rule), key=str)},
+            "mode": mode,
+        }
+
+    def unchanged(self, rule: Rule, inputs: Dict[str, Any]) -> bool:
+        """Return True if the rule ran on the same inputs before and its output file still exists."""
+        entry = self.rules.get(rule.name)
+        if not entry or any(entry.get(k) != v for k, v in inputs.items()):
+            return False
+        return (self.out_dir / f"{rule.name}.ttl").exists()
+
+    def output_unchanged(self, name: str, digest: str) -> bool:
+        """Return True if the output file exists and holds triples with this digest.
+
+        Files without a manifest entry (e.g. in a fresh checkout) are parsed and compared.
+        """
+        out_path = self.out_dir / f"{name}.ttl"
+        if not out_path.exists():
+            return False
+        recorded = self.rules.get(name, {}).get("output")
+        if recorded is None:
+            try:
+                recorded = output_digest(Graph().parse(out_path, format="turtle"))
+            except Exception:
+                return False
+        return recorded == digest
+
+    def record(self, name: str, inputs: Dict[str, Any], digest: str, triples: int) -> None:
+        """Record the inputs and output of one rule run."""
+        self.rules[name] = {**inputs, "output": digest, "triples": triples, "checked": datetime.utcnow().isoformat() + "Z"}
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed since it was loaded (best-effort)."""
+        if not self.dirty:
+            return
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"rules": self.rules}, f, indent=1, sort_keys=True)
+            tmp.replace(self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to write inference manifest {self.path}: {e}")
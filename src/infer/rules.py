@@ -0,0 +1,190 @@
+"""Inference rules: SPARQL CONSTRUCT queries analysed for fixpoint evaluation.
+
+Each ``.sparql`` file in the inference directory is one rule. :class:`Rule`
+keeps the prepared query together with what the rule reads (the predicates of
+the triple patterns in its WHERE clause) and writes (the predicates of its
+CONSTRUCT template), and can rewrite its WHERE clause so that one triple
+pattern is matched against a named "delta" graph only, which is what
+semi-naive evaluation joins against in every round after the first.
+"""
+import logging
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from rdflib import BNode, URIRef, Variable
+from rdflib.plugins.sparql.algebra import BGP, Filter, Graph, Join
+from rdflib.plugins.sparql.parserutils import CompValue
+
+logger = logging.getLogger(__name__)
+
+# Algebra nodes below which new input can remove solutions (aggregates)
+_NON_MONOTONE = {"Group", "AggregateJoin"}
+
+# Occurrence of a triple pattern in a WHERE clause: (BGP node, index in its triples, role), where
+# role is True for a required pattern, the LeftJoin node for a pattern of a top-level OPTIONAL, and
+# None for anything else (nested OPTIONAL, MINUS, FILTER (NOT) EXISTS, aggregates)
+Occurrence = Tuple[CompValue, int, Any]
+
+
+def _walk(node: Any, role: Any = True) -> Iterator[Occurrence]:
+    """Yield every triple pattern occurrence below an algebra node, with its role."""
+    if isinstance(node, CompValue):
+        if node.name == "BGP":
+            for i in range(len(node.triples)):
+                yield node, i, role
+            return
+        for key, value in node.items():
+            if key not in ("p", "p1", "p2") or node.name in _NON_MONOTONE or (node.name == "Minus" and key == "p2"):
+                child = None
+            elif node.name == "LeftJoin" and key == "p2":
+                child = node if role is True else None
+            else:
+                child = role
+            yield from _walk(value, child)
+    elif isinstance(node, (list, tuple)):
+        for value in node:
+            yield from _walk(value, role)
+
+
+def _substitute(node: Any, target: CompValue, replacement: CompValue) -> Any:
+    """Return ``node`` with ``target`` replaced, copying only the nodes on the path to it."""
+    if node is target:
+        return replacement
+    if isinstance(node, CompValue):
+        values = {key: _substitute(value, target, replacement) for key, value in node.items()}
+        if all(values[key] is value for key, value in node.items()):
+            return node
+        return CompValue(node.name, **values)
+    if isinstance(node, list):
+        values = [_substitute(value, target, replacement) for value in node]
+        return values if any(a is not b for a, b in zip(values, node)) else node
+    return node
+
+
+class Rule:
+    """One inference rule (a SPARQL CONSTRUCT query file)."""
+
+    def __init__(self, path: Path, text: str, query: Any):
+        """Initialize rule.
+
+        Args:
+            path: Rule file
+            text: SPARQL CONSTRUCT text
+            query: Prepared query (``rdflib.plugins.sparql.sparql.Query``)
+
+        Raises:
+            ValueError: If the query is not a CONSTRUCT query
+        """
+        if query.algebra.name != "ConstructQuery":
+            raise ValueError(f"Inference rule {path.name} is not a CONSTRUCT query")
+        self.path = Path(path)
+        self.name = self.path.stem
+        self.text = text
+        self.query = query
+        self.where = query.algebra.p
+        self.template = query.algebra.template or self.where.p.triples
+        # Template variables that identify a solution (blank nodes are minted per solution)
+        self.variables: List[Variable] = sorted({t for triple in self.template for t in triple if isinstance(t, Variable)})
+        self.occurrences: List[Occurrence] = list(_walk(self.where))
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name})"
+
+    @property
+    def reads(self) -> Set[Optional[str]]:
+        """Predicate IRIs the WHERE clause matches, including optional and negated patterns (None: a variable predicate or property path)."""
+        return {str(t[1]) if isinstance(t[1], URIRef) else None for bgp, i, _ in self.occurrences for t in [bgp.triples[i]]}
+
+    @property
+    def writes(self) -> Set[Optional[str]]:
+        """Predicate IRIs the CONSTRUCT template produces (None: a variable predicate)."""
+        return {str(p) if isinstance(p, URIRef) else None for _, p, _ in self.template}
+
+    def solution_key(self, solution: Any) -> Tuple[Any, ...]:
+        """Return the values of the template variables in a solution."""
+        return tuple(solution.get(v) for v in self.variables)
+
+    def affected_by(self, predicates: Set[str]) -> bool:
+        """Return True if new triples with these predicates can add solutions to the rule."""
+        return any(p is None or p in predicates for p in self.reads)
+
+    def delta_variants(self, predicates: Set[str], delta: URIRef) -> Optional[List[CompValue]]:
+        """Return WHERE clauses that each match one affected pattern against the delta graph.
+
+        Every new solution of the rule after triples with ``predicates`` were
+        added (all in the named graph ``delta``) matches at least one of those
+        triples, either in a required pattern or in an OPTIONAL that it now
+        binds. A required pattern is matched against the delta in place; for
+        an optional one the OPTIONAL becomes a join with its delta-matched
+        pattern. The union of the variants' solutions thus covers all new
+        solutions.
+
+        Args:
+            predicates: Predicate IRIs of the delta triples
+            delta: Named graph holding the delta triples
+
+        Returns:
+            Rewritten WHERE clauses (empty if the rule is not affected), or None
+            if an affected pattern is negated, aggregated, in a nested OPTIONAL
+            or has a variable predicate or path, in which case the rule must be
+            fully re-evaluated
+        """
+        variants = []
+        for bgp, i, role in self.occurrences:
+            p = bgp.triples[i][1]
+            if isinstance(p, URIRef) and str(p) not in predicates:
+                continue
+            if role is None or not isinstance(p, URIRef):
+                return None
+            rest = [t for j, t in enumerate(bgp.triples) if j != i]
+            part = Graph(delta, BGP([bgp.triples[i]]))
+            if rest:
+                part = Join(part, BGP(rest))
+                part["lazy"] = True
+            if role is True:
+                variants.append(_substitute(self.where, bgp, part))
+                continue
+            # Delta side first: the lazy join then evaluates the OPTIONAL's left side per delta match
+            joined = Join(_substitute(role.p2, bgp, part), role.p1)
+            joined["lazy"] = True
+            if getattr(role.expr, "name", None) != "TrueFilter":
+                joined = Filter(role.expr, joined)
+            variants.append(_substitute(self.where, role, joined))
+        return variants
+
+
+def load_rules(sparql_dir: Path, rdf: Any) -> List[Rule]:
+    """Load and prepare every rule in a directory, skipping files that are not CONSTRUCT queries.
+
+    Args:
+        sparql_dir: Directory of ``*.sparql`` rule files
+        rdf: RDFManager used to prepare the queries (and load lazy subtrees they need)
+
+    Returns:
+        Rules in sorted file name order
+    """
+    rules = []
+    for path in sorted(Path(sparql_dir).glob("*.sparql")):
+        text = path.read_text()
+        try:
+            rdf.ensure_loaded(text)
+            rules.append(Rule(path, text, rdf.prepare_query(text)))
+        except Exception as e:
+            logger.error(f"Skipping inference rule {path.name}: {e}")
+    return rules
+
+
+def fill_template(rule: Rule, solution: Any) -> Iterator[Tuple[Any, Any, Any]]:
+    """Instantiate a rule's template for one solution, minting fresh blank nodes."""
+    bnodes = {}
+    for triple in rule.template:
+        terms = []
+        for term in triple:
+            if isinstance(term, BNode):
+                terms.append(bnodes.setdefault(term, BNode()))
+            elif isinstance(term, Variable):
+                terms.append(solution.get(term))
+            else:
+                terms.append(term)
+        if None not in terms:
+            yield tuple(terms)
@@ -1,24 +1,103 @@
 #!/usr/bin/env python3
 """Run SPARQL CONSTRUCT inference queries and write TTL output.
 
+By default each query runs once against the loaded graph. With ``--fixpoint``
+the queries are treated as rules and iterated until no new triples appear, so
+consequences of other rules' inferences (e.g. sequential relations feeding
+fusion candidates) are derived in the same run. Evaluation is semi-naive: after
+the first round a rule is only re-run if the previous round added triples with
+a predicate it reads, and then only joined against those new triples.
+
+Rules are scheduled by the predicates they read and write (see
+:mod:`src.infer.schedule`): with ``--workers N`` independent rules run
+concurrently. Without ``--fixpoint`` no rule sees another's output, so all of
+them are independent; with it, rules only start once the rules they depend on
+have reached their fixpoint. The schedule and its critical path are logged.
+
+Runs are incremental (see :mod:`src.infer.manifest`): a rule whose query and
+the triples it reads are unchanged since the last run is skipped, and output
+files whose triples are unchanged are not rewritten. ``--force`` re-runs
+every rule and rewrites every output.
+
+Rules built from basic graph patterns, OPTIONAL, UNION, VALUES and simple
+FILTER comparisons are evaluated by compiled hash-join plans
+(:mod:`src.infer.compiled`) rather than rdflib's SPARQL engine; other rules,
+and every rule with ``--engine sparql``, go through rdflib. Fixpoint runs
+always use rdflib, since their rules also read the per-round delta graph.
+
 Usage:
   src/infer/run_inference.py --sparql-dir sparql/infer --out ttl/infer
+  src/infer/run_inference.py --fixpoint --max-rounds 10
+  src/infer/run_inference.py --fixpoint --workers 4
 """
 import argparse
 import logging
+import os
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import rdflib
 import sys
 
-from src.rdf_manager import RDFManager
+from src.infer.fixpoint import DEFAULT_MAX_ROUNDS
+from src.infer.rules import Rule, load_rules
+from src.infer.compiled import PredicateIndex, run_compiled
+from src.infer.manifest import InferenceManifest, output_digest, read_fingerprints
+from src.infer.schedule import components, format_schedule, read_keys, run_scheduled
+from src.rdf_manager import RDFManager, acquire_rdf_manager, release_rdf_manager
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 log = logging.getLogger(__name__)
 
+def _write_output(out_graph: rdflib.Graph, qf: Path, out_dir: Path, ttl_dir: Path, rdf: RDFManager) -> Path:
+    """Write one query's inferred triples to ``<out_dir>/<query stem>.ttl``."""
+    # Bind known namespaces from main graph
+    for p, ns in rdf.namespaces.items():
+        try:
+            out_graph.bind(p, ns)
+        except Exception:
+            pass
+
+    # Add provenance comment as TTL prefix (rdflib doesn't support comments directly)
+    out_path = out_dir / f"{qf.stem}.ttl"
+    serialized = out_graph.serialize(format="turtle")
+    header = f"# Inferred triples from query: {qf.name}\n# generated: {datetime.utcnow().isoformat()}Z\n# source ttl: {ttl_dir}\n\n"
+    tmp = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(header)
+        f.write(serialized)
+    tmp.replace(out_path)
 
-def run_inference(sparql_dir: Path, out_dir: Path, ttl_dir: Path):
-    rdf = RDFManager(ttl_dir)
+    log.info("Wrote %s (%d triples)", out_path, len(out_graph))
+    return out_path
+
+
+def _output_graphs(rdf: RDFManager, out_dir: Path) -> set:
+    """Return the named graphs of loaded files under ``out_dir`` (the rules' own earlier outputs)."""
+    out_dir = out_dir.resolve()
+    return {ident for rel, ident in rdf.file_graphs.items() if (rdf.ttl_dir / rel).resolve().is_relative_to(out_dir)}
+
+
+def run_inference(
+    sparql_dir: Path,
+    out_dir: Path,
+    ttl_dir: Path,
+    profile: str = None,
+    rdf: RDFManager = None,
+    fixpoint: bool = False,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+    workers: int = 1,
+    incremental: bool = True,
+    engine: str = "compiled",
+):
+    if rdf is None:
+        rdf = acquire_rdf_manager(ttl_dir, profile=profile)
+        try:
+            return run_inference(
+                sparql_dir, out_dir, ttl_dir, profile, rdf=rdf, fixpoint=fixpoint, max_rounds=max_rounds, workers=workers, incremental=incremental, engine=engine
+            )
+        finally:
+            release_rdf_manager(rdf)
     sparql_dir = Path(sparql_dir)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -28,8 +107,83 @@ def run_inference(sparql_dir: Path, out_dir: Path, ttl_dir: Path):
         log.warning("No SPARQL queries found in %s", sparql_dir)
         return 0
 
+    rules = {rule.name: rule for rule in load_rules(sparql_dir, rdf)}
+    manifest = InferenceManifest(out_dir)
+    # Earlier outputs loaded from out_dir are left out, or every rewritten output would re-trigger its readers
+    fingerprints = read_fingerprints(rdf.graph, {key for rule in rules.values() for key in read_keys(rule)}, _output_graphs(rdf, out_dir))
+    inputs = {name: manifest.inputs(rule, fingerprints, "fixpoint" if fixpoint else "single") for name, rule in rules.items()}
+    if incremental:
+        stale = [qf for qf in queries if qf.stem not in rules or not manifest.unchanged(rules[qf.stem], inputs[qf.stem])]
+        if len(stale) < len(queries):
+            log.info("Skipping %d of %d inference rules with unchanged inputs", len(queries) - len(stale), len(queries))
+        if not stale:
+            return 0
+        # In a fixpoint run rules see each other's inferences, so they are only skipped all together
+        queries = queries if fixpoint else stale
+
+    def emit(out_graph: rdflib.Graph, qf: Path) -> None:
+        if qf.stem not in inputs:
+            _write_output(out_graph, qf, out_dir, ttl_dir, rdf)
+            return
+        digest = output_digest(out_graph)
+        if incremental and manifest.output_unchanged(qf.stem, digest):
+            log.info("Output of %s is unchanged, leaving %s.ttl as is", qf.name, qf.stem)
+        else:
+            _write_output(out_graph, qf, out_dir, ttl_dir, rdf)
+        # Recorded only once the file on disk holds this output, so a failed write is retried next run
+        manifest.record(qf.stem, inputs[qf.stem], digest, len(out_graph))
+
+    try:
+        _run_queries(rdf, queries, rules, emit, fixpoint, max_rounds, workers, engine)
+    finally:
+        manifest.save()
+    return 0
+
+
+def _run_queries(
+    rdf: RDFManager, queries: List[Path], rules: Dict[str, Rule], emit: Any, fixpoint: bool, max_rounds: int, workers: int, engine: str
+) -> None:
+    """Run inference queries, passing each query's output graph and file to ``emit``."""
+    if fixpoint:
+        outputs, _, _, _ = run_scheduled(rdf, list(rules.values()), workers, max_rounds)
+        for rule in rules.values():
+            emit(outputs[rule.name], rule.path)
+        return
+
+    if engine == "compiled":
+        index = PredicateIndex(rdf.graph)
+        remaining = []
+        for qf in queries:
+            out_graph = run_compiled(rules[qf.stem], index) if qf.stem in rules else None
+            if out_graph is None:
+                remaining.append(qf)
+            else:
+                emit(out_graph, qf)
+        queries = remaining
+        if not queries:
+            return
+
+    if workers != 1:
+        # Without --fixpoint no rule reads another's output: every rule is its own
+        # component with no dependencies, so they form one stage and all run concurrently
+        scheduled = [rules[qf.stem] for qf in queries if qf.stem in rules]
+        deps: Dict[str, set] = {rule.name: set() for rule in scheduled}
+        comps = components(scheduled, deps)
+        log.info("Inference schedule:\n%s", format_schedule(comps, deps))
+        results = rdf.execute_many({qf.stem: qf for qf in queries}, workers=workers)
+        for qf in queries:
+            outcome = results[qf.stem]
+            if outcome["error"] is not None:
+                log.error("Failed to execute %s: %s", qf.name, outcome["error"])
+                continue
+            out_graph = rdflib.Graph()
+            out_graph.addN((s, p, o, out_graph) for s, p, o in outcome["result"])
+            emit(out_graph, qf)
+        times = [results[comp[0].name]["ms"] for comp in comps]
+        log.info("Inference schedule with timings:\n%s", format_schedule(comps, deps, times))
+        return
+
     for qf in queries:
-        qname = qf.stem
         log.info("Running inference query: %s", qf.name)
         qtext = qf.read_text()
         try:
@@ -53,25 +207,9 @@ def run_inference(sparql_dir: Path, out_dir: Path, ttl_dir: Path):
                             pass
                 out_graph = g
 
-            # Bind known namespaces from main graph
-            for p, ns in rdf.namespaces.items():
-                try:
-                    out_graph.bind(p, ns)
-                except Exception:
-                    pass
-
-            # Add provenance comment as TTL prefix (rdflib doesn't support comments directly)
-            out_path = out_dir / f"{qname}.ttl"
-            serialized = out_graph.serialize(format="turtle")
-            header = f"# Inferred triples from query: {qf.name}\n# generated: {datetime.utcnow().isoformat()}Z\n# source ttl: {ttl_dir}\n\n"
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(header)
-                f.write(serialized)
-
-            log.info("Wrote %s (%d triples)", out_path, len(out_graph))
+            emit(out_graph, qf)
         except Exception as e:
             log.error("Failed to execute %s: %s", qf.name, e)
-    return 0
 
 
 def main():
@@ -79,9 +217,30 @@ def main():
     parser.add_argument("--sparql-dir", type=Path, default=Path("sparql/infer"))
     parser.add_argument("--out", type=Path, default=Path("ttl/infer"))
     parser.add_argument("--ttl-dir", type=Path, default=Path("ttl"), help="Directory of source TTL files to load into graph")
+    parser.add_argument("--profile", default=None, help="RDFManager load profile restricting which TTL subtrees are loaded")
+    parser.add_argument("--fixpoint", action="store_true", help="Iterate the rules (semi-naive) until no new triples are inferred")
+    parser.add_argument("--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS, help="Round limit for --fixpoint")
+    parser.add_argument("--workers", type=int, default=1, help="Independent rules run concurrently (0: one per CPU core)")
+    parser.add_argument("--force", action="store_true", help="Re-run every rule even if its inputs are unchanged since the last run")
+    parser.add_argument(
+        "--engine",
+        choices=("compiled", "sparql"),
+        default="compiled",
+        help="Evaluate supported rules with compiled hash-join plans, or every rule through rdflib's SPARQL engine",
+    )
     args = parser.parse_args()
 
-    return run_inference(args.sparql_dir, args.out, args.ttl_dir)
+    return run_inference(
+        args.sparql_dir,
+        args.out,
+        args.ttl_dir,
+        args.profile,
+        fixpoint=args.fixpoint,
+        max_rounds=args.max_rounds,
+        workers=args.workers,
+        incremental=not args.force,
+        engine=args.engine,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+"""Dependency-aware scheduling of inference rules.
+
+A rule depends on another when the other's CONSTRUCT template writes a
+predicate its WHERE clause reads (see :class:`~src.infer.rules.Rule`). Rules
+that depend on each other, directly or through a cycle, form one component
+that is iterated to a fixpoint as a unit; the components form a DAG. Stages
+group components whose inputs are all final once the previous stages are
+done, so the components of a stage can run concurrently against the same
+graph. The critical path (the slowest chain of dependent components) bounds
+the wall time of a run however many workers there are.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from rdflib import Dataset, Graph, URIRef
+
+from src.infer.fixpoint import DEFAULT_MAX_ROUNDS, run_fixpoint
+from src.infer.rules import Rule
+from src.rdf_index import RDF_TYPE
+from src.rdf_manager import UnionDataset
+from src.rdf_store import OverlayStore
+
+logger = logging.getLogger(__name__)
+
+# Named graph of the private overlay holding the inferences of completed stages during a scheduled run
+STAGED_GRAPH = URIRef("urn:x-motifs:infer:staged")
+
+
+def _type_key(triple: Tuple[Any, Any, Any]) -> Optional[str]:
+    """Return the dependency key of a pattern or template triple.
+
+    Keys are predicate IRIs, refined to ``"<rdf:type> <class>"`` for typing
+    triples with a constant class; None stands for a variable predicate.
+    """
+    _, p, o = triple
+    if not isinstance(p, URIRef):
+        return None
+    if str(p) == RDF_TYPE and isinstance(o, URIRef):
+        return f"{RDF_TYPE} {o}"
+    return str(p)
+
+
+def _overlaps(reads: Set[Optional[str]], writes: Set[Optional[str]]) -> bool:
+    """Return True if a written key can match a read key (a plain rdf:type key matches every class)."""
+    if None in reads or None in writes or reads & writes:
+        return True
+    typed_reads = {k.split(" ")[0] for k in reads if k.startswith(RDF_TYPE)}
+    typed_writes = {k.split(" ")[0] for k in writes if k.startswith(RDF_TYPE)}
+    return bool((RDF_TYPE in reads and typed_writes) or (RDF_TYPE in writes and typed_reads))
+
+
+def read_keys(rule: Rule) -> Set[Optional[str]]:
+    """Return the dependency keys of the triple patterns a rule's WHERE clause matches."""
+    return {_type_key(bgp.triples[i]) for bgp, i, _ in rule.occurrences}
+
+
+def write_keys(rule: Rule) -> Set[Optional[str]]:
+    """Return the dependency keys of the triples a rule can add to the graph.
+
+    Template triples that repeat a required or top-level optional WHERE
+    pattern verbatim (e.g. ``?container a ?containerType``) only restate
+    triples the rule matched, so they never add anything and are left out.
+    """
+    matched = {tuple(bgp.triples[i]) for bgp, i, role in rule.occurrences if role is not None}
+    return {_type_key(t) for t in rule.template if tuple(t) not in matched}
+
+
+def rule_dependencies(rules: Sequence[Rule]) -> Dict[str, Set[str]]:
+    """Return, per rule name, the names of the rules whose output it reads (itself included if recursive)."""
+    writes = {rule.name: write_keys(rule) for rule in rules}
+    deps: Dict[str, Set[str]] = {}
+    for reader in rules:
+        reads = read_keys(reader)
+        deps[reader.name] = {writer.name for writer in rules if _overlaps(reads, writes[writer.name])}
+    return deps
+
+
+def components(rules: Sequence[Rule], deps: Dict[str, Set[str]]) -> List[List[Rule]]:
+    """Group rules into strongly connected components, dependencies first.
+
+    Args:
+        rules: Rules to group
+        deps: Output of :func:`rule_dependencies`
+
+    Returns:
+        Components in topological order; rules within a component keep their input order
+    """
+    order = {rule.name: i for i, rule in enumerate(rules)}
+    by_name = {rule.name: rule for rule in rules}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    found: List[List[Rule]] = []
+
+    def visit(name: str) -> None:
+        # Tarjan's algorithm; emits a component after all components it depends on
+        index[name] = low[name] = len(index)
+        stack.append(name)
+        on_stack.add(name)
+        for dep in sorted(deps[name], key=order.get):
+            if dep not in index:
+                visit(dep)
+                low[name] = min(low[name], low[dep])
+            elif dep in on_stack:
+                low[name] = min(low[name], index[dep])
+        if low[name] == index[name]:
+            members = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                members.append(member)
+                if member == name:
+                    break
+            found.append(sorted((by_name[m] for m in members), key=lambda r: order[r.name]))
+
+    for rule in rules:
+        if rule.name not in index:
+            visit(rule.name)
+    return found
+
+
+def _component_deps(comps: List[List[Rule]], deps: Dict[str, Set[str]]) -> List[Set[int]]:
+    """Return, per component, the indexes of the other components it depends on."""
+    owner = {rule.name: i for i, comp in enumerate(comps) for rule in comp}
+    return [{owner[d] for rule in comp for d in deps[rule.name]} - {i} for i, comp in enumerate(comps)]
+
+
+def stages(comps: List[List[Rule]], deps: Dict[str, Set[str]]) -> List[List[int]]:
+    """Group components (by index) into stages that can each run concurrently.
+
+    A component goes in the stage after the last stage of any component it depends on.
+    """
+    comp_deps = _component_deps(comps, deps)
+    level: List[int] = []
+    for i in range(len(comps)):
+        level.append(1 + max((level[d] for d in comp_deps[i]), default=-1))
+    grouped: List[List[int]] = [[] for _ in range(max(level, default=-1) + 1)]
+    for i, lv in enumerate(level):
+        grouped[lv].append(i)
+    return grouped
+
+
+def critical_path(comps: List[List[Rule]], deps: Dict[str, Set[str]], times: Sequence[float]) -> Tuple[List[int], float]:
+    """Return the chain of dependent components with the largest total time.
+
+    Args:
+        comps: Components in topological order
+        deps: Output of :func:`rule_dependencies`
+        times: Milliseconds spent on each component
+
+    Returns:
+        (component indexes along the path, total ms)
+    """
+    comp_deps = _component_deps(comps, deps)
+    best: List[Tuple[float, Optional[int]]] = []
+    for i in range(len(comps)):
+        prev = max(comp_deps[i], key=lambda d: best[d][0], default=None)
+        best.append((times[i] + (best[prev][0] if prev is not None else 0.0), prev))
+    if not best:
+        return [], 0.0
+    end = max(range(len(best)), key=lambda i: best[i][0])
+    path = []
+    node: Optional[int] = end
+    while node is not None:
+        path.append(node)
+        node = best[node][1]
+    return path[::-1], best[end][0]
+
+
+def format_schedule(comps: List[List[Rule]], deps: Dict[str, Set[str]], times: Optional[Sequence[float]] = None) -> str:
+    """Render the stages of a schedule, and the critical path when timings are known."""
+    lines = []
+    for n, stage in enumerate(stages(comps, deps), 1):
+        parts = []
+        for i in stage:
+            names = "+".join(rule.name for rule in comps[i])
+            if len(comps[i]) > 1 or comps[i][0].name in deps[comps[i][0].name]:
+                names = f"[{names}] (fixpoint)"
+            parts.append(f"{names} {times[i]:.1f} ms" if times is not None else names)
+        lines.append(f"stage {n}: " + ", ".join(parts))
+    if times is not None:
+        path, total = critical_path(comps, deps, times)
+        lines.append("critical path: " + " -> ".join("+".join(r.name for r in comps[i]) for i in path) + f" ({total:.1f} ms)")
+    return "\n".join(lines)
+
+
+# (manager, overlay graph, components, max_rounds) seen by forked stage workers while a stage runs
+_FORKED_STATE: Optional[Tuple[Any, Dataset, List[List[Rule]], int]] = None
+
+
+def _run_component(index: int) -> Tuple[Dict[str, List[Tuple[Any, Any, Any]]], List[Dict[str, Any]], float]:
+    """Run one component to its fixpoint (in a forked worker or in-process)."""
+    rdf, view, comps, max_rounds = _FORKED_STATE
+    start = time.perf_counter()
+    outputs, rounds = run_fixpoint(rdf, comps[index], max_rounds, graph=view)
+    return {name: list(graph) for name, graph in outputs.items()}, rounds, (time.perf_counter() - start) * 1000
+
+
+def run_scheduled(
+    rdf: Any, rules: Sequence[Rule], workers: int = 1, max_rounds: int = DEFAULT_MAX_ROUNDS
+) -> Tuple[Dict[str, Graph], List[float], List[List[Rule]], Dict[str, Set[str]]]:
+    """Run rules to a fixpoint component by component, stage by stage.
+
+    The components of a stage run in forked worker processes (which see the
+    graph, including earlier stages' inferences, copy-on-write) when
+    ``workers > 1`` and ``fork`` is available, otherwise one after another.
+    Each stage's inferences are added to a named graph of a private overlay
+    of ``rdf.graph`` (see :class:`~src.rdf_store.OverlayStore`) so later
+    stages read them; the manager's graph itself is never modified.
+
+    Args:
+        rdf: Loaded manager
+        rules: Rules to run
+        workers: Components run concurrently within a stage (0 or less: one per CPU core)
+        max_rounds: Round limit per component (see :func:`~src.infer.fixpoint.run_fixpoint`)
+
+    Returns:
+        Tuple of (rule name -> graph of every triple the rule derived, ms per
+        component, components, rule dependencies)
+    """
+    global _FORKED_STATE
+    deps = rule_dependencies(rules)
+    comps = components(rules, deps)
+    logger.info("Inference schedule:\n%s", format_schedule(comps, deps))
+    outputs: Dict[str, Graph] = {}
+    times = [0.0] * len(comps)
+    view = UnionDataset(store=OverlayStore(rdf.graph.store))
+    staged = view.graph(STAGED_GRAPH)
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    _FORKED_STATE = (rdf, view, comps, max_rounds)
+    try:
+        for stage in stages(comps, deps):
+            if workers > 1 and len(stage) > 1 and fork:
+                with ProcessPoolExecutor(max_workers=min(workers, len(stage)), mp_context=multiprocessing.get_context("fork")) as pool:
+                    results = list(pool.map(_run_component, stage))
+            else:
+                results = [_run_component(i) for i in stage]
+            for i, (component_outputs, _, ms) in zip(stage, results):
+                times[i] = ms
+                for name, triples in component_outputs.items():
+                    outputs[name] = Graph()
+                    outputs[name].addN((s, p, o, outputs[name]) for s, p, o in triples)
+                    staged.addN((s, p, o, staged) for s, p, o in triples)
+    finally:
+        _FORKED_STATE = None
+    logger.info("Inference schedule with timings:\n%s", format_schedule(comps, deps, times))
+    return outputs, times, comps, deps
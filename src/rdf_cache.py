@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""On-disk snapshot cache for parsed TTL graphs.
+
+Parsing the Turtle sources under ``ttl/`` dominates startup for every tool
+that builds an :class:`~src.rdf_manager.RDFManager`. This module stores the
+triples parsed from each file in a compact, dictionary-encoded binary
+snapshot keyed on per-file fingerprints (path, mtime, size and content hash),
+so unchanged files are loaded with a fast deserialize instead of a re-parse.
+Sanitized copies of generated opset files are kept alongside, keyed by the
+content hash of the source file, as is a load manifest recording the parse
+outcome of every file (so known-bad files are not re-parsed on every run).
+SELECT results are cached under ``results/``, keyed on the query, the
+content fingerprint of the loaded graph and the query bindings, so a rebuild
+against an unchanged ontology runs no queries at all.
+
+Usage:
+  python -m src.rdf_cache list [--cache-dir tmp/cache/rdf]
+  python -m src.rdf_cache report [--ttl-dir ttl] [--failed] [--cache-dir tmp/cache/rdf]
+  python -m src.rdf_cache report --profile-load [tmp/load-profile.json] [--ttl-dir ttl] [--workers N]
+  python -m src.rdf_cache evict [KEY ...] [--all] [--cache-dir tmp/cache/rdf]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default location for cache artefacts: tmp/ at the repository root (where project working files
+# live), resolved from this file so tools run from other directories share one cache
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / "tmp" / "cache" / "rdf"
+
+# Default output of the --profile-load command line flag (see RDFManager.graph_load_report)
+DEFAULT_LOAD_PROFILE = Path("tmp/load-profile.json")
+
+# Bump whenever the on-disk snapshot layout or the parse output for unchanged files changes
+SNAPSHOT_VERSION = 2
+
+# Bump whenever the on-disk result layout or the rows produced by RDFManager.results_to_dicts change
+RESULT_CACHE_VERSION = 1
+
+# Query result cache limits: total size, and time since an entry was last used
+MAX_RESULT_CACHE_BYTES = 64 * 1024 * 1024
+MAX_RESULT_AGE_DAYS = 30
+
+
+def file_fingerprint(path: Path, root: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return the fingerprint of a single source file.
+
+    The content hash is only recomputed when mtime or size differ from the
+    ``previous`` fingerprint, so an unchanged tree costs one ``stat`` per file.
+
+    Args:
+        path: File to fingerprint
+        root: Directory the fingerprint path is made relative to
+        previous: Fingerprint recorded for the same path on an earlier load
+
+    Returns:
+        Dict with keys: path, mtime_ns, size, sha1
+    """
+    st = path.stat()
+    rel = path.relative_to(root).as_posix()
+    if previous and previous.get("mtime_ns") == st.st_mtime_ns and previous.get("size") == st.st_size:
+        sha1 = previous.get("sha1")
+    else:
+        sha1 = hashlib.sha1(path.read_bytes()).hexdigest()
+    return {"path": rel, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": sha1}
+
+
+def same_content(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> bool:
+    """Return True if two fingerprints describe the same file content."""
+    return bool(a and b) and a.get("path") == b.get("path") and a.get("sha1") == b.get("sha1")
+
+
+def encode_graphs(graphs: Dict[str, Iterable[Tuple[Any, Any, Any]]]) -> Tuple[List[Any], Dict[str, bytes]]:
+    """Dictionary-encode per-file triples into a shared term table.
+
+    Args:
+        graphs: Mapping of relative file path -> iterable of (s, p, o) terms
+
+    Returns:
+        Tuple of (terms, encoded) where ``encoded`` maps each path to the raw
+        bytes of an unsigned int array of flattened (s, p, o) term ids
+    """
+    terms: List[Any] = []
+    ids: Dict[Any, int] = {}
+    encoded: Dict[str, bytes] = {}
+    for rel, triples in graphs.items():
+        buf = array("I")
+        for triple in triples:
+            for term in triple:
+                tid = ids.get(term)
+                if tid is None:
+                    tid = ids[term] = len(terms)
+                    terms.append(term)
+                buf.append(tid)
+        encoded[rel] = buf.tobytes()
+    return terms, encoded
+
+
+def decode_graph(terms: List[Any], data: bytes) -> List[Tuple[Any, Any, Any]]:
+    """Decode one file's encoded triples back into (s, p, o) terms."""
+    buf = array("I")
+    buf.frombytes(data)
+    it = iter(buf)
+    return [(terms[s], terms[p], terms[o]) for s, p, o in zip(it, it, it)]
+
+
+class GraphSnapshotCache:
+    """Read and write per-ttl-directory graph snapshots under a cache directory."""
+
+    SUFFIX = ".snapshot"
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        """Initialize snapshot cache.
+
+        Args:
+            cache_dir: Directory holding snapshot files
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key_for(ttl_dir: Path) -> str:
+        """Return the snapshot key for a TTL directory (hash of its resolved path)."""
+        return hashlib.sha1(str(Path(ttl_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+
+    def snapshot_path(self, ttl_dir: Path) -> Path:
+        """Return the snapshot file path for a TTL directory."""
+        return self.cache_dir / f"{self.key_for(ttl_dir)}{self.SUFFIX}"
+
+    def load(self, ttl_dir: Path) -> Optional[Dict[str, Any]]:
+        """Load the snapshot for a TTL directory.
+
+        Returns:
+            Snapshot payload dict, or None if missing, unreadable or stale format
+        """
+        path = self.snapshot_path(ttl_dir)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable graph snapshot {path}: {e}")
+            return None
+        if payload.get("version") != SNAPSHOT_VERSION:
+            logger.debug(f"Ignoring graph snapshot {path} with version {payload.get('version')}")
+            return None
+        return payload
+
+    def store(
+        self,
+        ttl_dir: Path,
+        files: Dict[str, Dict[str, Any]],
+        graphs: Dict[str, Iterable[Tuple[Any, Any, Any]]],
+        namespaces: Iterable[Tuple[str, Any]] = (),
+        statistics: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Path:
+        """Write a snapshot for a TTL directory.
+
+        Args:
+            ttl_dir: Source TTL directory
+            files: Mapping of relative path -> fingerprint for every cached file
+            graphs: Mapping of relative path -> triples parsed from that file
+            namespaces: Prefix bindings to restore on load
+            statistics: Graph statistics summaries (see
+                :meth:`~src.rdf_index.GraphStatistics.summary`) by load scope key
+
+        Returns:
+            Path of the written snapshot
+        """
+        terms, encoded = encode_graphs(graphs)
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "ttl_dir": str(Path(ttl_dir).resolve()),
+            "created": datetime.utcnow().isoformat() + "Z",
+            "files": files,
+            "namespaces": [(str(p), str(ns)) for p, ns in namespaces],
+            "terms": terms,
+            "graphs": encoded,
+            "statistics": statistics or {},
+        }
+        path = self.snapshot_path(ttl_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never observe a partial snapshot
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        logger.debug(f"Wrote graph snapshot {path} ({len(files)} files, {len(terms)} terms)")
+        return path
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Describe every snapshot in the cache directory.
+
+        Returns:
+            List of dicts with keys: key, path, bytes, ttl_dir, created, files, terms, triples
+        """
+        out = []
+        if not self.cache_dir.exists():
+            return out
+        for path in sorted(self.cache_dir.glob(f"*{self.SUFFIX}")):
+            entry = {"key": path.stem, "path": str(path), "bytes": path.stat().st_size}
+            try:
+                with open(path, "rb") as f:
+                    payload = pickle.load(f)
+                entry.update({
+                    "ttl_dir": payload.get("ttl_dir"),
+                    "created": payload.get("created"),
+                    "files": len(payload.get("files", {})),
+                    "terms": len(payload.get("terms", [])),
+                    "triples": sum(len(b) // 12 for b in payload.get("graphs", {}).values()),
+                })
+            except Exception as e:
+                entry["error"] = str(e)
+            out.append(entry)
+        return out
+
+    def evict(self, keys: Optional[Iterable[str]] = None) -> int:
+        """Remove snapshots from the cache.
+
+        Args:
+            keys: Snapshot keys to remove; None removes every snapshot
+
+        Returns:
+            Number of snapshot files removed
+        """
+        if not self.cache_dir.exists():
+            return 0
+        if keys is None:
+            paths = list(self.cache_dir.glob(f"*{self.SUFFIX}"))
+        else:
+            paths = [self.cache_dir / f"{k}{self.SUFFIX}" for k in keys]
+        removed = 0
+        for path in paths:
+            if path.exists():
+                path.unlink()
+                removed += 1
+                logger.info(f"Evicted {path}")
+            manifest = path.with_name(f"{path.stem}{LoadManifest.SUFFIX}")
+            if manifest.exists():
+                manifest.unlink()
+            # Operator spec index built from the same ttl_dir (see src.rdf_index)
+            opspecs = path.with_name(f"{path.stem}.opspecs")
+            if opspecs.exists():
+                opspecs.unlink()
+            # Memory-mapped ontology images built from the same ttl_dir (see src.rdf_store)
+            for image in self.cache_dir.glob(f"{path.stem}-*.image"):
+                image.unlink()
+                logger.info(f"Evicted {image}")
+        return removed
+
+
+class LoadManifest:
+    """Per-file parse outcomes for a TTL directory, persisted as JSON next to its snapshot.
+
+    Each entry is keyed by relative path and is only valid for the content hash
+    it was recorded against, so editing a file clears its outcome.
+    """
+
+    SUFFIX = ".manifest.json"
+
+    def __init__(self, cache_dir: Optional[Path], ttl_dir: Path):
+        """Initialize load manifest.
+
+        Args:
+            cache_dir: Directory holding the manifest file (None keeps it in memory only)
+            ttl_dir: TTL directory the manifest describes
+        """
+        self.path = Path(cache_dir) / f"{GraphSnapshotCache.key_for(ttl_dir)}{self.SUFFIX}" if cache_dir else None
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.files = json.load(f).get("files", {})
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable load manifest {self.path}: {e}")
+
+    def get(self, rel: str, sha1: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the recorded outcome for a file if it matches the given content hash."""
+        entry = self.files.get(rel)
+        if entry and entry.get("sha1") == sha1:
+            return entry
+        return None
+
+    def known_failure(self, rel: str, sha1: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the recorded failure for a file whose content has not changed since."""
+        entry = self.get(rel, sha1)
+        return entry if entry and entry.get("status") == "failed" else None
+
+    def record(
+        self,
+        rel: str,
+        sha1: Optional[str],
+        size: int,
+        seconds: Optional[float],
+        triples: int,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of loading one file.
+
+        Args:
+            rel: Relative file path
+            sha1: Content hash the outcome applies to
+            size: File size in bytes
+            seconds: Parse time (None when restored from the snapshot cache)
+            triples: Number of triples loaded
+            error: Failure reason, if the file could not be parsed
+        """
+        self.files[rel] = {
+            "path": rel,
+            "sha1": sha1,
+            "status": "failed" if error else "ok",
+            "error": error,
+            "parse_ms": round(seconds * 1000, 3) if seconds is not None else None,
+            "triples": triples,
+            "bytes": size,
+            "checked": datetime.utcnow().isoformat() + "Z",
+        }
+        self.dirty = True
+
+    def forget(self, rels: Iterable[str]) -> None:
+        """Drop the outcomes of files that no longer exist."""
+        for rel in rels:
+            if self.files.pop(rel, None) is not None:
+                self.dirty = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed since it was loaded (best-effort)."""
+        if not self.path or not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"files": self.files}, f, indent=1, sort_keys=True)
+            tmp.replace(self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to write load manifest {self.path}: {e}")
+
+
+class SanitizedTextCache:
+    """Sanitized copies of generated TTL files, keyed by source content hash."""
+
+    SUFFIX = ".ttl"
+
+    def __init__(self, cache_dir: Path):
+        """Initialize sanitized-copy cache.
+
+        Args:
+            cache_dir: Directory holding sanitized copies
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def get(self, sha1: str) -> Optional[str]:
+        """Return the sanitized text for a source content hash, or None if not cached."""
+        path = self.cache_dir / f"{sha1}{self.SUFFIX}"
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, sha1: str, text: str) -> None:
+        """Store the sanitized text for a source content hash (best-effort)."""
+        path = self.cache_dir / f"{sha1}{self.SUFFIX}"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name: several parse workers may write the same entry
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.debug(f"Failed to cache sanitized copy {path}: {e}")
+
+    def clear(self) -> int:
+        """Remove every cached copy and return how many were removed."""
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            path.unlink()
+            removed += 1
+        return removed
+
+
+def encode_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Encode result rows column by column over a shared string table.
+
+    Each column is an unsigned int array with one id per row: 0 when the row
+    has no such key, 1 for None, and 2 + string index otherwise.
+
+    Args:
+        rows: Row dicts (string or None values), as from ``results_to_dicts``
+
+    Returns:
+        Dict with keys: columns (names in first-seen order), strings, rows (count)
+        and data (column name -> packed id array bytes)
+    """
+    columns: List[str] = []
+    for row in rows:
+        for name in row:
+            if name not in columns:
+                columns.append(name)
+    strings: List[str] = []
+    ids: Dict[str, int] = {}
+    data = {}
+    for name in columns:
+        buf = array("I")
+        for row in rows:
+            if name not in row:
+                buf.append(0)
+                continue
+            value = row[name]
+            if value is None:
+                buf.append(1)
+                continue
+            value = str(value)
+            sid = ids.get(value)
+            if sid is None:
+                sid = ids[value] = len(strings)
+                strings.append(value)
+            buf.append(sid + 2)
+        data[name] = buf.tobytes()
+    return {"columns": columns, "strings": strings, "rows": len(rows), "data": data}
+
+
+def decode_rows(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rehydrate row dicts encoded by :func:`encode_rows` (keys in their original order)."""
+    strings = payload["strings"]
+    rows: List[Dict[str, Any]] = [{} for _ in range(payload["rows"])]
+    for name in payload["columns"]:
+        buf = array("I")
+        buf.frombytes(payload["data"][name])
+        for row, sid in zip(rows, buf):
+            if sid:
+                row[name] = strings[sid - 2] if sid > 1 else None
+    return rows
+
+
+class QueryResultCache:
+    """On-disk cache of SELECT results, one columnar file per (query, graph, bindings) key.
+
+    Entries are evicted once unused for ``max_age_days``, and least recently
+    used first once the cache grows past ``max_bytes``.
+    """
+
+    SUFFIX = ".rows"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = MAX_RESULT_CACHE_BYTES,
+        max_age_days: float = MAX_RESULT_AGE_DAYS,
+    ):
+        """Initialize query result cache.
+
+        Args:
+            cache_dir: Directory holding cached results
+            max_bytes: Total size above which least recently used entries are evicted
+            max_age_days: Entries unused for longer than this are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        # Running total of entry sizes, computed by the first prune
+        self._bytes: Optional[int] = None
+
+    @staticmethod
+    def key_for(query: str, fingerprint: str, bindings: Optional[Dict[str, Any]] = None) -> str:
+        """Return the cache key for a normalized query, graph fingerprint and bindings."""
+        h = hashlib.sha1()
+        h.update(query.encode("utf-8"))
+        h.update(b"\0" + fingerprint.encode("utf-8"))
+        for name in sorted(bindings or {}):
+            value = bindings[name]
+            term = value.n3() if hasattr(value, "n3") else repr(value)
+            h.update(f"\0{name}={term}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached rows for a key, or None (counted as a miss)."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                path.unlink()
+                raise FileNotFoundError(path)
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+            if payload.get("version") != RESULT_CACHE_VERSION:
+                raise ValueError(f"version {payload.get('version')}")
+            rows = decode_rows(payload)
+            # Mark as recently used for size-based eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring cached result {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return rows
+
+    def put(self, key: str, rows: List[Dict[str, Any]], query: str = "") -> None:
+        """Store the rows for a key (best-effort), evicting entries if over budget."""
+        path = self._path(key)
+        payload = {"version": RESULT_CACHE_VERSION, "created": datetime.utcnow().isoformat() + "Z", "query": query}
+        payload.update(encode_rows(rows))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(path)
+        except OSError as e:
+            logger.debug(f"Failed to cache query result {path}: {e}")
+            return
+        if self._bytes is None:
+            self.prune()
+        else:
+            self._bytes += path.stat().st_size
+            if self._bytes > self.max_bytes:
+                self.prune()
+
+    def prune(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        """Evict expired entries, then least recently used ones until under the size budget.
+
+        Args:
+            max_bytes: Size budget (default: the cache's max_bytes)
+            max_age_days: Maximum time since last use (default: the cache's max age)
+
+        Returns:
+            Number of entries removed
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age_days is None else max_age_days * 86400
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}") if self.cache_dir.exists() else ():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if now - mtime <= max_age and total <= max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+                total -= size
+            except OSError:
+                pass
+        self._bytes = total
+        if removed:
+            logger.debug(f"Evicted {removed} cached query result(s) from {self.cache_dir}")
+        return removed
+
+    def info(self) -> Dict[str, int]:
+        """Return hit/miss counts for this process and the number and size of cached entries."""
+        paths = list(self.cache_dir.glob(f"*{self.SUFFIX}")) if self.cache_dir.exists() else []
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(paths),
+            "bytes": sum(p.stat().st_size for p in paths),
+        }
+
+    def clear(self) -> int:
+        """Remove every cached result and return how many were removed."""
+        removed = self.prune(max_bytes=-1)
+        self._bytes = 0
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or evict RDF graph snapshot caches")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Snapshot cache directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List cached snapshots")
+    p_evict = sub.add_parser("evict", help="Remove cached snapshots")
+    p_evict.add_argument("keys", nargs="*", help="Snapshot keys to remove (see 'list')")
+    p_evict.add_argument("--all", action="store_true", help="Remove every snapshot")
+    p_report = sub.add_parser("report", help="Show per-file parse outcomes of the last loads")
+    p_report.add_argument("--ttl-dir", type=Path, default=Path("ttl"), help="TTL directory to report on")
+    p_report.add_argument("--failed", action="store_true", help="Only list files that failed to parse")
+    p_report.add_argument(
+        "--profile-load",
+        nargs="?",
+        type=Path,
+        const=DEFAULT_LOAD_PROFILE,
+        default=None,
+        metavar="JSON",
+        help="Load the graph now and print read/sanitize/parse timings per file and directory, writing them as JSON",
+    )
+    p_report.add_argument("--workers", type=int, default=1, help="Processes used to parse TTL files with --profile-load")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    cache = GraphSnapshotCache(args.cache_dir)
+    sanitized = SanitizedTextCache(args.cache_dir / "sanitized")
+    results = QueryResultCache(args.cache_dir / "results")
+
+    if args.command == "list":
+        entries = cache.entries()
+        if not entries:
+            print(f"No snapshots in {args.cache_dir}")
+        for e in entries:
+            if "error" in e:
+                print(f"{e['key']}  {e['bytes']:>10} B  unreadable: {e['error']}")
+                continue
+            print(
+                f"{e['key']}  {e['bytes']:>10} B  files={e['files']} terms={e['terms']} "
+                f"triples={e['triples']}  created={e['created']}  {e['ttl_dir']}"
+            )
+        copies = len(list(sanitized.cache_dir.glob(f"*{sanitized.SUFFIX}"))) if sanitized.cache_dir.exists() else 0
+        print(f"{copies} sanitized opset file(s) in {sanitized.cache_dir}")
+        info = results.info()
+        print(f"{info['entries']} cached query result(s), {info['bytes']} B in {results.cache_dir}")
+        return 0
+
+    if args.command == "report" and args.profile_load:
+        from src.rdf_manager import RDFManager, write_load_profile
+
+        write_load_profile(RDFManager(args.ttl_dir, cache_dir=args.cache_dir, workers=args.workers), args.profile_load)
+        return 0
+
+    if args.command == "report":
+        manifest = LoadManifest(args.cache_dir, args.ttl_dir)
+        entries = sorted(manifest.files.values(), key=lambda e: e["path"])
+        if args.failed:
+            entries = [e for e in entries if e["status"] == "failed"]
+        if not entries:
+            print(f"No load outcomes recorded for {args.ttl_dir} in {args.cache_dir}")
+            return 0
+        print(f"{'status':<7} {'parse ms':>9} {'triples':>8} {'bytes':>9}  path")
+        for e in entries:
+            parse_ms = f"{e['parse_ms']:.1f}" if e.get("parse_ms") is not None else "cached"
+            print(f"{e['status']:<7} {parse_ms:>9} {e['triples']:>8} {e['bytes']:>9}  {e['path']}")
+            if e.get("error"):
+                print("        " + e["error"].replace("\n", "\n        "))
+        failed = sum(1 for e in manifest.files.values() if e["status"] == "failed")
+        print(f"{len(manifest.files)} files, {failed} failed")
+        return 0
+
+    if not args.all and not args.keys:
+        parser.error("evict needs snapshot KEYs or --all")
+    removed = cache.evict(None if args.all else args.keys)
+    print(f"Removed {removed} snapshot(s) from {args.cache_dir}")
+    if args.all:
+        print(f"Removed {sanitized.clear()} sanitized opset file(s) from {sanitized.cache_dir}")
+        print(f"Removed {results.clear()} cached query result(s) from {results.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
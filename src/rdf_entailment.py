@@ -0,0 +1,187 @@
+"""RDFS entailment for the ontology schema files.
+
+``ttl/motif.rdfs.ttl`` and ``ttl/onnx.rdfs.ttl`` declare the class and
+property hierarchies and the domains and ranges of the ontology. Queries
+that need them would otherwise spell out property paths such as
+``?x rdf:type/rdfs:subClassOf* ?c``, which rdflib evaluates slowly.
+:class:`SchemaClosure` computes the reflexive-transitive closure of
+``rdfs:subClassOf`` and ``rdfs:subPropertyOf`` and the domains and ranges
+each property inherits. It depends only on the schema files, so it is cached
+on disk keyed on their content hashes. :meth:`SchemaClosure.entail` then
+derives, in one pass over the data, the RDFS consequences (rules rdfs2, 3,
+5, 6, 7, 9, 10, 11) that are not in the graph yet, so plain triple patterns see
+them.
+
+Typing with ``rdfs:Resource`` and ``rdfs:Literal`` holds for every resource
+(or literal) and is not materialized.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import rdflib
+
+from src.rdf_index import RDF_TYPE
+
+logger = logging.getLogger(__name__)
+
+# Schema files (relative to ttl_dir) whose entailments RDFManager(rdfs=True) materializes
+RDFS_SCHEMA_FILES = ("motif.rdfs.ttl", "onnx.rdfs.ttl")
+
+# Named graph holding the materialized entailments
+RDFS_GRAPH = "urn:x-motifs:rdfs"
+
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+SUBCLASS_OF = RDFS_NS + "subClassOf"
+SUBPROPERTY_OF = RDFS_NS + "subPropertyOf"
+DOMAIN = RDFS_NS + "domain"
+RANGE = RDFS_NS + "range"
+
+# Declaration class -> the relation its instances are reflexive under
+_DECLARATIONS = {RDFS_NS + "Class": SUBCLASS_OF, "http://www.w3.org/1999/02/22-rdf-syntax-ns#Property": SUBPROPERTY_OF}
+
+# Classes every resource (or literal) is an instance of; typing with them adds nothing
+_TRIVIAL_CLASSES = {RDFS_NS + "Resource", RDFS_NS + "Literal"}
+
+
+def _closure(edges: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+    """Return the reflexive-transitive closure of a relation, per node, sorted."""
+    nodes = set(edges) | {n for targets in edges.values() for n in targets}
+    closed: Dict[str, List[str]] = {}
+    for node in nodes:
+        seen = {node}
+        stack = [node]
+        while stack:
+            for target in edges.get(stack.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        closed[node] = sorted(seen)
+    return closed
+
+
+class SchemaClosure:
+    """Class and property hierarchies of a schema, closed, with inherited domains and ranges."""
+
+    def __init__(
+        self,
+        superclasses: Dict[str, List[str]],
+        superproperties: Dict[str, List[str]],
+        domains: Dict[str, List[str]],
+        ranges: Dict[str, List[str]],
+    ):
+        """Initialize schema closure.
+
+        Args:
+            superclasses: Class IRI -> every superclass IRI, itself included
+            superproperties: Property IRI -> every superproperty IRI, itself included
+            domains: Property IRI -> classes its subjects are instances of (closed under superclasses)
+            ranges: Property IRI -> classes its IRI/blank node objects are instances of (closed under superclasses)
+        """
+        self.superclasses = superclasses
+        self.superproperties = superproperties
+        self.domains = domains
+        self.ranges = ranges
+
+    @classmethod
+    def from_triples(cls, triples: Iterable[Tuple[Any, Any, Any]]) -> "SchemaClosure":
+        """Compute the closure of the schema triples (IRI subjects and objects only)."""
+        edges: Dict[str, Dict[str, Set[str]]] = {SUBCLASS_OF: {}, SUBPROPERTY_OF: {}, DOMAIN: {}, RANGE: {}}
+        for s, p, o in triples:
+            if not isinstance(s, rdflib.URIRef) or not isinstance(o, rdflib.URIRef):
+                continue
+            if str(p) in edges:
+                edges[str(p)].setdefault(str(s), set()).add(str(o))
+            elif str(p) == RDF_TYPE and str(o) in _DECLARATIONS:
+                # Declared classes and properties are their own subclass / subproperty (rdfs6, rdfs10)
+                edges[_DECLARATIONS[str(o)]].setdefault(str(s), set())
+        superclasses = _closure(edges[SUBCLASS_OF])
+        superproperties = _closure(edges[SUBPROPERTY_OF])
+
+        def inherited(declared: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+            result = {}
+            for prop in set(declared) | set(superproperties):
+                classes = {c for sup in superproperties.get(prop, [prop]) for c in declared.get(sup, ())}
+                classes = {sup for c in classes for sup in superclasses.get(c, [c])}
+                if classes:
+                    result[prop] = sorted(classes)
+            return result
+
+        return cls(superclasses, superproperties, inherited(edges[DOMAIN]), inherited(edges[RANGE]))
+
+    def schema_triples(self) -> Iterator[Tuple[Any, Any, Any]]:
+        """Yield the closed hierarchy and the inherited domains and ranges as triples."""
+        for predicate, relation in (
+            (SUBCLASS_OF, self.superclasses),
+            (SUBPROPERTY_OF, self.superproperties),
+            (DOMAIN, self.domains),
+            (RANGE, self.ranges),
+        ):
+            for s, targets in relation.items():
+                for o in targets:
+                    yield rdflib.URIRef(s), rdflib.URIRef(predicate), rdflib.URIRef(o)
+
+    def entail(self, graph: Any) -> Set[Tuple[Any, Any, Any]]:
+        """Return the entailments of the schema and a graph's data that the graph does not contain.
+
+        Args:
+            graph: Graph holding the data (and usually the schema itself)
+
+        Returns:
+            Set of entailed triples
+        """
+        rdf_type = rdflib.URIRef(RDF_TYPE)
+        entailed: Set[Tuple[Any, Any, Any]] = set(self.schema_triples())
+        types: Set[Tuple[Any, Any]] = set()
+        for prop in set(self.superproperties) | set(self.domains) | set(self.ranges):
+            supers = [rdflib.URIRef(q) for q in self.superproperties.get(prop, ()) if q != prop]
+            domains = self.domains.get(prop, ())
+            ranges = self.ranges.get(prop, ())
+            for s, o in graph.subject_objects(rdflib.URIRef(prop)):
+                entailed.update((s, q, o) for q in supers)
+                types.update((s, c) for c in domains)
+                if not isinstance(o, rdflib.Literal):
+                    types.update((o, c) for c in ranges)
+        for cls, supers in self.superclasses.items():
+            for x in graph.subjects(rdf_type, rdflib.URIRef(cls)):
+                types.update((x, c) for c in supers if c != cls)
+        entailed.update((x, rdf_type, rdflib.URIRef(c)) for x, c in types if c not in _TRIVIAL_CLASSES)
+        return {t for t in entailed if t not in graph}
+
+    @staticmethod
+    def key(schema: Dict[str, Optional[str]]) -> str:
+        """Return the cache key for schema files given as relative path -> content hash."""
+        return hashlib.sha1(json.dumps(sorted(schema.items())).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SchemaClosure"]:
+        """Read a cached closure, or return None if it is missing or unreadable."""
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["superclasses"], data["superproperties"], data["domains"], data["ranges"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable RDFS closure cache {path}: {e}")
+            return None
+
+    def save(self, path: Path) -> None:
+        """Write the closure to the cache (best-effort)."""
+        data = {
+            "superclasses": self.superclasses,
+            "superproperties": self.superproperties,
+            "domains": self.domains,
+            "ranges": self.ranges,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write RDFS closure cache {path}: {e}")
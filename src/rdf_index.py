@@ -0,0 +1,351 @@
+"""In-memory lookup indexes kept alongside an RDFManager graph.
+
+Scanning every ``rdfs:label`` triple for each label lookup is linear in the
+size of the ontology, and lookups run once per motif or operator when
+generating snippets and pages. :class:`LabelIndex` maps label text (exact and
+case-folded) to the subjects carrying it, for ``rdfs:label`` and
+``skos:prefLabel``. It is maintained incrementally from the triples of each
+loaded TTL file, with a reference count per (label, subject) so a subject
+labelled by several files stays indexed until the last of them is removed.
+
+:class:`OperatorSpecIndex` holds the materialised spec of every ONNX operator
+(as built by ``RDFManager.get_operator_spec``), keyed by IRI, label and
+(domain, name, sinceVersion), and is persisted next to the graph snapshot
+for the graph content it was built from.
+
+:class:`GraphStatistics` keeps triple and distinct-term counts plus per
+predicate and per ``rdf:type`` histograms, counted from the store once after
+file graphs are added or removed, so repeated summary calls never rescan the
+graph.
+"""
+import bisect
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+SKOS_PREF_LABEL = "http://www.w3.org/2004/02/skos/core#prefLabel"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+# Indexed label predicates, by the short name used in lookups
+LABEL_PREDICATES = {"label": RDFS_LABEL, "prefLabel": SKOS_PREF_LABEL}
+
+# Lookup modes accepted by LabelIndex.find
+MATCH_MODES = ("exact", "casefold", "prefix")
+
+# Bump whenever the persisted operator spec layout or the spec contents change
+OPSPEC_INDEX_VERSION = 1
+
+
+class LabelIndex:
+    """Label text -> subjects index over ``rdfs:label`` and ``skos:prefLabel``."""
+
+    def __init__(self):
+        """Initialize an empty label index."""
+        self._by_predicate = {str(uri): name for name, uri in LABEL_PREDICATES.items()}
+        # (predicate name, label) -> {subject: refcount}; insertion order is load order
+        self._exact: Dict[Tuple[str, str], Dict[Any, int]] = {}
+        self._folded: Dict[Tuple[str, str], Dict[Any, int]] = {}
+        # Sorted case-folded labels per predicate for prefix lookups, rebuilt on demand
+        self._sorted: Optional[Dict[str, List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @staticmethod
+    def _bump(table: Dict[Tuple[str, str], Dict[Any, int]], key: Tuple[str, str], subject: Any, delta: int) -> None:
+        subjects = table.get(key)
+        if subjects is None:
+            if delta < 0:
+                return
+            subjects = table[key] = {}
+        count = subjects.get(subject, 0) + delta
+        if count > 0:
+            subjects[subject] = count
+        else:
+            subjects.pop(subject, None)
+            if not subjects:
+                del table[key]
+
+    def _update(self, triples: Iterable[Tuple[Any, Any, Any]], delta: int) -> None:
+        for s, p, o in triples:
+            name = self._by_predicate.get(str(p))
+            if name is None:
+                continue
+            label = str(o)
+            self._bump(self._exact, (name, label), s, delta)
+            self._bump(self._folded, (name, label.casefold()), s, delta)
+            self._sorted = None
+
+    def add(self, triples: Iterable[Tuple[Any, Any, Any]]) -> None:
+        """Index the label triples among ``triples`` (others are ignored)."""
+        self._update(triples, 1)
+
+    def remove(self, triples: Iterable[Tuple[Any, Any, Any]]) -> None:
+        """Drop label triples previously passed to :meth:`add`."""
+        self._update(triples, -1)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._exact.clear()
+        self._folded.clear()
+        self._sorted = None
+
+    def find(self, label: str, match: str = "exact", predicates: Sequence[str] = ("label",)) -> List[Any]:
+        """Return the subjects whose label matches.
+
+        Args:
+            label: Label text (or prefix)
+            match: 'exact', 'casefold' (case-insensitive exact) or 'prefix'
+                (case-insensitive prefix)
+            predicates: Label predicates to search, by name ('label' for
+                rdfs:label, 'prefLabel' for skos:prefLabel)
+
+        Returns:
+            Matching subjects without duplicates, in load order per label
+
+        Raises:
+            ValueError: If ``match`` or a predicate name is not known
+        """
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown label match '{match}' (expected one of {', '.join(MATCH_MODES)})")
+        unknown = [name for name in predicates if name not in LABEL_PREDICATES]
+        if unknown:
+            raise ValueError(f"Unknown label predicate(s) {', '.join(unknown)} (expected {', '.join(LABEL_PREDICATES)})")
+        found: Dict[Any, None] = {}
+        for name in predicates:
+            if match == "exact":
+                keys = [label]
+                table = self._exact
+            else:
+                keys = [label.casefold()] if match == "casefold" else self._prefixed(name, label.casefold())
+                table = self._folded
+            for key in keys:
+                for subject in table.get((name, key), ()):
+                    found[subject] = None
+        return list(found)
+
+    def _prefixed(self, name: str, prefix: str) -> List[str]:
+        """Return the case-folded labels of a predicate that start with ``prefix``."""
+        if self._sorted is None:
+            self._sorted = {n: [] for n in LABEL_PREDICATES}
+            for n, folded in self._folded:
+                self._sorted[n].append(folded)
+            for labels in self._sorted.values():
+                labels.sort()
+        labels = self._sorted[name]
+        out = []
+        for i in range(bisect.bisect_left(labels, prefix), len(labels)):
+            if not labels[i].startswith(prefix):
+                break
+            out.append(labels[i])
+        return out
+
+
+class OperatorSpecIndex:
+    """Operator specs keyed by IRI, with label and (domain, name, sinceVersion) lookups."""
+
+    SUFFIX = ".opspecs"
+
+    def __init__(self, specs: Dict[str, Dict[str, Any]], fingerprint: str):
+        """Initialize operator spec index.
+
+        Args:
+            specs: Mapping of operator IRI -> spec dict
+            fingerprint: Content fingerprint of the graph the specs were built from
+        """
+        self.specs = specs
+        self.fingerprint = fingerprint
+        self._by_label: Dict[str, List[str]] = {}
+        self._by_key: Dict[Tuple[Optional[str], str, Any], str] = {}
+        for iri, spec in specs.items():
+            if spec.get("label"):
+                self._by_label.setdefault(spec["label"], []).append(iri)
+            self._by_key[(spec.get("domain"), self.name_of(iri, spec), spec.get("sinceVersion"))] = iri
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    @staticmethod
+    def name_of(iri: str, spec: Dict[str, Any]) -> str:
+        """Return an operator's name: its label, else the local name of its IRI."""
+        return spec.get("label") or iri.rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+
+    def get(self, iri: str) -> Optional[Dict[str, Any]]:
+        """Return the spec of an operator IRI, or None if it is not indexed."""
+        return self.specs.get(iri)
+
+    def by_label(self, label: str) -> List[Dict[str, Any]]:
+        """Return the specs whose label equals ``label``."""
+        return [self.specs[iri] for iri in self._by_label.get(label, ())]
+
+    def by_key(self, domain: Optional[str], name: str, since_version: Any) -> Optional[Dict[str, Any]]:
+        """Return the spec for an exact (domain, name, sinceVersion) key."""
+        iri = self._by_key.get((domain, name, since_version))
+        return self.specs[iri] if iri else None
+
+    def find(self, name: str, domain: Optional[str] = None, opset: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return the spec of an operator as seen from an opset version.
+
+        Args:
+            name: Operator name (label or IRI local name)
+            domain: Operator domain (e.g. 'ai.onnx'); None matches any
+            opset: Opset version; the spec with the highest sinceVersion not
+                above it is returned (None returns the newest)
+
+        Returns:
+            Spec dict, or None if no version matches
+        """
+        best = None
+        for (d, n, since), iri in self._by_key.items():
+            if n != name or (domain is not None and d != domain) or not isinstance(since, int):
+                continue
+            if opset is not None and since > opset:
+                continue
+            if best is None or since > best[0]:
+                best = (since, iri)
+        return self.specs[best[1]] if best else None
+
+    def save(self, path: Path) -> None:
+        """Persist the index (best-effort)."""
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(
+                    {"version": OPSPEC_INDEX_VERSION, "fingerprint": self.fingerprint, "specs": self.specs},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            tmp.replace(path)
+        except Exception as e:
+            logger.warning(f"Failed to write operator spec index {path}: {e}")
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Optional["OperatorSpecIndex"]:
+        """Load a persisted index if it was built from a graph with ``fingerprint``."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable operator spec index {path}: {e}")
+            return None
+        if payload.get("version") != OPSPEC_INDEX_VERSION or payload.get("fingerprint") != fingerprint:
+            return None
+        return cls(payload["specs"], fingerprint)
+
+
+class GraphStatistics:
+    """Triple, distinct-term and histogram counts over the union of loaded file graphs.
+
+    The counts are computed from the store in one pass over the union graph
+    the first time they are asked for after a change (see :meth:`invalidate`)
+    and kept until the next change; only the totals and per-predicate and
+    per-class counts are kept, never the triples or terms themselves. Counts
+    persisted with the graph (e.g. in its snapshot) can be passed in so they
+    are not recounted. Statistics restored with :meth:`from_summary` (e.g.
+    from an ontology image header) are read-only.
+    """
+
+    def __init__(self, graph: Any = None, summary: Optional[Dict[str, Any]] = None):
+        """Initialize statistics.
+
+        Args:
+            graph: Union graph to count (e.g. an ``rdflib.Dataset`` with ``default_union``)
+            summary: Known counts of the graph as it is now (output of
+                :meth:`summary`); dropped on the next :meth:`invalidate`
+        """
+        self.graph = graph
+        self._summary: Optional[Dict[str, Any]] = summary
+        self._restored = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.counts()["triples"]
+
+    def invalidate(self) -> None:
+        """Drop the counts after triples were added to or removed from the graph."""
+        if self._restored:
+            raise ValueError("Statistics restored from a summary are read-only")
+        self._summary = None
+
+    def _ensure(self) -> Dict[str, Any]:
+        """Return the summary, counting the graph if it changed since the last count."""
+        summary = self._summary
+        if summary is not None:
+            return summary
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._count()
+            return self._summary
+
+    def _count(self) -> Dict[str, Any]:
+        """Count triples, distinct terms and histograms in one pass over the union graph."""
+        triples = 0
+        subjects, objects = set(), set()
+        # predicate -> (triples, distinct subjects, distinct objects); sets only live for this pass
+        per_predicate: Dict[Any, Tuple[List[int], set, set]] = {}
+        types: Dict[Any, int] = {}
+        graph_triples = self.graph.triples((None, None, None)) if self.graph is not None else ()
+        for s, p, o in graph_triples:
+            triples += 1
+            subjects.add(s)
+            objects.add(o)
+            entry = per_predicate.get(p)
+            if entry is None:
+                entry = per_predicate[p] = ([0], set(), set())
+            entry[0][0] += 1
+            entry[1].add(s)
+            entry[2].add(o)
+            if str(p) == RDF_TYPE:
+                types[o] = types.get(o, 0) + 1
+        predicates = sorted(per_predicate.items(), key=lambda item: (-item[1][0][0], str(item[0])))
+        return {
+            "triples": triples,
+            "subjects": len(subjects),
+            "predicates": len(per_predicate),
+            "objects": len(objects),
+            "histograms": {
+                "predicates": {
+                    str(p): {"triples": n[0], "subjects": len(subs), "objects": len(objs)} for p, (n, subs, objs) in predicates
+                },
+                "types": {str(c): n for c, n in sorted(types.items(), key=lambda item: (-item[1], str(item[0])))},
+            },
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of distinct triples, subjects, predicates and objects."""
+        summary = self._ensure()
+        return {k: summary[k] for k in ("triples", "subjects", "predicates", "objects")}
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-predicate and per-class histograms.
+
+        Returns:
+            Dict with 'predicates' (predicate IRI -> {'triples', 'subjects',
+            'objects'}, the last two counting distinct terms) and 'types'
+            (class IRI -> number of rdf:type instances), each ordered by
+            descending triple count
+        """
+        return self._ensure()["histograms"]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the counts and histograms as a JSON-serialisable dict."""
+        return dict(self._ensure())
+
+    @classmethod
+    def from_summary(cls, summary: Dict[str, Any]) -> "GraphStatistics":
+        """Return read-only statistics restored from :meth:`summary` output."""
+        stats = cls()
+        stats._summary = summary
+        stats._restored = True
+        return stats
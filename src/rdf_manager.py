@@ -4,24 +4,80 @@ Loads and manages RDF graph from TTL files, provides interface for
 executing named SPARQL queries and retrieving results in structured format.
 """
 
+import copy
+import gc
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Mapping, Optional, Sequence, Tuple, Union
 import re
+
+from src.rdf_cache import DEFAULT_CACHE_DIR, DEFAULT_LOAD_PROFILE, GraphSnapshotCache, LoadManifest, QueryResultCache, SanitizedTextCache, decode_graph, encode_graphs, file_fingerprint, same_content
+from src.rdf_entailment import RDFS_GRAPH, RDFS_SCHEMA_FILES, SchemaClosure
+from src.rdf_index import LABEL_PREDICATES, GraphStatistics, LabelIndex, OperatorSpecIndex
 try:
     import rdflib
     from rdflib import Namespace, Literal
     from rdflib.query import Result
+    from rdflib.plugins.sparql import prepareQuery
+    from rdflib.term import Identifier
+
+    class UnionDataset(rdflib.Dataset):
+        """``rdflib.Dataset`` whose default graph is the union of its named graphs.
+
+        rdflib 7 deprecates ``Dataset.default_context`` for ``default_graph`` but
+        still reads the old name on every ``triples`` call, so each SPARQL
+        pattern lookup warns; this serves it from ``default_graph`` silently.
+        """
+
+        def __init__(self, store: Any = "default", **kwargs: Any):
+            kwargs.setdefault("default_union", True)
+            super().__init__(store=store, **kwargs)
+
+        @property
+        def default_context(self) -> Any:
+            return self.default_graph
+
+        @default_context.setter
+        def default_context(self, value: Any) -> None:
+            self.default_graph = value
 except Exception:  # rdflib not available in minimal test env, provide lightweight stubs
     from types import SimpleNamespace
 
     class _DummyGraph:
-        def __init__(self):
+        def __init__(self, *args, **kwargs):
             self._triples = []
 
         def parse(self, *args, **kwargs):
             return None
 
+        def addN(self, quads):
+            return None
+
+        def bind(self, *args, **kwargs):
+            return None
+
+        def namespaces(self):
+            return iter(())
+
+        def graph(self, identifier=None):
+            return self
+
+        def remove_graph(self, g):
+            return None
+
+        def __iter__(self):
+            return iter(())
+
         def query(self, *args, **kwargs):
             return []
 
@@ -43,85 +99,1056 @@ except Exception:  # rdflib not available in minimal test env, provide lightweig
         def __len__(self):
             return 0
 
-    rdflib = SimpleNamespace(Graph=_DummyGraph, URIRef=str, RDFS=SimpleNamespace(label=None, comment=None), Literal=str)
+    UnionDataset = _DummyGraph
+    rdflib = SimpleNamespace(Graph=_DummyGraph, Dataset=_DummyGraph, URIRef=str, RDFS=SimpleNamespace(label=None, comment=None), Literal=str)
     Namespace = lambda uri: uri
     Literal = str
     Result = list
+    prepareQuery = lambda sparql, initNs=None: sparql
+    Identifier = str
 
 logger = logging.getLogger(__name__)
 
+# Config files (under config/) that may declare named load profiles, in lookup order
+PROFILE_CONFIG_FILES = ("motif-models.yaml", "wiki.yaml")
+
+# Failure reasons recorded in the load manifest are truncated to this many characters
+MAX_FAILURE_REASON = 500
+
+# Namespace of ONNX operator resources (loaded lazily by profiles that defer ttl/onnx)
+ONNX_NS = "https://ns.onnx.cloud/onnx#"
+
+
+# Header comment written by src/onnx/opset_to_ttl.py; only these files are sanitized
+OPSET_HEADER = "# ONNX operator schema"
+
+# Predicates whose (legacy) generated values may be short literals spanning several lines
+_SANITIZED_PREDICATES = ("onnx:attributes", "onnx:default")
+
+# Characters that start a comment, IRI or string token outside string literals
+_TOKEN_START = re.compile(r"[\"'#<]")
+_SHORT_STRING = {q: re.compile(q + r"(?:[^" + q + r"\\\n]|\\.)*" + q) for q in "\"'"}
+_LONG_STRING = {q: re.compile(q * 3 + r"(?:[^" + q + r"\\]|\\.|" + q + r"(?!" + q * 2 + r"))*" + q * 3, re.S) for q in "\"'"}
+_LITERAL_END = re.compile(r"\s*(\^\^|@|[;,.\])])")
+_LEGACY_LITERAL_END = re.compile(r'"\s*;')
+
+# Graph statistics kept in a snapshot, one per load scope (files and rdfs setting); oldest dropped first
+MAX_SNAPSHOT_STATISTICS = 16
+
+# Prepared (parsed and translated) queries kept per manager; least recently used are dropped first
+MAX_PREPARED_QUERIES = 256
+
+# SPARQL tokens whose text is kept verbatim by _normalize_query (strings and IRIs), comments and whitespace
+_QUERY_TOKENS = re.compile(
+    r'("""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^\'\\]|\\.|\'(?!\'\'))*\'\'\''
+    r'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|<[^<>"{}|^`\\\s]*>)'
+    r"|(?:#[^\n]*|\s)+"
+)
+
+
+def _normalize_query(sparql: str) -> str:
+    """Return SPARQL text with comments dropped and whitespace runs collapsed.
+
+    String literals and IRIs are kept verbatim, so two texts normalize to the
+    same key only if they parse to the same query.
+    """
+    return _QUERY_TOKENS.sub(lambda m: m.group(1) or " ", sparql).strip()
+
+
+@lru_cache(maxsize=65536)
+def _localname(uri: str) -> str:
+    """Return the local name of a URI string (after the last # or /), memoized per URI."""
+    if "#" in uri:
+        return uri.split("#")[-1]
+    return uri.split("/")[-1]
+
+
+def _query_name(sparql: str) -> str:
+    """Return a short name for an inline query, used in log messages."""
+    text = _normalize_query(sparql)
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def is_opset_generated(text: str) -> bool:
+    """Return True if TTL text carries the header of a generated ONNX opset file."""
+    return text.lstrip().startswith(OPSET_HEADER)
+
+
+def _preceding_token(text: str, pos: int) -> str:
+    """Return the whitespace-delimited token that ends right before ``pos``."""
+    end = pos
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+    start = end
+    while start > 0 and not text[start - 1].isspace() and text[start - 1] not in ";,[(":
+        start -= 1
+    return text[start:end]
+
+
+def _ends_literal(text: str, pos: int) -> bool:
+    """Return True if ``pos`` (just after a closing quote) is a valid end of a Turtle literal."""
+    return pos == len(text) or _LITERAL_END.match(text, pos) is not None
+
 
 def _sanitize_opset_content(text: str) -> str:
     """Sanitize ONNX opset TTL content to collapse multiline attribute blocks.
 
-    This is a best-effort sanitizer that replaces multiline attribute blocks
-    with a single-line quoted summary to avoid Turtle parse errors from
-    generated operator schemas.
+    Older generated operator schemas wrote ``onnx:attributes`` / ``onnx:default``
+    values as short ``"..."`` literals containing raw newlines and unescaped
+    quotes, which is not valid Turtle. This scans the text once, skipping
+    comments, IRIs and well-formed (short or triple-quoted) literals, and only
+    rewrites a malformed literal in object position of those predicates into a
+    single-line quoted summary. Valid content is returned unchanged.
     """
-    # Replace multiline onnxop:attributes "..." ; and onnx:default "..." ; blocks with single-line summary
-    def repl(m):
-        inner = m.group(1)
-        # Collapse whitespace and escape internal quotes
-        safe = re.sub(r"\s+", " ", inner).replace('"', '\\"')
-        return f'onnx:attributes "{safe}" ;'
-
-    def repl_default(m):
-        inner = m.group(1)
-        safe = re.sub(r"\s+", " ", inner).replace('"', '\\"')
-        return f'onnx:default "{safe}" ;'
-
-    # Match patterns like: onnx:attributes "..." ; or onnx:default "..." ; spanning multiple lines
-    sanitized = re.sub(r'onnx:attributes\s*"([\s\S]*?)"\s*;', repl, text, flags=re.IGNORECASE)
-    sanitized = re.sub(r'onnx:default\s*"([\s\S]*?)"\s*;', repl_default, sanitized, flags=re.IGNORECASE)
+    out: List[str] = []
+    pos = 0
+    scan = 0
+    n = len(text)
+    while True:
+        m = _TOKEN_START.search(text, scan)
+        if m is None:
+            break
+        i = m.start()
+        c = text[i]
+        if c == "#":
+            end = text.find("\n", i)
+        elif c == "<":
+            end = text.find(">", i) + 1
+        elif text.startswith(c * 3, i):
+            long = _LONG_STRING[c].match(text, i)
+            end = long.end() if long else -1
+        else:
+            short = _SHORT_STRING[c].match(text, i)
+            end = short.end() if short else -1
+            malformed = short is None or not _ends_literal(text, end)
+            if c == '"' and malformed and _preceding_token(text, i).lower() in _SANITIZED_PREDICATES:
+                legacy = _LEGACY_LITERAL_END.search(text, i + 1)
+                if legacy:
+                    # Collapse whitespace and escape internal quotes
+                    safe = re.sub(r"\s+", " ", text[i + 1:legacy.start()]).replace('"', '\\"')
+                    out.append(text[pos:i])
+                    out.append(f'"{safe}" ;')
+                    pos = scan = legacy.end()
+                    continue
+        if end <= 0:
+            # Unterminated token: leave the rest for the parser to report
+            break
+        scan = end
+    out.append(text[pos:n])
+    return "".join(out)
+
+
+def _read_ttl_text(ttl_file: Path, sanitized_dir: Optional[Path] = None, stats: Optional[Dict[str, Any]] = None) -> str:
+    """Read a TTL file, sanitizing generated opset files.
+
+    Args:
+        ttl_file: Path to the TTL file
+        sanitized_dir: Directory caching sanitized copies keyed by source content
+            hash (None sanitizes in memory on every read)
+        stats: Dict that receives 'bytes', 'read_ms' and 'sanitize_ms'
+
+    Returns:
+        Turtle text ready to parse
+    """
+    stats = stats if stats is not None else {}
+    start = time.perf_counter()
+    data = ttl_file.read_bytes()
+    text = data.decode("utf-8")
+    stats["bytes"] = len(data)
+    stats["read_ms"] = (time.perf_counter() - start) * 1000
+    stats["sanitize_ms"] = 0.0
+    if not is_opset_generated(text):
+        return text
+    start = time.perf_counter()
+    cache = SanitizedTextCache(sanitized_dir) if sanitized_dir else None
+    key = hashlib.sha1(data).hexdigest()
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        stats["sanitize_ms"] = (time.perf_counter() - start) * 1000
+        return cached
+    sanitized = _sanitize_opset_content(text)
+    if sanitized != text:
+        logger.debug(f"Sanitized multiline attribute literals in {ttl_file.name}")
+    if cache:
+        cache.put(key, sanitized)
+    stats["sanitize_ms"] = (time.perf_counter() - start) * 1000
     return sanitized
 
 
+def _parse_ttl_path(
+    ttl_file: Path, sanitized_dir: Optional[Path] = None
+) -> Tuple[Optional["rdflib.Graph"], Optional[str], Dict[str, Any]]:
+    """Parse a single TTL file into a fresh graph.
+
+    Args:
+        ttl_file: Path to the TTL file
+        sanitized_dir: Directory caching sanitized copies of opset files
+
+    Returns:
+        Tuple of (graph holding the file's triples or None if the file could not
+        be parsed, failure reason or None, timings) where timings has keys
+        bytes, read_ms, sanitize_ms and parse_ms
+    """
+    stats: Dict[str, Any] = {"bytes": 0, "read_ms": 0.0, "sanitize_ms": 0.0, "parse_ms": 0.0}
+    try:
+        text = _read_ttl_text(ttl_file, sanitized_dir, stats)
+        start = time.perf_counter()
+        g = rdflib.Graph(bind_namespaces="none")
+        try:
+            g.parse(data=text, format="turtle")
+        finally:
+            stats["parse_ms"] = (time.perf_counter() - start) * 1000
+        logger.debug(f"Loaded {ttl_file.name}")
+        return g, None, stats
+    except Exception as e:
+        logger.error(f"Failed to load {ttl_file.name}: {e}")
+        reason = f"{type(e).__name__}: {e}"
+        return None, reason if len(reason) <= MAX_FAILURE_REASON else reason[:MAX_FAILURE_REASON] + "...", stats
+
+
+def _parse_ttl_batch(paths: List[str], sanitized_dir: Optional[str] = None) -> Tuple[List[Any], Dict[str, Tuple[Optional[bytes], List[Tuple[str, str]], Dict[str, Any], Optional[str]]]]:
+    """Parse a batch of TTL files in a worker process.
+
+    Triples are shipped back dictionary-encoded (a shared term table plus packed
+    id arrays per file) to keep the pickled result small.
+
+    Args:
+        paths: TTL file paths to parse
+        sanitized_dir: Directory caching sanitized copies of opset files
+
+    Returns:
+        Tuple of (terms, results) where results maps each path to (encoded triples
+        or None on failure, namespace bindings, timings, failure reason); timings
+        are as returned by :func:`_parse_ttl_path`
+    """
+    graphs = {}
+    meta = {}
+    for path in paths:
+        g, error, stats = _parse_ttl_path(Path(path), Path(sanitized_dir) if sanitized_dir else None)
+        if g is None:
+            meta[path] = ([], stats, error)
+            continue
+        graphs[path] = list(g)
+        meta[path] = ([(str(p), str(ns)) for p, ns in g.namespaces()], stats, None)
+    terms, encoded = encode_graphs(graphs)
+    return terms, {path: (encoded.get(path), ns, stats, error) for path, (ns, stats, error) in meta.items()}
+
+
+def _batch_files(ttl_files: List[Path], target_bytes: int) -> List[List[Path]]:
+    """Group files into batches of roughly ``target_bytes`` so small files share a task."""
+    batches: List[List[Path]] = []
+    current: List[Path] = []
+    size = 0
+    for ttl_file in ttl_files:
+        current.append(ttl_file)
+        size += ttl_file.stat().st_size
+        if size >= target_bytes:
+            batches.append(current)
+            current, size = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+# Timing columns of a per-file load entry (see RDFManager.graph_load_report)
+LOAD_TIMINGS = ("read_ms", "sanitize_ms", "parse_ms", "decode_ms", "add_ms")
+
+
+def _load_entry(rel: str, source: str, stats: Optional[Dict[str, Any]] = None, triples: int = 0, error: Optional[str] = None) -> Dict[str, Any]:
+    """Return a per-file load entry.
+
+    Args:
+        rel: Relative file path
+        source: 'parsed', 'snapshot' (restored from the snapshot cache) or
+            'quarantined' (skipped after an earlier failure)
+        stats: Timings and 'bytes' to copy in (missing timings are 0)
+        triples: Number of triples the file contributes to its named graph
+        error: Failure reason, if the file could not be parsed
+    """
+    stats = stats or {}
+    entry = {
+        "path": rel,
+        "dir": Path(rel).parent.as_posix(),
+        "source": source,
+        "status": "failed" if error or source == "quarantined" else "ok",
+        "error": error,
+        "bytes": stats.get("bytes", 0),
+        "triples": triples,
+    }
+    entry.update({col: stats.get(col, 0.0) for col in LOAD_TIMINGS})
+    return entry
+
+
+def _sum_load_entries(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-file load entries into totals (file counts, bytes, triples, timings)."""
+    totals: Dict[str, Any] = {"files": len(entries), "parsed": 0, "snapshot": 0, "failed": 0, "bytes": 0, "triples": 0}
+    totals.update({col: 0.0 for col in LOAD_TIMINGS + ("total_ms",)})
+    for e in entries:
+        if e["status"] == "failed":
+            totals["failed"] += 1
+        elif e["source"] in ("parsed", "snapshot"):
+            totals[e["source"]] += 1
+        for col in ("bytes", "triples", "total_ms") + LOAD_TIMINGS:
+            totals[col] += e[col]
+    for col in LOAD_TIMINGS + ("total_ms",):
+        totals[col] = round(totals[col], 3)
+    return totals
+
+
+def format_load_report(report: Dict[str, Any], limit: Optional[int] = None) -> str:
+    """Render a :meth:`RDFManager.graph_load_report` as plain-text tables.
+
+    Args:
+        report: Report dict
+        limit: Only list this many of the slowest files (None lists all)
+
+    Returns:
+        Per-file table (slowest first), per-directory totals and load phases
+    """
+    cols = ("read_ms", "sanitize_ms", "parse_ms", "decode_ms", "add_ms", "total_ms")
+    header = " ".join(f"{c[:-3]:>9}" for c in cols)
+    lines = [f"{'source':<11} {header} {'triples':>8} {'bytes':>9}  path"]
+    for e in report["files"][:limit]:
+        times = " ".join(f"{e[c]:>9.1f}" for c in cols)
+        lines.append(f"{e['source']:<11} {times} {e['triples']:>8} {e['bytes']:>9}  {e['path']}")
+    lines.append("")
+    lines.append(f"{'files':>5} {header} {'triples':>8} {'bytes':>9}  directory")
+    for d in report["directories"]:
+        times = " ".join(f"{d[c]:>9.1f}" for c in cols)
+        lines.append(f"{d['files']:>5} {times} {d['triples']:>8} {d['bytes']:>9}  {d['dir']}")
+    t = report["totals"]
+    lines.append("")
+    lines.append(
+        f"{t['files']} files ({t['parsed']} parsed, {t['snapshot']} from snapshot, {t['failed']} failed), "
+        f"{t['bytes']} bytes, {t['total_ms']:.1f} ms in files; graph has {report['triples']} triples"
+    )
+    lines.append("phases: " + ", ".join(f"{k} {v:.1f}" for k, v in report["phases"].items()))
+    return "\n".join(lines)
+
+
+def write_load_profile(rdf: "RDFManager", json_path: Path) -> Dict[str, Any]:
+    """Print a manager's :meth:`~RDFManager.graph_load_report` and write it as JSON.
+
+    Backs the ``--profile-load`` flag of the command line tools.
+
+    Args:
+        rdf: Loaded manager
+        json_path: File receiving the JSON report
+
+    Returns:
+        The report dict
+    """
+    report = rdf.graph_load_report()
+    print(format_load_report(report))
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote load profile to {json_path}")
+    return report
+
+
+def load_profile(name: str, config_dir: Path) -> Dict[str, Any]:
+    """Look up a named TTL load profile.
+
+    Profiles live under ``load_profiles`` in ``config/motif-models.yaml`` or
+    ``config/wiki.yaml`` (first match wins) and look like::
+
+        ontology:
+          include: [motif.rdfs.ttl, motifs, models, domains]
+          lazy:
+            - namespace: https://ns.onnx.cloud/onnx
+              include: [onnx.rdfs.ttl, onnx, opset]
+
+    Args:
+        name: Profile name
+        config_dir: Directory holding the project config files
+
+    Returns:
+        Profile dict with 'include' and optional 'lazy' entries
+
+    Raises:
+        ValueError: If no config file declares the profile
+    """
+    import yaml
+
+    for filename in PROFILE_CONFIG_FILES:
+        path = Path(config_dir) / filename
+        if not path.exists():
+            continue
+        with open(path) as f:
+            profiles = (yaml.safe_load(f) or {}).get("load_profiles") or {}
+        if name in profiles:
+            return profiles[name] or {}
+    raise ValueError(f"Unknown load profile '{name}' (looked in {', '.join(PROFILE_CONFIG_FILES)} under {config_dir})")
+
+
 class RDFManager:
     """Manages RDF graph loading, querying, and result retrieval."""
 
-    def __init__(self, ttl_dir: Path):
+    def __init__(
+        self,
+        ttl_dir: Path,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        workers: int = 1,
+        profile: Optional[Any] = None,
+        store: str = "memory",
+        optimize: bool = False,
+        rdfs: bool = False,
+    ):
         """Initialize RDF manager with TTL directory.
 
+        Each TTL file is loaded into its own named graph of a Dataset; queries and
+        graph accessors see the union of all files as the default graph.
+
         Args:
             ttl_dir: Directory containing TTL files to load
+            cache_dir: Directory for the parsed-graph snapshot cache and the query
+                result cache (None disables both); defaults to ``tmp/cache/rdf``
+                under the repository root whatever the working directory
+            workers: Number of processes used to parse TTL files (1 parses in-process,
+                0 or less uses one per CPU core)
+            profile: Load profile name (see :func:`load_profile`) or profile dict
+                restricting which ttl_dir subtrees are loaded; None loads everything
+            store: Triple store backend: "memory" (rdflib default), "array"
+                (dictionary-encoded NumPy arrays, see :mod:`src.rdf_store`; several
+                times smaller, tuned for load-once, query-many use) or "image"
+                (read-only, served from a memory-mapped ontology image under
+                cache_dir that is rebuilt when any TTL file changes; lets worker
+                processes share one copy of the graph)
+            optimize: Reorder the triple patterns of each basic graph pattern by
+                estimated selectivity when preparing queries (see
+                :mod:`src.rdf_planner`); can be toggled later via ``optimize``
+            rdfs: Materialize the RDFS entailments of the schema files (see
+                :mod:`src.rdf_entailment`) into a named graph after every load,
+                so queries can use plain triple patterns instead of
+                ``rdfs:subClassOf*`` paths; needs a writable store
+
+        Raises:
+            ValueError: If ``rdfs`` is combined with ``store='image'``
         """
+        if rdfs and store == "image":
+            raise ValueError("RDFS materialization needs a writable store (not store='image')")
         self.ttl_dir = Path(ttl_dir)
-        self.graph = rdflib.Graph()
+        self.store = store
+        self.graph = UnionDataset(store=self._make_store("array" if store == "image" else store))
         self.namespaces = {}
-        self._load_ttl_files()
+        self.cache = GraphSnapshotCache(cache_dir) if cache_dir else None
+        self.sanitized = SanitizedTextCache(Path(cache_dir) / "sanitized") if cache_dir else None
+        self.results = QueryResultCache(Path(cache_dir) / "results") if cache_dir else None
+        # Per-file parse outcomes; files that failed with unchanged content are skipped
+        self.manifest = LoadManifest(cache_dir, self.ttl_dir)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        if isinstance(profile, str):
+            self.profile_name = profile
+            profile = load_profile(profile, self.ttl_dir.resolve().parent / "config")
+        else:
+            self.profile_name = "custom" if profile else None
+        profile = profile or {}
+        # Subtrees (relative to ttl_dir) currently in scope, and lazy groups not yet loaded
+        self._include: List[str] = [str(e).strip("/") for e in profile.get("include") or []]
+        self._lazy: List[Dict[str, Any]] = [dict(g) for g in profile.get("lazy") or []]
+        # Fingerprints of every scanned file, and named-graph IRIs of the ones that loaded
+        self.file_fingerprints: Dict[str, Dict[str, Any]] = {}
+        self.file_graphs: Dict[str, Any] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        # Load instrumentation (see graph_load_report): per-file entries and phase timings in ms
+        self.load_stats: Dict[str, Dict[str, Any]] = {}
+        self.load_phases: Dict[str, float] = {}
+        # Prepared queries keyed by normalized text (see prepare_query)
+        self._prepared: "OrderedDict[Tuple[bool, str], Any]" = OrderedDict()
+        self._prepared_lock = threading.Lock()
+        self.prepared_stats = {"hits": 0, "misses": 0}
+        self.optimize = optimize
+        # Default per-query limits for SELECT queries (see execute_query); None disables them
+        self.query_timeout: Optional[float] = None
+        self.max_rows: Optional[int] = None
+        # Content fingerprint of the loaded graph, recomputed after loads (see graph_fingerprint)
+        self._fingerprint: Optional[str] = None
+        # rdfs:label / skos:prefLabel -> subjects, maintained per loaded file
+        self.labels = LabelIndex()
+        # Triple/term counts and histograms, recounted after files load or unload (see graph_stats);
+        # restored from the snapshot when it holds them for the loaded files
+        self.statistics = GraphStatistics(self.graph)
+        # Set when the loaded files differ from the snapshot, which is then rewritten (see _sync_snapshot)
+        self._snapshot_stale = False
+        # Operator specs, built on first use for the current graph fingerprint
+        self._op_index: Optional[OperatorSpecIndex] = None
+        # Materialized RDFS entailments (named graph RDFS_GRAPH), recomputed whenever files load
+        self.rdfs = rdfs
+        self.rdfs_triples = 0
+        if store == "image":
+            self._open_image()
+        else:
+            self._load_ttl_files()
+            self._materialize_rdfs()
+            self._sync_snapshot()
+
+    @staticmethod
+    def _make_store(store: str) -> Any:
+        """Return the rdflib store argument for a backend name."""
+        if store == "memory":
+            return "default"
+        if store == "array":
+            from src.rdf_store import ArrayStore
+
+            return ArrayStore()
+        raise ValueError(f"Unknown RDF store backend '{store}' (expected 'memory', 'array' or 'image')")
+
+    def _add_phase(self, name: str, start: float) -> None:
+        """Add the milliseconds elapsed since ``start`` to a load phase timing."""
+        self.load_phases[name] = self.load_phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def _in_scope(self, rel: str, include: Optional[List[str]] = None) -> bool:
+        """Return True if a relative TTL path falls under one of the included subtrees."""
+        include = self._include if include is None else include
+        if not include:
+            return True
+        return any(e in ("", ".") or rel == e or rel.startswith(e + "/") for e in include)
+
+    def _scoped_files(self, include: Optional[List[str]] = None) -> List[Path]:
+        """Return the sorted TTL files under ttl_dir that fall within ``include``."""
+        return [
+            f for f in sorted(self.ttl_dir.rglob("*.ttl"))
+            if self._in_scope(f.relative_to(self.ttl_dir).as_posix(), include)
+        ]
 
     def _load_ttl_files(self) -> None:
-        """Load all TTL files from ttl_dir recursively."""
-        ttl_files = list(self.ttl_dir.rglob("*.ttl"))
+        """Load all TTL files in scope from ttl_dir recursively.
+
+        Files whose fingerprint matches the snapshot cache are restored from it;
+        the rest are parsed (in worker processes when ``workers > 1``) and the
+        snapshot is rewritten.
+        """
+        start = time.perf_counter()
+        ttl_files = self._scoped_files()
         if not ttl_files:
             logger.warning(f"No TTL files found in {self.ttl_dir}")
             return
 
+        snapshot_start = time.perf_counter()
+        self._snapshot = self.cache.load(self.ttl_dir) if self.cache else None
+        self._add_phase("snapshot_load_ms", snapshot_start)
+        if self._snapshot:
+            for prefix, ns in self._snapshot.get("namespaces", []):
+                self.graph.bind(prefix, rdflib.URIRef(ns), override=True, replace=True)
+
+        reused = self._load_files(ttl_files)
+        if self.store == "array":
+            # The per-file parser graphs are reference cycles; free them now rather than
+            # whenever the collector next runs, or they outweigh the array store itself
+            gc.collect()
+        self._add_phase("load_ms", start)
+        profile = f" (profile {self.profile_name})" if self.profile_name else ""
+        logger.info(
+            f"Loaded {len(ttl_files)} TTL files{profile} ({reused} from snapshot cache), "
+            f"graph has {len(self.graph)} triples"
+        )
+
+    def _load_files(self, ttl_files: List[Path]) -> int:
+        """Load TTL files into their named graphs, from the snapshot where still valid.
+
+        Returns:
+            Number of files restored from the snapshot cache
+        """
+        snapshot = self._snapshot or {}
+        cached_files = snapshot.get("files", {})
+        start = time.perf_counter()
+        fingerprints = self._fingerprint_files(ttl_files, cached_files)
+        self._add_phase("fingerprint_ms", start)
+        cached: Dict[str, List[Any]] = {}
+        pending: List[str] = []
+        for rel, fp in fingerprints.items():
+            if same_content(fp, cached_files.get(rel)) and rel in snapshot.get("graphs", {}):
+                start = time.perf_counter()
+                cached[rel] = decode_graph(snapshot["terms"], snapshot["graphs"][rel])
+                decode_ms = (time.perf_counter() - start) * 1000
+                self.load_stats[rel] = _load_entry(rel, "snapshot", {"bytes": fp["size"], "decode_ms": decode_ms}, len(cached[rel]))
+                if not self.manifest.get(rel, fp["sha1"]):
+                    self.manifest.record(rel, fp["sha1"], fp["size"], None, len(cached[rel]))
+            else:
+                pending.append(rel)
+
+        parsed = self._parse_ttl_files(self._skip_quarantined(pending, fingerprints), fingerprints)
+        # Merge in sorted path order so namespace bindings resolve the same way in every mode
+        for rel in fingerprints:
+            if rel in parsed:
+                triples, namespaces = parsed[rel]
+                self._add_file_graph(rel, triples, namespaces)
+            elif rel in cached:
+                self._add_file_graph(rel, cached[rel])
+        self.file_fingerprints.update(fingerprints)
+        self._fingerprint = None
+
+        stale = any(cached_files.get(rel) != fp for rel, fp in fingerprints.items())
+        deleted = [rel for rel in cached_files if self._in_scope(rel) and rel not in self.file_fingerprints]
+        if stale or deleted:
+            self._snapshot_stale = True
+        self.manifest.forget(deleted)
+        self.manifest.save()
+        return len(cached)
+
+    def image_path(self) -> Path:
+        """Return the ontology image file for this ttl_dir and load scope."""
+        scope = hashlib.sha1(json.dumps(sorted(self._include)).encode("utf-8")).hexdigest()[:8] if self._include else "all"
+        return self.cache.cache_dir / f"{GraphSnapshotCache.key_for(self.ttl_dir)}-{scope}.image"
+
+    def _open_image(self) -> None:
+        """Serve the graph from the memory-mapped ontology image, rebuilding it if stale.
+
+        The image is checked against the fingerprints of the TTL files in scope
+        (one ``stat`` per unchanged file). When it is missing or stale, the files
+        are loaded into an array store (reusing the snapshot cache) and frozen
+        into a new image, which is then mapped like any other.
+        """
+        from src.rdf_store import ImageStore, read_image_header, write_image
+
+        if not self.cache:
+            raise ValueError("store='image' needs a cache_dir to hold the ontology image")
+        # An image is read-only, so lazy subtrees are folded into it up front
+        if self._include:
+            self._include = self._include + [str(e).strip("/") for g in self._lazy for e in g.get("include") or []]
+        self._lazy = []
+
+        start = time.perf_counter()
+        path = self.image_path()
+        header = read_image_header(path)
+        fingerprints = self._fingerprint_files(self._scoped_files(), (header or {}).get("files", {}))
+        fresh = header is not None and header.get("files", {}).keys() == fingerprints.keys() and all(
+            same_content(fp, header["files"][rel]) for rel, fp in fingerprints.items()
+        )
+        if not fresh:
+            builder = RDFManager(
+                self.ttl_dir,
+                cache_dir=self.cache.cache_dir,
+                workers=self.workers,
+                profile={"include": self._include} if self._include else None,
+                store="array",
+            )
+            write_image(builder.graph.store, path, meta={
+                "ttl_dir": str(self.ttl_dir.resolve()),
+                "include": self._include,
+                "files": builder.file_fingerprints,
+                "file_graphs": {rel: str(ident) for rel, ident in builder.file_graphs.items()},
+                "statistics": builder.statistics.summary(),
+            })
+            self.load_stats = builder.load_stats
+            self.load_phases.update(builder.load_phases)
+            del builder
+            header = read_image_header(path)
+            logger.info(f"Wrote ontology image {path}")
+
+        self.graph = UnionDataset(store=ImageStore(path))
+        self.labels = LabelIndex()
+        self.labels.add(self._label_triples(self.graph))
+        if header.get("statistics"):
+            self.statistics = GraphStatistics.from_summary(header["statistics"])
+        else:
+            self.statistics = GraphStatistics(self.graph)
+        self.file_fingerprints = dict(header["files"])
+        self._fingerprint = None
+        self.file_graphs = {rel: rdflib.URIRef(ident) for rel, ident in header["file_graphs"].items()}
+        self._add_phase("image_ms", start)
+        logger.info(
+            f"Opened ontology image {path.name} ({header['quads']} quads, {header['terms']} terms) "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def ensure_loaded(self, text: str) -> int:
+        """Load lazy profile subtrees whose namespace occurs in ``text``.
+
+        Called with query text before execution, or with a namespace IRI by
+        accessors that need it (e.g. operator specs).
+
+        Args:
+            text: SPARQL query text or namespace IRI
+
+        Returns:
+            Number of TTL files loaded
+        """
+        groups = [g for g in self._lazy if g.get("namespace") and str(g["namespace"]) in text]
+        if not groups:
+            return 0
+        include = [str(e).strip("/") for g in groups for e in g.get("include") or []]
+        self._lazy = [g for g in self._lazy if g not in groups]
+        self._include.extend(include)
+        ttl_files = [
+            f for f in self._scoped_files(include)
+            if f.relative_to(self.ttl_dir).as_posix() not in self.file_fingerprints
+        ]
+        if ttl_files:
+            start = time.perf_counter()
+            self._load_files(ttl_files)
+            self._materialize_rdfs()
+            self._sync_snapshot()
+            self.clear_prepared_queries()
+            self._add_phase("lazy_load_ms", start)
+            logger.info(
+                f"Lazily loaded {len(ttl_files)} TTL files for {', '.join(str(g['namespace']) for g in groups)} "
+                f"in {time.perf_counter() - start:.2f}s, graph has {len(self.graph)} triples"
+            )
+        return len(ttl_files)
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """Reload TTL files that were added, changed or deleted since the last load.
+
+        Compares file fingerprints against the last load, drops the named graphs
+        of changed or deleted files and parses only the changed or added files.
+        Only subtrees currently in scope (see ``profile``) are considered.
+
+        Returns:
+            Dict with keys 'added', 'changed', 'removed' listing relative file paths
+        """
+        start = time.perf_counter()
+        previous = self.file_fingerprints
+        if self.store == "image":
+            # Images are read-only: reopen, which rebuilds the image if anything changed
+            self._open_image()
+            self._add_phase("refresh_ms", start)
+            current = self.file_fingerprints
+            return {
+                "added": [rel for rel in current if rel not in previous],
+                "changed": [rel for rel in current if rel in previous and not same_content(current[rel], previous[rel])],
+                "removed": [rel for rel in previous if rel not in current],
+            }
+        fingerprints = self._fingerprint_files(self._scoped_files(), previous)
+        added = [rel for rel in fingerprints if rel not in previous]
+        removed = [rel for rel in previous if rel not in fingerprints]
+        changed = [rel for rel, fp in fingerprints.items() if rel in previous and not same_content(fp, previous[rel])]
+
+        for rel in removed + changed:
+            self.load_stats.pop(rel, None)
+            ident = self.file_graphs.pop(rel, None)
+            if ident is not None:
+                graph = self.graph.graph(ident)
+                self.labels.remove(self._label_triples(graph))
+                self.statistics.invalidate()
+                self.graph.remove_graph(ident)
+        parsed = self._parse_ttl_files(self._skip_quarantined(sorted(added + changed), fingerprints), fingerprints)
+        for rel in sorted(parsed):
+            triples, namespaces = parsed[rel]
+            self._add_file_graph(rel, triples, namespaces)
+        self.file_fingerprints = fingerprints
+        self._fingerprint = None
+
+        if fingerprints != previous:
+            self._snapshot_stale = True
+        self.manifest.forget(removed)
+        self.manifest.save()
+        if added or changed or removed:
+            self._materialize_rdfs()
+            self.clear_prepared_queries()
+        self._sync_snapshot()
+        self._add_phase("refresh_ms", start)
+        if added or changed or removed:
+            logger.info(
+                f"Refreshed {len(added)} added, {len(changed)} changed, {len(removed)} removed TTL files "
+                f"in {(time.perf_counter() - start) * 1000:.1f} ms, graph has {len(self.graph)} triples"
+            )
+        return {"added": added, "changed": changed, "removed": removed}
+
+    def _fingerprint_files(self, ttl_files: List[Path], previous: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Fingerprint TTL files, reusing content hashes from ``previous`` where mtime and size match."""
+        fingerprints = {}
         for ttl_file in ttl_files:
+            rel = ttl_file.relative_to(self.ttl_dir).as_posix()
             try:
-                # Read file text and sanitize any problematic multiline attribute or default blocks
-                text = open(ttl_file, "r", encoding="utf-8").read()
-                sanitized = _sanitize_opset_content(text)
-                if sanitized != text:
-                    try:
-                        self.graph.parse(data=sanitized, format="turtle")
-                        logger.debug(f"Loaded (sanitized) {ttl_file.name}")
-                        continue
-                    except Exception as e:
-                        # If sanitized parsing fails, fall back to parsing the original text
-                        logger.debug(f"Sanitized parse failed for {ttl_file.name}: {e}; falling back to original text parse")
-                # Try parsing original text
-                try:
-                    self.graph.parse(data=text, format="turtle")
-                    logger.debug(f"Loaded {ttl_file.name}")
-                except Exception as e:
-                    # As a last resort, have rdflib read from filename (it will open the file itself)
-                    self.graph.parse(str(ttl_file), format="turtle")
-                    logger.debug(f"Loaded via file path {ttl_file.name}")
-            except Exception as e:
-                logger.error(f"Failed to load {ttl_file.name}: {e}")
+                fingerprints[rel] = file_fingerprint(ttl_file, self.ttl_dir, previous.get(rel))
+            except OSError as e:
+                logger.error(f"Failed to read {ttl_file.name}: {e}")
+        return fingerprints
+
+    def _file_graph_id(self, rel: str) -> "rdflib.URIRef":
+        """Return the named-graph IRI holding the triples of a TTL file."""
+        return rdflib.URIRef((self.ttl_dir.resolve() / rel).as_uri())
+
+    def _add_file_graph(self, rel: str, triples: List[Any], namespaces: List[Tuple[str, str]] = ()) -> None:
+        """Load one file's triples into its named graph and bind its prefixes."""
+        start = time.perf_counter()
+        for prefix, ns in namespaces:
+            self.graph.bind(prefix, rdflib.URIRef(ns), override=True, replace=True)
+        g = self.graph.graph(self._file_graph_id(rel))
+        g.addN((s, p, o, g) for s, p, o in triples)
+        self.labels.add(triples)
+        self.statistics.invalidate()
+        self.file_graphs[rel] = g.identifier
+        if rel in self.load_stats:
+            self.load_stats[rel]["add_ms"] = (time.perf_counter() - start) * 1000
+
+    def _materialize_rdfs(self) -> None:
+        """Recompute the RDFS entailments of the schema files and the loaded data (if ``rdfs`` is on).
+
+        The schema closure is cached under cache_dir keyed on the content
+        hashes of the schema files; the instance-level entailments are derived
+        from it in one pass over the graph.
+        """
+        if not self.rdfs:
+            return
+        start = time.perf_counter()
+        ident = rdflib.URIRef(RDFS_GRAPH)
+        previous = self.graph.graph(ident)
+        self.labels.remove(self._label_triples(previous))
+        self.statistics.invalidate()
+        self.graph.remove_graph(ident)
+
+        schema = {rel: self.file_fingerprints[rel].get("sha1") for rel in RDFS_SCHEMA_FILES if rel in self.file_graphs}
+        if not schema:
+            logger.warning(f"No RDFS schema files ({', '.join(RDFS_SCHEMA_FILES)}) loaded from {self.ttl_dir}")
+        path = self.cache.cache_dir / "rdfs" / f"{SchemaClosure.key(schema)}.json" if self.cache else None
+        closure = SchemaClosure.load(path) if path else None
+        if closure is None:
+            closure = SchemaClosure.from_triples(
+                t for rel in schema for t in self.graph.graph(self.file_graphs[rel]).triples((None, None, None))
+            )
+            if path:
+                closure.save(path)
+        entailed = list(closure.entail(self.graph))
+        g = self.graph.graph(ident)
+        g.addN((s, p, o, g) for s, p, o in entailed)
+        self.labels.add(entailed)
+        self.statistics.invalidate()
+        self.rdfs_triples = len(entailed)
+        self._fingerprint = None
+        self._add_phase("rdfs_ms", start)
+        logger.info(f"Materialized {len(entailed)} RDFS entailments in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    @staticmethod
+    def _label_triples(graph: Any) -> List[Tuple[Any, Any, Any]]:
+        """Return the rdfs:label and skos:prefLabel triples of a graph."""
+        return [t for uri in LABEL_PREDICATES.values() for t in graph.triples((None, rdflib.URIRef(uri), None))]
+
+    def _statistics_key(self) -> str:
+        """Return the key graph statistics are stored under in the snapshot: the loaded file contents and ``rdfs``."""
+        loaded = sorted((rel, fp.get("sha1")) for rel, fp in self.file_fingerprints.items())
+        return hashlib.sha1(json.dumps([loaded, bool(self.rdfs)]).encode("utf-8")).hexdigest()
+
+    def _sync_snapshot(self) -> None:
+        """Bring the snapshot cache up to date after a load and restore the graph statistics from it.
+
+        The snapshot is rewritten if the loaded files changed, or if it holds no
+        statistics for them yet; otherwise the statistics it holds are reused,
+        so startup does not rescan the graph to count it.
+        """
+        if not self.cache or not self.file_fingerprints:
+            return
+        known = (self._snapshot or {}).get("statistics", {}).get(self._statistics_key())
+        if known is not None and not self._snapshot_stale:
+            self.statistics = GraphStatistics(self.graph, summary=known)
+            return
+        start = time.perf_counter()
+        self._store_snapshot()
+        self._add_phase("snapshot_store_ms", start)
+
+    def _store_snapshot(self) -> None:
+        """Write the snapshot cache from the current per-file named graphs and their statistics."""
+        if not self.cache:
+            return
+        self._snapshot_stale = False
+        files = dict(self.file_fingerprints)
+        graphs = {rel: self.graph.graph(ident) for rel, ident in self.file_graphs.items()}
+        # Carry over cached files outside the loaded scope so other profiles keep their snapshot
+        if self._snapshot:
+            for rel, fp in self._snapshot.get("files", {}).items():
+                if rel in files or self._in_scope(rel) or not (self.ttl_dir / rel).exists():
+                    continue
+                files[rel] = fp
+                if rel in self._snapshot.get("graphs", {}):
+                    graphs[rel] = decode_graph(self._snapshot["terms"], self._snapshot["graphs"][rel])
+        # Statistics of other load scopes stay valid for as long as their files are unchanged
+        statistics = dict((self._snapshot or {}).get("statistics", {}))
+        key = self._statistics_key()
+        statistics.pop(key, None)
+        statistics[key] = self.statistics.summary()
+        while len(statistics) > MAX_SNAPSHOT_STATISTICS:
+            statistics.pop(next(iter(statistics)))
+        try:
+            self.cache.store(self.ttl_dir, files, graphs, self.graph.namespaces(), statistics)
+            self._snapshot = {**(self._snapshot or {}), "statistics": statistics}
+        except Exception as e:
+            logger.warning(f"Failed to write graph snapshot for {self.ttl_dir}: {e}")
+
+    def _skip_quarantined(self, rels: List[str], fingerprints: Dict[str, Dict[str, Any]]) -> List[Path]:
+        """Drop files that already failed to parse with their current content.
+
+        Logs a single warning naming the skipped files; they are parsed again as
+        soon as their content changes.
 
-        logger.info(f"Loaded {len(ttl_files)} TTL files, graph has {len(self.graph)} triples")
+        Returns:
+            Paths of the files that still need parsing
+        """
+        quarantined = [rel for rel in rels if self.manifest.known_failure(rel, fingerprints[rel]["sha1"])]
+        for rel in quarantined:
+            error = self.manifest.known_failure(rel, fingerprints[rel]["sha1"])["error"]
+            self.load_stats[rel] = _load_entry(rel, "quarantined", {"bytes": fingerprints[rel]["size"]}, error=error)
+        if quarantined:
+            logger.warning(
+                f"Skipping {len(quarantined)} TTL file(s) that failed to parse before and are unchanged: "
+                + ", ".join(quarantined)
+                + " (see load_report())"
+            )
+        return [self.ttl_dir / rel for rel in rels if rel not in quarantined]
+
+    def _parse_ttl_files(
+        self,
+        ttl_files: List[Path],
+        fingerprints: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Tuple[List[Any], List[Tuple[str, str]]]]:
+        """Parse TTL files (in worker processes when ``workers > 1``), log their timings
+        and record each outcome in the load manifest.
+
+        Args:
+            ttl_files: TTL files to parse
+            fingerprints: Fingerprints of (at least) those files, by relative path
+
+        Returns:
+            Mapping of relative path -> (triples, namespace bindings) for files that parsed
+        """
+        if not ttl_files:
+            return {}
+        start = time.perf_counter()
+        if self.workers > 1 and len(ttl_files) > 1:
+            parsed, stats, errors = self._parse_ttl_files_parallel(ttl_files)
+        else:
+            parsed, stats, errors = self._parse_ttl_files_serial(ttl_files)
+        self._add_phase("parse_wall_ms", start)
+        timings = {rel: (st["read_ms"] + st["sanitize_ms"] + st["parse_ms"]) / 1000 for rel, st in stats.items()}
+        self._log_parse_timings(timings, time.perf_counter() - start)
+        for rel, elapsed in timings.items():
+            fp = fingerprints.get(rel) or {}
+            triples = len(parsed[rel][0]) if rel in parsed else 0
+            self.manifest.record(rel, fp.get("sha1"), fp.get("size", 0), elapsed, triples, errors.get(rel))
+            self.load_stats[rel] = _load_entry(rel, "parsed", stats[rel], triples, errors.get(rel))
+        return parsed
+
+    def _parse_ttl_file(self, ttl_file: Path) -> Tuple[Optional["rdflib.Graph"], Optional[str], Dict[str, Any]]:
+        """Parse a single TTL file into a fresh graph.
+
+        Returns:
+            Tuple of (graph, None, timings), or (None, failure reason, timings) if it
+            cannot be parsed; timings are as returned by :func:`_parse_ttl_path`
+        """
+        return _parse_ttl_path(ttl_file, self.sanitized.cache_dir if self.sanitized else None)
+
+    def _parse_ttl_files_serial(
+        self, ttl_files: List[Path]
+    ) -> Tuple[Dict[str, Tuple[List[Any], List[Tuple[str, str]]]], Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Parse TTL files one by one in this process.
+
+        Returns:
+            Tuple of (parsed, stats, errors): parsed maps relative path -> (triples,
+            namespace bindings) for files that parsed; stats maps relative path ->
+            timings (see :func:`_parse_ttl_path`); errors maps relative path ->
+            failure reason for files that did not
+        """
+        parsed = {}
+        stats = {}
+        errors = {}
+        for ttl_file in ttl_files:
+            rel = ttl_file.relative_to(self.ttl_dir).as_posix()
+            g, error, stats[rel] = self._parse_ttl_file(ttl_file)
+            if g is not None:
+                parsed[rel] = (list(g), [(str(p), str(ns)) for p, ns in g.namespaces()])
+            else:
+                errors[rel] = error or "parse failed"
+        return parsed, stats, errors
+
+    def _parse_ttl_files_parallel(
+        self, ttl_files: List[Path]
+    ) -> Tuple[Dict[str, Tuple[List[Any], List[Tuple[str, str]]]], Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Parse TTL files in a process pool of ``self.workers`` processes.
+
+        Small files (e.g. the per-operator schemas) are grouped into batches so
+        each task carries a comparable amount of Turtle.
+
+        Returns:
+            Same shape as :meth:`_parse_ttl_files_serial`
+        """
+        total = sum(f.stat().st_size for f in ttl_files)
+        # Aim for a few tasks per worker so stragglers do not dominate
+        batches = _batch_files(ttl_files, max(total // (self.workers * 4), 1))
+        parsed = {}
+        stats = {}
+        errors = {}
+        logger.debug(f"Parsing {len(ttl_files)} TTL files in {len(batches)} batches on {self.workers} workers")
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+            sanitized_dir = str(self.sanitized.cache_dir) if self.sanitized else None
+            parse_batch = partial(_parse_ttl_batch, sanitized_dir=sanitized_dir)
+            for terms, results in pool.map(parse_batch, [[str(f) for f in b] for b in batches]):
+                for path, (data, namespaces, file_stats, error) in results.items():
+                    rel = Path(path).relative_to(self.ttl_dir).as_posix()
+                    stats[rel] = file_stats
+                    if data is not None:
+                        parsed[rel] = (decode_graph(terms, data), namespaces)
+                    else:
+                        errors[rel] = error or "parse failed"
+        return parsed, stats, errors
+
+    @staticmethod
+    def _log_parse_timings(timings: Dict[str, float], wall: float) -> None:
+        """Log per-file parse times (debug) and a summary of the slowest files (info)."""
+        for rel, elapsed in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+            logger.debug(f"Parsed {rel} in {elapsed * 1000:.1f} ms")
+        slowest = sorted(timings.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        logger.info(
+            f"Parsed {len(timings)} TTL files in {wall:.2f}s wall ({sum(timings.values()):.2f}s CPU); slowest: "
+            + ", ".join(f"{rel} {elapsed * 1000:.0f} ms" for rel, elapsed in slowest)
+        )
+
+    def load_report(self, failed_only: bool = False) -> List[Dict[str, Any]]:
+        """Return the recorded load outcome of every TTL file in scope.
+
+        Args:
+            failed_only: Only include files that failed to parse
+
+        Returns:
+            List of dicts (slowest parse first) with keys: path, status ('ok' or
+            'failed'), error, parse_ms (None if restored from the snapshot cache),
+            triples, bytes, sha1, checked
+        """
+        entries = []
+        for rel, fp in self.file_fingerprints.items():
+            entry = self.manifest.get(rel, fp.get("sha1"))
+            if entry and (entry["status"] == "failed" or not failed_only):
+                entries.append(dict(entry))
+        return sorted(entries, key=lambda e: e.get("parse_ms") or 0.0, reverse=True)
+
+    def graph_load_report(self) -> Dict[str, Any]:
+        """Return where the time went while loading the graph.
+
+        Unlike :meth:`load_report` (persisted outcomes), this covers the loads
+        done by this manager, including lazy loads and refreshes. For every TTL
+        file in scope it gives the time spent reading, sanitizing, parsing,
+        decoding from the snapshot cache and adding to the store, plus its size
+        and the number of triples it contributes.
+
+        Returns:
+            Dict with keys: ttl_dir, profile, store, triples (graph size), files
+            (per-file entries, slowest first), directories (per-directory totals,
+            slowest first), totals, phases (ms spent in fingerprinting, snapshot
+            load/store, parsing wall time, and the overall load)
+        """
+        files = []
+        for rel in self.file_fingerprints:
+            entry = dict(self.load_stats.get(rel) or _load_entry(rel, "image" if self.store == "image" else "unknown"))
+            entry["total_ms"] = round(sum(entry[col] for col in LOAD_TIMINGS), 3)
+            entry.update({col: round(entry[col], 3) for col in LOAD_TIMINGS})
+            files.append(entry)
+        files.sort(key=lambda e: e["total_ms"], reverse=True)
+        by_dir: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in files:
+            by_dir.setdefault(entry["dir"], []).append(entry)
+        directories = [dict(_sum_load_entries(entries), dir=d) for d, entries in by_dir.items()]
+        directories.sort(key=lambda d: d["total_ms"], reverse=True)
+        return {
+            "ttl_dir": str(self.ttl_dir),
+            "profile": self.profile_name,
+            "store": self.store,
+            "triples": len(self.graph),
+            "files": files,
+            "directories": directories,
+            "totals": _sum_load_entries(files),
+            "phases": {name: round(ms, 3) for name, ms in self.load_phases.items()},
+        }
 
     def register_namespace(self, prefix: str, uri: str) -> None:
         """Register a namespace for use in queries.
@@ -132,13 +1159,110 @@ class RDFManager:
         """
         self.graph.bind(prefix, Namespace(uri))
         self.namespaces[prefix] = Namespace(uri)
+        self.clear_prepared_queries()
+        self._fingerprint = None
         logger.debug(f"Registered namespace {prefix}: {uri}")
 
-    def execute_query(self, sparql: str) -> Result:
+    def prepare_query(self, sparql: str) -> Any:
+        """Return the parsed and translated form of a SPARQL query.
+
+        Prepared queries are cached by normalized text (comments and
+        insignificant whitespace ignored), so each distinct query is parsed
+        once per manager. Prefixes the query does not declare resolve against
+        the graph's bindings at the time it is first prepared; the cache is
+        cleared whenever bindings may change (register_namespace, lazy loads,
+        refresh). With ``optimize`` set, the patterns of each basic graph
+        pattern are reordered by the selectivity estimates of
+        :mod:`src.rdf_planner`.
+
+        Args:
+            sparql: SPARQL query string
+
+        Returns:
+            rdflib.plugins.sparql.sparql.Query
+
+        Raises:
+            Exception: If the query cannot be parsed
+        """
+        key = (bool(self.optimize), _normalize_query(sparql))
+        with self._prepared_lock:
+            prepared = self._prepared.get(key)
+            if prepared is not None:
+                self._prepared.move_to_end(key)
+                self.prepared_stats["hits"] += 1
+                return prepared
+        prepared = prepareQuery(sparql, initNs=dict(self.graph.namespaces()))
+        if self.optimize:
+            from src.rdf_planner import optimize_query
+
+            optimize_query(prepared, self.statistics)
+        with self._prepared_lock:
+            self.prepared_stats["misses"] += 1
+            self._prepared[key] = prepared
+            while len(self._prepared) > MAX_PREPARED_QUERIES:
+                self._prepared.popitem(last=False)
+        return prepared
+
+    def clear_prepared_queries(self) -> None:
+        """Drop every cached prepared query."""
+        with self._prepared_lock:
+            self._prepared.clear()
+
+    def prepared_query_info(self) -> Dict[str, int]:
+        """Return prepared-query cache statistics (size, hits, misses)."""
+        with self._prepared_lock:
+            return {"size": len(self._prepared), **self.prepared_stats}
+
+    @contextmanager
+    def query_limits(self, timeout: Optional[float] = None, max_rows: Optional[int] = None):
+        """Apply default query limits for the duration of a ``with`` block.
+
+        Used by the generators to enforce a config policy (e.g. the wiki's
+        ``policy.query_timeout_seconds`` / ``max_foreach_rows``); the previous
+        limits are restored on exit.
+
+        Args:
+            timeout: Seconds a SELECT query may run (None: no deadline)
+            max_rows: Rows a SELECT query may return (None: no cap)
+        """
+        previous = self.query_timeout, self.max_rows
+        self.query_timeout, self.max_rows = timeout, max_rows
+        try:
+            yield self
+        finally:
+            self.query_timeout, self.max_rows = previous
+
+    def execute_query(
+        self,
+        sparql: str,
+        bindings: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> Result:
         """Execute SPARQL query on the graph.
 
+        The query is parsed once and reused from the prepared-query cache (see
+        :meth:`prepare_query`); per-call parameters go in ``bindings`` rather
+        than being spliced into the text.
+
+        SELECT queries with a deadline or row cap (per call, or the manager's
+        ``query_timeout`` / ``max_rows`` defaults) are evaluated in the calling
+        thread against a view of the store that raises once the deadline has
+        passed (see :class:`~src.rdf_store.DeadlineStore`), so eager operators
+        (ORDER BY, GROUP BY, aggregates) are bounded too. The rows produced so
+        far are returned and the result's ``truncated`` attribute says why
+        ('timeout' or 'max_rows'; None when the query completed within its
+        limits).
+
         Args:
             sparql: SPARQL query string
+            bindings: Initial variable bindings, by variable name without '?'
+                (e.g. {"targetMotif": URIRef(...)}); values that are not RDF
+                terms are bound as literals
+            timeout: Seconds the query may run (default: ``query_timeout``)
+            max_rows: Rows the query may return (default: ``max_rows``)
+            name: Query name for log messages (default: start of the query text)
 
         Returns:
             rdflib.query.Result with query results
@@ -146,18 +1270,130 @@ class RDFManager:
         Raises:
             Exception: If query fails
         """
+        if self._lazy:
+            self.ensure_loaded(sparql)
+        timeout = self.query_timeout if timeout is None else timeout
+        max_rows = self.max_rows if max_rows is None else max_rows
         try:
-            result = self.graph.query(sparql)
-            return result
+            init = {k: v if isinstance(v, Identifier) else Literal(v) for k, v in (bindings or {}).items()}
+            if timeout is not None or max_rows is not None:
+                limited = self._run_limited(sparql, init, timeout, max_rows, name or _query_name(sparql))
+                if limited is not None:
+                    return limited
+            return self.graph.query(self.prepare_query(sparql), initBindings=init)
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
 
-    def execute_query_file(self, query_path: Path) -> Result:
+    def _run_limited(self, sparql: str, init: Dict[str, Any], timeout: Optional[float], max_rows: Optional[int], name: str) -> Optional[Result]:
+        """Evaluate a query within a deadline and row cap (see :meth:`execute_query`).
+
+        Returns:
+            Result holding the collected rows, with ``truncated`` set to
+            'timeout', 'max_rows' or None; None if the query is not a SELECT
+            (limits do not apply, the caller runs it as usual)
+        """
+        from src.rdf_store import DeadlineExceeded, DeadlineStore
+
+        prepared = self.prepare_query(sparql)
+        if prepared.algebra.name != "SelectQuery":
+            return None
+        start = time.perf_counter()
+        graph = self.graph
+        if timeout is not None:
+            graph = UnionDataset(store=DeadlineStore(self.graph.store, start + timeout))
+            # Building a namespace manager rebinds every prefix; the view shares the graph's
+            graph.namespace_manager = self.graph.namespace_manager
+        variables = list(prepared.algebra["PV"])
+        rows: List[Any] = []
+        reason = None
+        try:
+            for row in graph.query(prepared, initBindings=init):
+                if max_rows is not None and len(rows) >= max_rows:
+                    reason = "max_rows"
+                    break
+                rows.append(row)
+        except DeadlineExceeded:
+            reason = "timeout"
+        elapsed = time.perf_counter() - start
+        if reason:
+            limit = f"{timeout}s deadline" if reason == "timeout" else f"{max_rows} row cap"
+            logger.warning(f"Query {name} hit its {limit} after {elapsed:.2f}s; returning {len(rows)} rows (truncated)")
+        limited = rdflib.query.Result("SELECT")
+        limited.vars = variables
+        limited.bindings = [{var: value for var, value in zip(variables, row) if value is not None} for row in rows]
+        limited.truncated = reason
+        return limited
+
+    def explain(
+        self,
+        sparql: str,
+        bindings: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+        limit: int = 100000,
+    ) -> Dict[str, Any]:
+        """Show how the basic graph patterns of a query are ordered, with estimated and actual rows.
+
+        Each BGP is listed in the order it will be evaluated (reordered when
+        ``optimize`` is set). For every pattern the estimated rows after
+        joining it are compared with the actual number of solutions of the
+        patterns up to and including it, evaluated on their own.
+
+        Args:
+            sparql: SPARQL query string
+            bindings: Initial variable bindings (see :meth:`execute_query`)
+            name: Query name shown in the plan
+            limit: Stop counting actual rows at this many (marked 'capped')
+
+        Returns:
+            Dict with 'name', 'optimized', 'bgps' (per BGP, a list of
+            {'pattern', 'estimated', 'actual', 'capped'}), 'rows' (result rows
+            of the whole query) and 'ms' (its evaluation time); see
+            :func:`src.rdf_planner.format_explain`
+        """
+        from rdflib.plugins.sparql.evaluate import evalBGP
+        from rdflib.plugins.sparql.sparql import QueryContext
+        from src.rdf_planner import bgp_nodes, estimate_order
+
+        if self._lazy:
+            self.ensure_loaded(sparql)
+        prepared = self.prepare_query(sparql)
+        init = {rdflib.Variable(k): v if isinstance(v, Identifier) else Literal(v) for k, v in (bindings or {}).items()}
+        nsm = self.graph.namespace_manager
+        bgps = []
+        for node in bgp_nodes(prepared):
+            estimates = estimate_order(node.triples, self.statistics)
+            steps = []
+            for i, pattern in enumerate(node.triples):
+                actual = 0
+                for _ in evalBGP(QueryContext(self.graph, initBindings=init), list(node.triples[: i + 1])):
+                    actual += 1
+                    if actual >= limit:
+                        break
+                steps.append({
+                    "pattern": " ".join(term.n3(nsm) for term in pattern),
+                    "estimated": estimates[i],
+                    "actual": actual,
+                    "capped": actual >= limit,
+                })
+            bgps.append(steps)
+        start = time.perf_counter()
+        rows = sum(1 for _ in self.execute_query(sparql, bindings))
+        return {
+            "name": name or _query_name(sparql),
+            "optimized": bool(self.optimize),
+            "bgps": bgps,
+            "rows": rows,
+            "ms": (time.perf_counter() - start) * 1000,
+        }
+
+    def execute_query_file(self, query_path: Path, bindings: Optional[Dict[str, Any]] = None, **limits: Any) -> Result:
         """Execute SPARQL query from file.
 
         Args:
             query_path: Path to .sparql file
+            bindings: Initial variable bindings (see :meth:`execute_query`)
+            **limits: ``timeout`` / ``max_rows`` (see :meth:`execute_query`)
 
         Returns:
             rdflib.query.Result with query results
@@ -165,12 +1401,245 @@ class RDFManager:
         with open(query_path, "r") as f:
             sparql = f.read()
         logger.debug(f"Executing query from {query_path.name}")
-        return self.execute_query(sparql)
+        return self.execute_query(sparql, bindings, name=Path(query_path).name, **limits)
+
+    def graph_fingerprint(self) -> str:
+        """Return a hash identifying the content of the loaded graph.
+
+        Derived from the content hashes of the TTL files in the graph and the
+        namespaces registered on this manager, so it changes whenever a file is
+        added, edited or removed (after ``refresh()``) or a lazy subtree loads.
+        Materialized RDFS entailments follow from the files and are covered by
+        the ``rdfs`` flag. Triples added to the graph directly are not covered.
+        """
+        if self._fingerprint is None:
+            files = sorted((rel, fp.get("sha1")) for rel, fp in self.file_fingerprints.items())
+            namespaces = sorted((prefix, str(uri)) for prefix, uri in self.namespaces.items())
+            content: Dict[str, Any] = {"files": files, "namespaces": namespaces}
+            if self.rdfs:
+                content["rdfs"] = True
+            data = json.dumps(content)
+            self._fingerprint = hashlib.sha1(data.encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def query_dicts(self, sparql: str, bindings: Optional[Dict[str, Any]] = None, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run a SELECT query and return its rows as dicts, using the result cache.
+
+        Results are cached on disk (see :class:`src.rdf_cache.QueryResultCache`)
+        keyed on the normalized query, :meth:`graph_fingerprint` and the
+        bindings, so re-running a query against an unchanged ontology reads
+        the stored rows instead of evaluating it.
+
+        Results truncated by a query limit (see :meth:`execute_query`) are not
+        cached; cached results longer than ``max_rows`` are cut to it.
+
+        Args:
+            sparql: SPARQL SELECT query string
+            bindings: Initial variable bindings (see :meth:`execute_query`)
+            name: Query name for log messages
+
+        Returns:
+            Rows as returned by :meth:`results_to_dicts`
+        """
+        return self._query_dicts(sparql, bindings, name)[0]
+
+    def _query_dicts(self, sparql: str, bindings: Optional[Dict[str, Any]] = None, name: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Run :meth:`query_dicts`, also returning whether the result cache was hit ('hit', 'miss', or None without a cache)."""
+        if self._lazy:
+            self.ensure_loaded(sparql)
+        if not self.results:
+            return self.results_to_dicts(self.execute_query(sparql, bindings, name=name)), None
+        query = _normalize_query(sparql)
+        key = self.results.key_for(query, self.graph_fingerprint(), bindings)
+        rows = self.results.get(key)
+        if rows is None:
+            result = self.execute_query(sparql, bindings, name=name)
+            rows = self.results_to_dicts(result)
+            if not getattr(result, "truncated", None):
+                self.results.put(key, rows, query)
+            return rows, "miss"
+        if self.max_rows is not None and len(rows) > self.max_rows:
+            logger.warning(f"Query {name or _query_name(sparql)} hit its {self.max_rows} row cap; returning {self.max_rows} of {len(rows)} cached rows (truncated)")
+            rows = rows[: self.max_rows]
+        return rows, "hit"
+
+    def query_file_dicts(self, query_path: Path, bindings: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a SELECT query from a .sparql file (see :meth:`query_dicts`)."""
+        with open(query_path, "r") as f:
+            sparql = f.read()
+        logger.debug(f"Executing query from {Path(query_path).name}")
+        return self.query_dicts(sparql, bindings, name=Path(query_path).name)
+
+    def execute_many(
+        self,
+        queries: Union[Sequence[Union[Path, str]], Mapping[str, Union[Path, str]]],
+        workers: int = 0,
+        bindings: Optional[Dict[str, Any]] = None,
+        executor: str = "auto",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run a batch of read-only queries concurrently against this graph.
+
+        rdflib evaluates queries in pure Python, so threads mostly take turns
+        on the GIL. Where ``fork`` is available the queries therefore run in
+        forked worker processes that share the loaded graph copy-on-write
+        (``executor='process'``); elsewhere, or with ``executor='thread'``, in
+        a thread pool. Either way the graph must not change while the batch
+        runs. Lazy profile subtrees the queries need are loaded first.
+
+        Args:
+            queries: .sparql file paths (Path objects or strings ending in
+                '.sparql') and/or query texts, or a mapping of name -> path or text
+            workers: Concurrent queries (0 or less uses one per CPU core; 1
+                runs them in order in this process)
+            bindings: Initial variable bindings applied to every query
+            executor: 'auto', 'process' or 'thread'
+
+        Returns:
+            Mapping of query name (file stem, mapping key, or 'query-<n>' for
+            texts) -> {'type', 'result', 'ms', 'error', 'cache'}, in input order;
+            the result is a list of rows (see :meth:`query_dicts`) for SELECT, a
+            bool for ASK and a list of triples for CONSTRUCT/DESCRIBE; 'cache' is
+            'hit' or 'miss' for SELECT queries looked up in the result cache
+            (counted in :meth:`result_cache_info` whichever executor ran them)
+
+        Raises:
+            ValueError: If ``executor`` is not known
+        """
+        if executor not in ("auto", "process", "thread"):
+            raise ValueError(f"Unknown executor '{executor}' (expected 'auto', 'process' or 'thread')")
+        named = self._named_queries(queries)
+        if self._lazy:
+            for sparql in named.values():
+                self.ensure_loaded(sparql)
+        workers = min(workers if workers > 0 else (os.cpu_count() or 1), len(named))
+        forkable = "fork" in multiprocessing.get_all_start_methods()
+        use_processes = workers > 1 and executor != "thread" and forkable
+
+        global _FORKED_MANAGER
+        start = time.perf_counter()
+        if workers <= 1:
+            outcomes = [self._run_named_query(name, sparql, bindings) for name, sparql in named.items()]
+        elif use_processes:
+            _FORKED_MANAGER = self
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                    futures = [pool.submit(_run_forked_query, name, sparql, bindings) for name, sparql in named.items()]
+                    outcomes = [f.result() for f in futures]
+            finally:
+                _FORKED_MANAGER = None
+            # The workers' result cache lookups were counted in their copies of the cache
+            if self.results:
+                self.results.hits += sum(1 for o in outcomes if o["cache"] == "hit")
+                self.results.misses += sum(1 for o in outcomes if o["cache"] == "miss")
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sparql") as pool:
+                futures = [pool.submit(self._run_named_query, name, sparql, bindings) for name, sparql in named.items()]
+                outcomes = [f.result() for f in futures]
+        wall = time.perf_counter() - start
+
+        results = {name: outcome for name, outcome in zip(named, outcomes)}
+        if results:
+            slowest = max(results, key=lambda n: results[n]["ms"])
+            mode = "processes" if use_processes else "threads" if workers > 1 else "serial"
+            logger.info(
+                f"Ran {len(results)} queries on {workers} worker(s) ({mode}) in {wall:.2f}s; "
+                f"sum {sum(r['ms'] for r in results.values()) / 1000:.2f}s, slowest {slowest} {results[slowest]['ms'] / 1000:.2f}s"
+            )
+        return results
+
+    @staticmethod
+    def _named_queries(queries: Union[Sequence[Union[Path, str]], Mapping[str, Union[Path, str]]]) -> Dict[str, str]:
+        """Resolve a batch of query paths/texts to a name -> SPARQL text mapping."""
+        items = list(queries.items()) if isinstance(queries, Mapping) else [(None, q) for q in queries]
+        named: Dict[str, str] = {}
+        for i, (name, query) in enumerate(items, 1):
+            is_file = isinstance(query, Path) or ("\n" not in query and query.strip().endswith(".sparql"))
+            if is_file:
+                path = Path(query)
+                sparql = path.read_text()
+                if name is None:
+                    name = path.stem if path.stem not in named else path.as_posix()
+            else:
+                sparql = query
+            named[name or f"query-{i}"] = sparql
+        return named
+
+    def _run_named_query(self, name: str, sparql: str, bindings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one query of an :meth:`execute_many` batch, returning a picklable outcome."""
+        start = time.perf_counter()
+        kind, result, error, cache = None, None, None, None
+        try:
+            kind = self.prepare_query(sparql).algebra.name.replace("Query", "").upper()
+            if kind == "SELECT":
+                result, cache = self._query_dicts(sparql, bindings, name=name)
+            else:
+                res = self.execute_query(sparql, bindings, name=name)
+                result = res.askAnswer if kind == "ASK" else list(res)
+        except Exception as e:
+            logger.error(f"Query {name} failed: {e}")
+            error = str(e)
+        return {"type": kind, "result": result, "ms": (time.perf_counter() - start) * 1000, "error": error, "cache": cache}
+
+    def result_cache_info(self) -> Dict[str, int]:
+        """Return query result cache statistics (hits, misses, entries, bytes)."""
+        if not self.results:
+            return {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+        return self.results.info()
+
+    @staticmethod
+    def _result_columns(result: Result, columns: Optional[Sequence[str]]) -> List[str]:
+        """Return the projected variable names of a result, checking they exist."""
+        names = [str(var) for var in result.vars]
+        if columns is None:
+            return names
+        unknown = [c for c in columns if c not in names]
+        if unknown:
+            raise ValueError(f"Unknown result column(s) {', '.join(unknown)} (result has {', '.join(names)})")
+        return list(columns)
+
+    def iter_result_dicts(
+        self, result: Result, columns: Optional[Sequence[str]] = None, uris: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield SPARQL result rows as dictionaries, one at a time.
+
+        URIRef values become their local name, with the full URI under
+        <var>_uri; local names are memoized per URI.
+
+        Args:
+            result: SPARQL query result
+            columns: Variables to include (default: all, in result order)
+            uris: Add the <var>_uri keys
+
+        Yields:
+            One dict per row, with the same keys as :meth:`results_to_dicts`
+
+        Raises:
+            ValueError: If ``columns`` names a variable the result does not have
+        """
+        names = self._result_columns(result, columns)
+        uri_keys = {name: f"{name}_uri" for name in names}
+        URIRef = rdflib.URIRef
+        for row in result:
+            row_dict = {}
+            for name in names:
+                value = row[name]
+                # Extract local name from URI if applicable and also include full URI
+                if isinstance(value, URIRef):
+                    row_dict[name] = _localname(str(value))
+                    if uris:
+                        row_dict[uri_keys[name]] = str(value)
+                elif isinstance(value, Literal):
+                    row_dict[name] = str(value)
+                else:
+                    row_dict[name] = str(value) if value else None
+            yield row_dict
 
     def results_to_dicts(self, result: Result) -> List[Dict[str, Any]]:
         """Convert SPARQL result to list of dictionaries.
 
         Adds both local name and full URI (as <var>_uri) for URIRef values.
+        Use :meth:`iter_result_dicts` or :meth:`results_to_columns` for large
+        results.
 
         Args:
             result: SPARQL query result
@@ -178,22 +1647,58 @@ class RDFManager:
         Returns:
             List of dicts with column names as keys
         """
-        dicts = []
+        return list(self.iter_result_dicts(result))
+
+    def results_to_columns(
+        self,
+        result: Result,
+        columns: Optional[Sequence[str]] = None,
+        uris: bool = True,
+        as_numpy: bool = False,
+    ) -> Dict[str, Any]:
+        """Convert SPARQL result to columns instead of one dict per row.
+
+        Values are converted as in :meth:`results_to_dicts`; each <var>_uri
+        column holds None for rows whose value is not a URI.
+
+        Args:
+            result: SPARQL query result
+            columns: Variables to include (default: all, in result order)
+            uris: Add the <var>_uri columns
+            as_numpy: Return NumPy object arrays instead of lists
+
+        Returns:
+            Mapping of column name -> list (or array) with one entry per row
+        """
+        names = self._result_columns(result, columns)
+        out: Dict[str, List[Any]] = {}
+        for name in names:
+            out[name] = []
+            if uris:
+                out[f"{name}_uri"] = []
+        URIRef = rdflib.URIRef
         for row in result:
-            row_dict = {}
-            for var in result.vars:
-                value = row[var]
-                # Extract local name from URI if applicable and also include full URI
-                if isinstance(value, rdflib.URIRef):
-                    local = self._extract_localname(value)
-                    row_dict[str(var)] = local
-                    row_dict[f"{str(var)}_uri"] = str(value)
+            for name in names:
+                value = row[name]
+                uri = None
+                if isinstance(value, URIRef):
+                    uri = str(value)
+                    value = _localname(uri)
                 elif isinstance(value, Literal):
-                    row_dict[str(var)] = str(value)
+                    value = str(value)
                 else:
-                    row_dict[str(var)] = str(value) if value else None
-            dicts.append(row_dict)
-        return dicts
+                    value = str(value) if value else None
+                out[name].append(value)
+                if uris:
+                    out[f"{name}_uri"].append(uri)
+        if as_numpy:
+            import numpy as np
+
+            for name, values in out.items():
+                arr = np.empty(len(values), dtype=object)
+                arr[:] = values
+                out[name] = arr
+        return out
 
     def get_resource_info(self, subject_or_label) -> Optional[Dict[str, Any]]:
         """Return rdfs:label and skos:definition for a subject or label.
@@ -242,56 +1747,66 @@ class RDFManager:
         Returns:
             Local name part of URI (after # or /)
         """
-        uri_str = str(uri)
-        if "#" in uri_str:
-            return uri_str.split("#")[-1]
-        return uri_str.split("/")[-1]
+        return _localname(str(uri))
 
     def get_motif_properties(self, motif_uri: str) -> Dict[str, Any]:
         """Get all properties of a motif.
 
+        Reads the motif's triples with a direct subject lookup; for predicates
+        with several values the last one read is kept (see
+        :meth:`get_properties_many` for all of them).
+
         Args:
             motif_uri: URI reference of the motif
 
         Returns:
             Dictionary with motif properties
         """
-        query = f"""
-        PREFIX motif: <https://ns.onnx.cloud/motif#>
-        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-        
-        SELECT ?predicate ?value
-        WHERE {{
-            ?motif ?predicate ?value .
-            FILTER(STR(?motif) = "{motif_uri}")
-        }}
-        """
-        result = self.execute_query(query)
-        properties = {}
-        for row in result:
-            pred = self._extract_localname(row.predicate)
-            value = row.value
-            if isinstance(value, rdflib.URIRef):
-                value = self._extract_localname(value)
-            elif isinstance(value, Literal):
-                value = str(value)
-            properties[pred] = value
-        return properties
-
-    def find_resources_by_label(self, label: str) -> List[object]:
-        """Find subjects with exact rdfs:label equal to the provided label.
+        return {pred: values[-1] for pred, values in self.get_properties_many([motif_uri])[motif_uri].items()}
+
+    def get_properties_many(self, uris: List[str]) -> Dict[str, Dict[str, List[Any]]]:
+        """Get the properties of many resources in one call.
+
+        Each resource costs one indexed subject lookup instead of a query, so
+        fetching the data for every motif on a page is linear in the number of
+        triples returned.
 
         Args:
-            label: Literal label to match
+            uris: Resource URIs
+
+        Returns:
+            Mapping of each URI -> {predicate local name: list of values}, with
+            IRI values reduced to their local name and literals to strings;
+            resources without triples map to an empty dict
+        """
+        if self._lazy:
+            self.ensure_loaded(" ".join(str(uri) for uri in uris))
+        out: Dict[str, Dict[str, List[Any]]] = {}
+        for uri in uris:
+            properties: Dict[str, List[Any]] = {}
+            for pred, value in self.graph.predicate_objects(rdflib.URIRef(str(uri))):
+                if isinstance(value, rdflib.URIRef):
+                    value = self._extract_localname(value)
+                elif isinstance(value, Literal):
+                    value = str(value)
+                properties.setdefault(self._extract_localname(pred), []).append(value)
+            out[uri] = properties
+        return out
+
+    def find_resources_by_label(self, label: str, match: str = "exact", predicates: Tuple[str, ...] = ("label",)) -> List[object]:
+        """Find subjects by label using the label index.
+
+        Args:
+            label: Literal label to match (or label prefix)
+            match: 'exact', 'casefold' (case-insensitive) or 'prefix'
+                (case-insensitive prefix)
+            predicates: Label predicates to search: 'label' (rdfs:label) and/or
+                'prefLabel' (skos:prefLabel)
 
         Returns:
             List of subject nodes matching the label
         """
-        results = []
-        for subj, _, obj in self.graph.triples((None, rdflib.RDFS.label, None)):
-            if str(obj) == label:
-                results.append(subj)
-        return results
+        return self.labels.find(label, match, predicates)
 
     def _parse_io_list(self, s: str) -> List[Dict[str, str]]:
         """Parse an ONNX-style inputs/outputs string into structured list.
@@ -313,6 +1828,10 @@ class RDFManager:
     def get_operator_spec(self, subject_or_label) -> Optional[Dict[str, Any]]:
         """Return a structured operator spec for an ONNX operator resource.
 
+        Specs of ``onnx:Operator`` resources are read from the operator spec
+        index (see :meth:`operator_spec_index`); other subjects are walked on
+        demand.
+
         Args:
             subject_or_label: RDF subject node or operator label string
 
@@ -320,6 +1839,8 @@ class RDFManager:
             Dict with keys: label, domain, sinceVersion, inputs (list), outputs (list), attributes (str)
         """
         logger.debug(f"get_operator_spec called with argument: {subject_or_label!r}")
+        if self._lazy:
+            self.ensure_loaded(ONNX_NS)
         # Resolve label to subject if needed
         subj = None
         # rdflib.URIRef is a subclass of str; check for URIRef first
@@ -330,11 +1851,60 @@ class RDFManager:
             if not matches:
                 logger.debug("get_operator_spec: no matches for label")
                 return None
+            # A label may name both motif semantics and the ONNX operator; prefer
+            # the subject whose path contains 'onnx' or 'ops' (e.g., /onnx#Add)
+            from urllib.parse import urlparse
+
             subj = matches[0]
+            for m in matches:
+                path_parts = [p for p in urlparse(str(m)).path.split("/") if p]
+                if any(seg.lower() in ("onnx", "ops") for seg in path_parts):
+                    logger.debug(f"get_operator_spec: preferring ONNX subject {m}")
+                    subj = m
+                    break
         else:
             subj = subject_or_label
         logger.debug(f"get_operator_spec: resolved subj = {subj!r}")
 
+        spec = self.operator_spec_index().get(str(subj))
+        if spec is not None:
+            return copy.deepcopy(spec)
+        return self._build_operator_spec(subj)
+
+    def operator_spec_index(self) -> OperatorSpecIndex:
+        """Return the spec index of every ``onnx:Operator`` in the graph.
+
+        The index is built once per graph content (see :meth:`graph_fingerprint`)
+        and persisted next to the graph snapshot, so later runs against the
+        same ontology load it instead of walking the operator resources.
+
+        Returns:
+            OperatorSpecIndex with lookups by IRI, label and (domain, name, sinceVersion)
+        """
+        if self._lazy:
+            self.ensure_loaded(ONNX_NS)
+        fingerprint = self.graph_fingerprint()
+        if self._op_index is not None and self._op_index.fingerprint == fingerprint:
+            return self._op_index
+        path = self.cache.cache_dir / f"{GraphSnapshotCache.key_for(self.ttl_dir)}{OperatorSpecIndex.SUFFIX}" if self.cache else None
+        index = OperatorSpecIndex.load(path, fingerprint) if path else None
+        if index is None:
+            start = time.perf_counter()
+            operator = rdflib.URIRef(ONNX_NS + "Operator")
+            specs = {str(subj): self._build_operator_spec(subj) for subj in self.graph.subjects(rdflib.RDF.type, operator)}
+            index = OperatorSpecIndex(specs, fingerprint)
+            logger.info(f"Indexed {len(specs)} operator specs in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if path:
+                index.save(path)
+        self._op_index = index
+        return index
+
+    def get_operator_specs(self) -> Dict[str, Dict[str, Any]]:
+        """Return the spec of every ``onnx:Operator``, keyed by IRI (treat as read-only)."""
+        return self.operator_spec_index().specs
+
+    def _build_operator_spec(self, subj: Any) -> Dict[str, Any]:
+        """Walk an operator resource and its input/output/attribute nodes into a spec dict."""
         # Debug: log subject we're examining
         logger.debug(f"get_operator_spec: resolving subject {subj}")
         # Collect candidate literals for common predicates used in operator specs
@@ -465,34 +2035,124 @@ class RDFManager:
                 spec["sinceVersion"] = str(since)
 
         logger.debug(f"get_operator_spec: built spec for {subj}: {spec}")
-
-        # If find_resources_by_label returned both motif semantics and onnx operator,
-        # prefer the onnx operator subject if available
-        # (caller passed a label string; matches may include multiple subjects)
-        if isinstance(subject_or_label, str):
-            matches = self.find_resources_by_label(subject_or_label)
-            # Prefer subject whose URI contains 'onnx' or 'ops'
-            from urllib.parse import urlparse
-            for m in matches:
-                parsed = urlparse(str(m))
-                path_parts = [p for p in parsed.path.split('/') if p]
-                # Prefer subjects whose path contains 'onnx' or 'ops' (e.g., /onnx#Add)
-                if any(seg.lower() in ("onnx", "ops") for seg in path_parts):
-                    logger.debug(f"get_operator_spec: preferring ONNX subject {m}")
-                    # recompute spec for preferred subject
-                    return self.get_operator_spec(m)
-
         return spec
 
     def graph_stats(self) -> Dict[str, int]:
         """Get basic statistics about the loaded graph.
 
+        The counts are taken in one pass over the graph the first time they
+        are needed after files load or unload, and reused until the next
+        change.
+
         Returns:
             Dictionary with graph statistics
         """
-        return {
-            "triples": len(self.graph),
-            "subjects": len(set(self.graph.subjects())),
-            "predicates": len(set(self.graph.predicates())),
-            "objects": len(set(self.graph.objects())),
-        }
+        return self.statistics.counts()
+
+    def graph_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-predicate and per-class triple histograms of the loaded graph.
+
+        Meant for cost estimates and summary charts that would otherwise run
+        aggregate SPARQL over the whole graph.
+
+        Returns:
+            Dict with 'predicates' (predicate IRI -> {'triples', 'subjects',
+            'objects'}) and 'types' (class IRI -> instance count), ordered by
+            descending count
+        """
+        return self.statistics.histograms()
+
+
+# Manager whose graph forked execute_many workers query (set only while a batch runs)
+_FORKED_MANAGER: Optional[RDFManager] = None
+
+
+def _run_forked_query(name: str, sparql: str, bindings: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one execute_many query in a forked worker, against the parent's graph."""
+    return _FORKED_MANAGER._run_named_query(name, sparql, bindings)
+
+
+# Process-wide registry of shared managers: key (see _shared_key) -> [future of the manager, refcount]
+_SHARED_MANAGERS: Dict[Tuple[str, ...], List[Any]] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _shared_key(ttl_dir: Path, profile: Optional[Any], store: str = "memory", optimize: bool = False, rdfs: bool = False) -> Tuple[str, ...]:
+    """Return the registry key for a shared manager: its ttl_dir, profile and the options that change what queries see."""
+    if isinstance(profile, dict):
+        profile = json.dumps(profile, sort_keys=True)
+    return str(Path(ttl_dir).resolve()), str(profile or ""), store, str(bool(optimize)), str(bool(rdfs))
+
+
+def acquire_rdf_manager(
+    ttl_dir: Path, profile: Optional[Any] = None, store: str = "memory", optimize: bool = False, rdfs: bool = False, **kwargs
+) -> RDFManager:
+    """Return the process-wide shared RDFManager for (ttl_dir, profile, store, optimize, rdfs).
+
+    The first call loads the graph; later calls with the same arguments return
+    the same manager and bump its reference count, so a combined build that runs
+    several generators holds (and parses) the ontology only once. A call with a
+    different store, optimize or rdfs setting gets a manager of its own. The
+    graph is loaded outside the registry lock, so acquires of other graphs do
+    not wait for it; concurrent acquires of the same graph wait for the one
+    load. The shared graph must be treated as read-only: callers must not add
+    or remove triples. Every acquire should be paired with
+    :func:`release_rdf_manager`.
+
+    Args:
+        ttl_dir: Directory containing TTL files to load
+        profile: Load profile name or dict (see :class:`RDFManager`)
+        store: Triple store backend (see :class:`RDFManager`)
+        optimize: Reorder query patterns by selectivity (see :class:`RDFManager`)
+        rdfs: Materialize RDFS entailments (see :class:`RDFManager`)
+        **kwargs: Arguments that only affect how the graph is loaded
+            (cache_dir, workers), used when it is first loaded
+
+    Returns:
+        Shared RDFManager instance
+
+    Raises:
+        Exception: If loading the graph failed (in this call or the concurrent one loading it)
+    """
+    key = _shared_key(ttl_dir, profile, store, optimize, rdfs)
+    with _SHARED_LOCK:
+        entry = _SHARED_MANAGERS.get(key)
+        loads = entry is None
+        if loads:
+            entry = _SHARED_MANAGERS[key] = [Future(), 0]
+        else:
+            logger.debug(f"Reusing shared RDF graph for {key[0]} (profile {key[1] or 'all'})")
+        entry[1] += 1
+    if loads:
+        try:
+            entry[0].set_result(RDFManager(ttl_dir, profile=profile, store=store, optimize=optimize, rdfs=rdfs, **kwargs))
+        except BaseException as e:
+            with _SHARED_LOCK:
+                if _SHARED_MANAGERS.get(key) is entry:
+                    del _SHARED_MANAGERS[key]
+            entry[0].set_exception(e)
+            raise
+    return entry[0].result()
+
+
+def release_rdf_manager(rdf: RDFManager) -> int:
+    """Release a manager obtained from :func:`acquire_rdf_manager`.
+
+    The registry drops the manager once its last reference is released.
+
+    Args:
+        rdf: Shared manager to release
+
+    Returns:
+        Number of references still held (0 once dropped or if not shared)
+    """
+    with _SHARED_LOCK:
+        for key, entry in list(_SHARED_MANAGERS.items()):
+            future = entry[0]
+            if future.done() and future.exception() is None and future.result() is rdf:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del _SHARED_MANAGERS[key]
+                    return 0
+                return entry[1]
+    return 0
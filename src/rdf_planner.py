@@ -0,0 +1,187 @@
+"""Selectivity-based ordering of SPARQL basic graph patterns.
+
+rdflib joins the triple patterns of a basic graph pattern (BGP) in the order
+it receives them, after only a coarse sort by the number of constant terms.
+:func:`optimize_query` reorders the patterns of every BGP in a prepared query
+by estimated result size instead, using the per-predicate and per-class
+histograms of :class:`~src.rdf_index.GraphStatistics`: the pattern expected to
+produce the fewest rows goes first, and each following pattern is the cheapest
+one sharing a variable with those already placed, so intermediate results stay
+small and cartesian products are deferred to the end.
+
+Estimates assume uniformly distributed subjects and objects per predicate.
+Variables bound from outside a BGP (initial bindings, the left side of an
+OPTIONAL) are not known when planning, so each BGP is ordered on its own.
+
+Usage:
+  python -m src.rdf_planner QUERY.sparql [...] [--ttl-dir ttl] [--no-optimize]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from rdflib import BNode, URIRef, Variable
+from rdflib.plugins.sparql.algebra import traverse
+
+from src.rdf_index import RDF_TYPE, GraphStatistics
+
+logger = logging.getLogger(__name__)
+
+Pattern = Tuple[Any, Any, Any]
+
+
+def _is_var(term: Any) -> bool:
+    """Return True for terms a BGP binds (variables and blank nodes)."""
+    return isinstance(term, (Variable, BNode))
+
+
+def _vars(pattern: Pattern) -> Set[Any]:
+    return {t for t in pattern if _is_var(t)}
+
+
+def estimate_pattern(pattern: Pattern, bound: Set[Any], stats: GraphStatistics) -> float:
+    """Estimate the rows a triple pattern yields per solution of the patterns before it.
+
+    Args:
+        pattern: (subject, predicate, object) with variables, blank nodes or
+            constants; the predicate may be a property path
+        bound: Variables bound by earlier patterns
+        stats: Statistics of the queried graph
+
+    Returns:
+        Estimated rows (0.0 when a constant predicate or class has no triples)
+    """
+    s, p, o = pattern
+    s_bound = not _is_var(s) or s in bound
+    o_bound = not _is_var(o) or o in bound
+    if isinstance(p, URIRef):
+        hist = stats.histograms()
+        entry = hist["predicates"].get(str(p))
+        if entry is None:
+            return 0.0
+        triples, subjects, objects = entry["triples"], entry["subjects"], entry["objects"]
+        if str(p) == RDF_TYPE and not _is_var(o):
+            triples = subjects = hist["types"].get(str(o), 0)
+            objects = 1
+            if not triples:
+                return 0.0
+    else:
+        counts = stats.counts()
+        triples, subjects, objects = counts["triples"], counts["subjects"], counts["objects"]
+        if _is_var(p) and p in bound:
+            triples /= max(counts["predicates"], 1)
+    rows = float(triples)
+    if s_bound:
+        rows /= max(subjects, 1)
+    if o_bound:
+        rows /= max(objects, 1)
+    return rows
+
+
+def estimate_order(patterns: Sequence[Pattern], stats: GraphStatistics) -> List[float]:
+    """Return the estimated cumulative rows after each pattern, joined in the given order."""
+    bound: Set[Any] = set()
+    estimates: List[float] = []
+    rows = 1.0
+    for pattern in patterns:
+        rows *= estimate_pattern(pattern, bound, stats)
+        estimates.append(rows)
+        bound |= _vars(pattern)
+    return estimates
+
+
+def order_patterns(patterns: Sequence[Pattern], stats: GraphStatistics) -> Tuple[List[Pattern], List[float]]:
+    """Greedily order triple patterns by estimated selectivity.
+
+    Args:
+        patterns: Triple patterns of one BGP
+        stats: Statistics of the queried graph
+
+    Returns:
+        (ordered patterns, estimated cumulative rows after each pattern)
+    """
+    remaining = list(patterns)
+    bound: Set[Any] = set()
+    ordered: List[Pattern] = []
+    while remaining:
+        # Prefer patterns joined to what is already bound; fall back to a cartesian product
+        joined = [t for t in remaining if _vars(t) & bound] if ordered else []
+        candidates = joined or remaining
+        best = min(candidates, key=lambda t: (estimate_pattern(t, bound, stats), remaining.index(t)))
+        remaining.remove(best)
+        ordered.append(best)
+        bound |= _vars(best)
+    return ordered, estimate_order(ordered, stats)
+
+
+def bgp_nodes(query: Any) -> List[Any]:
+    """Return the BGP nodes of a prepared query's algebra, in traversal order."""
+    found: List[Any] = []
+
+    def visit(node: Any) -> None:
+        if getattr(node, "name", None) == "BGP":
+            found.append(node)
+
+    traverse(query.algebra, visitPost=visit)
+    return found
+
+
+def optimize_query(query: Any, stats: GraphStatistics) -> Any:
+    """Reorder the triple patterns of every BGP in a prepared query, in place.
+
+    Args:
+        query: Prepared query (``rdflib.plugins.sparql.sparql.Query``)
+        stats: Statistics of the graph the query will run against
+
+    Returns:
+        The same query object
+    """
+    for node in bgp_nodes(query):
+        if len(node.triples) > 1:
+            node["triples"] = order_patterns(node.triples, stats)[0]
+    return query
+
+
+def format_explain(plan: Dict[str, Any]) -> str:
+    """Render a :meth:`RDFManager.explain` plan as plain text.
+
+    Args:
+        plan: Plan dict
+
+    Returns:
+        One table per BGP with estimated and actual rows after each pattern
+    """
+    lines = [f"Query {plan['name']} ({'selectivity' if plan['optimized'] else 'rdflib default'} pattern order)"]
+    for i, bgp in enumerate(plan["bgps"], 1):
+        lines.append(f"BGP {i}:")
+        lines.append(f"  {'estimated':>12} {'actual':>10}  pattern")
+        for step in bgp:
+            actual = f"{step['actual']}{'+' if step['capped'] else ''}"
+            lines.append(f"  {step['estimated']:>12.1f} {actual:>10}  {step['pattern']}")
+    lines.append(f"{plan['rows']} result rows in {plan['ms']:.1f} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the pattern order of SPARQL queries with estimated and actual rows")
+    parser.add_argument("queries", nargs="+", type=Path, help=".sparql files to explain")
+    parser.add_argument("--ttl-dir", type=Path, default=Path("ttl"), help="TTL directory to query")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Snapshot cache directory (default: the RDFManager default)")
+    parser.add_argument("--no-optimize", action="store_true", help="Explain rdflib's default pattern order")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    from src.rdf_manager import RDFManager
+
+    kwargs = {"cache_dir": args.cache_dir} if args.cache_dir else {}
+    rdf = RDFManager(args.ttl_dir, optimize=not args.no_optimize, **kwargs)
+    for query in args.queries:
+        print(format_explain(rdf.explain(query.read_text(), name=query.name)))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
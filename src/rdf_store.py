@@ -0,0 +1,737 @@
+"""Dictionary-encoded, array-backed rdflib store.
+
+rdflib's default ``Memory`` store keeps nested dicts and sets of Python objects
+for every triple and context, which dominates memory for the generated operator
+schemas (hundreds of blank nodes per operator). :class:`ArrayStore` interns every
+term into an integer id once and keeps the quads in sorted NumPy ``int32``
+columns, in three permutations (SPO, POS and OSP, each with the graph id as the
+last key). A triple pattern is answered by binary search over the permutation
+whose key prefix covers its bound terms.
+
+Terms are kept as encoded byte keys in one buffer (see :func:`encode_term`) and
+decoded on access, so the many literals and blank nodes of the schemas cost a
+few dozen bytes each instead of a Python object and a dict entry.
+
+The store is graph-aware, so it can back the per-file named graphs of an
+``rdflib.Dataset`` (see ``RDFManager(store="array")``); ``graph.triples``,
+``predicate_objects`` and SPARQL go through the normal rdflib Graph API.
+
+Writes are buffered and merged into the sorted arrays on the next read, so bulk
+loads (``addN``) cost one sort instead of one index update per triple. The store
+is tuned for load-once, query-many use; individual adds and removes are O(n).
+
+:class:`OverlayStore` layers a private, writable store over another one, so
+derived triples can be queried together with a shared graph without ever
+being written to it. :class:`DeadlineStore` is a read-only view that stops
+queries evaluated against it at a deadline.
+
+:func:`write_image` freezes a loaded dataset into a single-file ontology image
+(sorted term dictionary plus the permutation tables), and :class:`ImageStore`
+serves it read-only straight from a memory map, so any number of worker
+processes share the same physical pages without parsing or unpickling.
+"""
+import bisect
+import json
+import mmap
+import os
+import time
+from array import array
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.graph import ModificationException
+from rdflib.plugins.stores.memory import Memory
+from rdflib.store import Store
+
+# Column order of each permutation: (key columns..., graph) as indices into (s, p, o, g)
+PERMUTATIONS = {
+    "spo": (0, 1, 2, 3),
+    "pos": (1, 2, 0, 3),
+    "osp": (2, 0, 1, 3),
+}
+
+# Terms decoded from an ArrayStore's term dictionary that are kept as objects, most recently used first
+DECODED_TERM_CACHE = 1 << 12
+
+# Ontology image file layout: magic, format version, header length, JSON header, aligned sections
+IMAGE_MAGIC = b"MOTIFIMG"
+IMAGE_VERSION = 1
+_IMAGE_ALIGN = 64
+
+
+def _coalesce(*values: Any, default: Any = None) -> Any:
+    """Return the first value that is not None."""
+    for value in values:
+        if value is not None:
+            return value
+    return default
+
+
+class ArrayStore(Store):
+    """Graph-aware rdflib store holding quads as sorted integer arrays."""
+
+    context_aware = True
+    graph_aware = True
+    formula_aware = False
+    transaction_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier: Optional[Any] = None):
+        super().__init__(configuration)
+        self.identifier = identifier
+        # Term dictionary: id -> term and term -> id (graph identifiers share the table)
+        self._terms = _TermDictionary()
+        self._ids = self._terms
+        # Context graph objects by graph id, as handed to add_graph/add
+        self._graphs: Dict[int, Any] = {}
+        # Unique quads sorted in SPO order, plus writes not yet merged
+        self._quads = np.empty((0, 4), dtype=np.int32)
+        self._pending: List[Tuple[int, int, int, int]] = []
+        # Permutation columns, rebuilt lazily after writes
+        self._index: Optional[Dict[str, Tuple[np.ndarray, ...]]] = None
+        self._namespace: Dict[str, Any] = {}
+        self._prefix: Dict[Any, str] = {}
+
+    # -- term dictionary -------------------------------------------------
+
+    def _intern(self, term: Any) -> int:
+        """Return the id of a term, adding it to the dictionary if needed."""
+        return self._terms.intern(term)
+
+    def _graph_id(self, context: Any) -> int:
+        """Return the id of a context graph, registering the graph if needed."""
+        gid = self._intern(context.identifier)
+        self._graphs.setdefault(gid, context)
+        return gid
+
+    def _lookup(self, term: Any) -> Optional[int]:
+        """Return the id of a pattern term, -1 for a wildcard, None if the term is unknown."""
+        if term is None:
+            return -1
+        return self._ids.get(term)
+
+    # -- index maintenance ----------------------------------------------
+
+    def _flush(self) -> None:
+        """Merge buffered writes into the sorted quad array."""
+        if not self._pending:
+            return
+        added = np.array(self._pending, dtype=np.int32).reshape(-1, 4)
+        self._pending = []
+        self._terms.seal()
+        # np.unique(axis=0) sorts rows lexicographically, i.e. in SPO order
+        self._quads = np.unique(np.concatenate([self._quads, added]), axis=0)
+        self._index = None
+
+    def _ensure_index(self) -> Dict[str, Tuple[np.ndarray, ...]]:
+        """Return the permutation columns, building them after writes."""
+        self._flush()
+        if self._index is None:
+            # Column-major, so the SPO permutation is a set of views rather than a copy
+            quads = self._quads = np.asfortranarray(self._quads)
+            index = {}
+            for name, cols in PERMUTATIONS.items():
+                if name == "spo":
+                    index[name] = tuple(quads[:, c] for c in cols)
+                else:
+                    # np.lexsort sorts by its last key first
+                    order = np.lexsort(tuple(quads[:, c] for c in reversed(cols)))
+                    index[name] = tuple(quads[order, c] for c in cols)
+            self._index = index
+        return self._index
+
+    def _match(self, s: int, p: int, o: int) -> Tuple[Tuple[np.ndarray, ...], int, int]:
+        """Find the rows matching a pattern of term ids (-1 = wildcard).
+
+        Returns:
+            Tuple of (columns, lo, hi): the permutation columns reordered back to
+            (s, p, o, g) and the row range whose key prefix matches the bound terms.
+            Bound terms beyond that prefix (only ``s ? o``) are filtered by the caller.
+        """
+        index = self._ensure_index()
+        if s >= 0:
+            name, keys = ("spo", (s, p, o)) if p >= 0 or o < 0 else ("osp", (o, s, p))
+        elif p >= 0:
+            name, keys = "pos", (p, o, s)
+        elif o >= 0:
+            name, keys = "osp", (o, s, p)
+        else:
+            name, keys = "spo", ()
+        cols = index[name]
+        lo, hi = 0, len(cols[0])
+        for col, key in zip(cols, keys):
+            if key < 0:
+                break
+            window = col[lo:hi]
+            lo, hi = lo + int(np.searchsorted(window, key, "left")), lo + int(np.searchsorted(window, key, "right"))
+            if lo >= hi:
+                break
+        order = PERMUTATIONS[name]
+        spog = tuple(cols[order.index(i)] for i in range(4))
+        return spog, lo, hi
+
+    def _rows(self, triple: Tuple[Any, Any, Any], context: Any) -> Optional[np.ndarray]:
+        """Return the (n, 4) id rows matching a triple pattern and context, None if nothing can match."""
+        s, p, o = (self._lookup(t) for t in triple)
+        if s is None or p is None or o is None:
+            return None
+        gid = -1
+        if context is not None:
+            gid = self._lookup(context.identifier)
+            if gid is None or gid not in self._graphs:
+                return None
+        (cs, cp, co, cg), lo, hi = self._match(s, p, o)
+        rows = np.stack([cs[lo:hi], cp[lo:hi], co[lo:hi], cg[lo:hi]], axis=1)
+        mask = np.ones(len(rows), dtype=bool)
+        for i, tid in enumerate((s, p, o, gid)):
+            if tid >= 0:
+                mask &= rows[:, i] == tid
+        return rows[mask]
+
+    # -- Store API --------------------------------------------------------
+
+    def add(self, triple: Tuple[Any, Any, Any], context: Any, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        self._pending.append((*(self._intern(t) for t in triple), self._graph_id(context)))
+
+    def addN(self, quads) -> None:
+        pending = self._pending
+        intern = self._intern
+        for s, p, o, c in quads:
+            pending.append((intern(s), intern(p), intern(o), self._graph_id(c)))
+
+    def remove(self, triple: Tuple[Any, Any, Any], context: Any = None) -> None:
+        Store.remove(self, triple, context)
+        self._flush()
+        ids = [self._lookup(t) for t in triple]
+        if any(tid is None for tid in ids):
+            return
+        mask = np.ones(len(self._quads), dtype=bool)
+        for i, tid in enumerate(ids):
+            if tid >= 0:
+                mask &= self._quads[:, i] == tid
+        if context is not None:
+            gid = self._ids.get(context.identifier)
+            if gid is None:
+                return
+            mask &= self._quads[:, 3] == gid
+        if mask.any():
+            self._quads = self._quads[~mask]
+            self._index = None
+
+    def triples(self, triple_pattern, context: Any = None) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        rows = self._rows(triple_pattern, context)
+        if rows is None or not len(rows):
+            return
+        terms = self._terms
+        graphs = self._graphs
+        if context is not None:
+            for s, p, o, _ in rows.tolist():
+                yield (terms[s], terms[p], terms[o]), iter((context,))
+            return
+        # Union view: every permutation keeps the graph id as its last key, so the
+        # rows of one triple across graphs are adjacent; yield each triple once
+        triples = rows[:, :3]
+        ends = np.flatnonzero((triples[1:] != triples[:-1]).any(axis=1)) + 1
+        start = 0
+        for end in ends.tolist() + [len(rows)]:
+            s, p, o, _ = rows[start].tolist()
+            gids = rows[start:end, 3].tolist()
+            yield (terms[s], terms[p], terms[o]), iter([graphs[g] for g in gids])
+            start = end
+
+    def __len__(self, context: Any = None) -> int:
+        s, p, o, g = self._ensure_index()["spo"]
+        if context is not None:
+            gid = self._lookup(context.identifier)
+            if gid is None:
+                return 0
+            return int(np.count_nonzero(g == gid))
+        # Quads are SPO-sorted, so duplicates of a triple across graphs are adjacent
+        duplicates = (s[1:] == s[:-1]) & (p[1:] == p[:-1]) & (o[1:] == o[:-1])
+        return int(len(s) - np.count_nonzero(duplicates))
+
+    def contexts(self, triple: Optional[Tuple[Any, Any, Any]] = None) -> Iterator[Any]:
+        if triple is None or triple == (None, None, None):
+            return iter(list(self._graphs.values()))
+        rows = self._rows(triple, None)
+        if rows is None:
+            return iter(())
+        return iter([self._graphs[g] for g in dict.fromkeys(rows[:, 3].tolist())])
+
+    def add_graph(self, graph: Any) -> None:
+        self._graph_id(graph)
+
+    def remove_graph(self, graph: Any) -> None:
+        gid = self._ids.get(graph.identifier)
+        if gid is None or gid not in self._graphs:
+            return
+        self._flush()
+        keep = self._quads[:, 3] != gid
+        if not keep.all():
+            self._quads = self._quads[keep]
+            self._index = None
+        del self._graphs[gid]
+
+    def bind(self, prefix: str, namespace: Any, override: bool = True) -> None:
+        # Same semantics as rdflib's Memory.bind
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = _coalesce(self._prefix.get(namespace), self._prefix.get(bound_namespace))
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            self._prefix[_coalesce(bound_namespace, namespace)] = _coalesce(bound_prefix, default=prefix)
+            self._namespace[_coalesce(bound_prefix, prefix)] = _coalesce(bound_namespace, default=namespace)
+
+    def namespace(self, prefix: str) -> Optional[Any]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: Any) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, Any]]:
+        for prefix, namespace in list(self._namespace.items()):
+            yield prefix, namespace
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Return approximate bytes held by the term dictionary and the permutation indexes."""
+        index = self._ensure_index()
+        # The SPO permutation shares the quad array's memory where there is one
+        spo_bytes = self._quads.nbytes if self._quads is not None else sum(col.nbytes for col in index["spo"])
+        return {
+            "terms": len(self._terms),
+            "term_bytes": self._terms.nbytes(),
+            "quads": len(index["spo"][0]),
+            "index_bytes": int(spo_bytes + sum(col.nbytes for name, cols in index.items() if name != "spo" for col in cols)),
+        }
+
+
+class _TermDictionary:
+    """Growable term dictionary holding terms as encoded keys (see :func:`encode_term`).
+
+    Keys are appended to one byte buffer, so a term costs its key bytes plus
+    an offset and a hash slot instead of a Python object and a dict entry.
+    Lookups hash the key and binary-search the sorted hashes of the terms
+    interned before the last :meth:`seal`; newer terms sit in a small dict
+    until then. Terms are decoded on access, the most recent ones cached.
+    """
+
+    def __init__(self):
+        self._keys = bytearray()
+        self._offsets = array("q", [0])
+        # Terms interned since the last seal: key -> id
+        self._new: Dict[bytes, int] = {}
+        # Hashes of sealed keys, sorted, and the id of each
+        self._hashes = np.empty(0, dtype=np.int64)
+        self._hash_ids = np.empty(0, dtype=np.int32)
+        self.term = lru_cache(maxsize=DECODED_TERM_CACHE)(self._decode)
+
+    def key(self, tid: int) -> bytes:
+        return bytes(self._keys[self._offsets[tid]:self._offsets[tid + 1]])
+
+    def _decode(self, tid: int) -> Any:
+        return decode_term(self.key(tid))
+
+    def __getitem__(self, tid: int) -> Any:
+        return self.term(tid)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _find(self, key: bytes) -> Optional[int]:
+        tid = self._new.get(key)
+        if tid is not None:
+            return tid
+        h = hash(key)
+        hashes = self._hashes
+        i = int(np.searchsorted(hashes, h))
+        while i < len(hashes) and hashes[i] == h:
+            tid = int(self._hash_ids[i])
+            if self.key(tid) == key:
+                return tid
+            i += 1
+        return None
+
+    def get(self, term: Any, default: Optional[int] = None) -> Optional[int]:
+        try:
+            key = encode_term(term)
+        except TypeError:
+            return default
+        tid = self._find(key)
+        return default if tid is None else tid
+
+    def intern(self, term: Any) -> int:
+        """Return the id of a term, appending it if it is new."""
+        key = encode_term(term)
+        tid = self._find(key)
+        if tid is None:
+            tid = len(self)
+            self._keys += key
+            self._offsets.append(len(self._keys))
+            self._new[key] = tid
+        return tid
+
+    def seal(self) -> None:
+        """Move the terms interned since the last call into the sorted hash index."""
+        if not self._new:
+            return
+        count = len(self._new)
+        hashes = np.concatenate([self._hashes, np.fromiter((hash(k) for k in self._new), dtype=np.int64, count=count)])
+        ids = np.concatenate([self._hash_ids, np.fromiter(self._new.values(), dtype=np.int32, count=count)])
+        order = np.argsort(hashes, kind="stable")
+        self._hashes, self._hash_ids = hashes[order], ids[order]
+        self._new = {}
+
+    def nbytes(self) -> int:
+        """Return the bytes held by the keys, offsets and hash index (not the decoded-term cache)."""
+        return len(self._keys) + self._offsets.itemsize * len(self._offsets) + self._hashes.nbytes + self._hash_ids.nbytes
+
+
+def encode_term(term: Any) -> bytes:
+    """Encode an RDF term as the byte key used in ontology images.
+
+    Keys are ``U<iri>``, ``B<id>`` or ``L<lang>\\0<datatype>\\0<lexical>``; their
+    byte order defines term ids, so lookups are a binary search over the keys.
+    """
+    if isinstance(term, URIRef):
+        return b"U" + str(term).encode("utf-8")
+    if isinstance(term, BNode):
+        return b"B" + str(term).encode("utf-8")
+    if isinstance(term, Literal):
+        return b"L" + "\0".join((term.language or "", term.datatype or "", str(term))).encode("utf-8")
+    raise TypeError(f"Cannot store {type(term).__name__} term {term!r} in an ontology image")
+
+
+def decode_term(key: bytes) -> Any:
+    """Decode a term key written by :func:`encode_term`."""
+    kind, text = key[:1], key[1:].decode("utf-8")
+    if kind == b"U":
+        return URIRef(text)
+    if kind == b"B":
+        return BNode(text)
+    lang, datatype, lexical = text.split("\0", 2)
+    return Literal(lexical, lang=lang or None, datatype=URIRef(datatype) if datatype else None)
+
+
+def write_image(store: Store, path: Path, meta: Optional[Dict[str, Any]] = None) -> Path:
+    """Write the quads of a graph-aware store to a single-file ontology image.
+
+    Args:
+        store: Store to freeze (e.g. the ``graph.store`` of a loaded RDFManager)
+        path: Image file to write (replaced atomically)
+        meta: Extra JSON-serialisable header fields (files, namespaces, ...)
+
+    Returns:
+        Path of the written image
+    """
+    quads = []
+    contexts = list(store.contexts())
+    for ctx in contexts:
+        for triple, _ in store.triples((None, None, None), ctx):
+            quads.append((*triple, ctx.identifier))
+    keys = sorted({encode_term(t) for quad in quads for t in quad})
+    ids = {key: i for i, key in enumerate(keys)}
+    encoded = np.array(
+        [[ids[encode_term(t)] for t in quad] for quad in quads], dtype=np.int32
+    ).reshape(-1, 4)
+    encoded = np.unique(encoded, axis=0)
+    sections: Dict[str, np.ndarray] = {}
+    for name, cols in PERMUTATIONS.items():
+        ordered = encoded if name == "spo" else encoded[np.lexsort(tuple(encoded[:, c] for c in reversed(cols)))]
+        # (4, n) so every key column is contiguous for np.searchsorted
+        sections[name] = np.ascontiguousarray(ordered[:, cols].T)
+    blob = b"".join(keys)
+    sections["term_offsets"] = np.cumsum([0] + [len(k) for k in keys], dtype=np.int64)
+    sections["term_keys"] = np.frombuffer(blob, dtype=np.uint8)
+
+    header = dict(meta or {})
+    header.update({
+        "version": IMAGE_VERSION,
+        "created": datetime.utcnow().isoformat() + "Z",
+        "terms": len(keys),
+        "quads": int(len(encoded)),
+        "graphs": sorted({str(q[3]) for q in quads} | {str(c.identifier) for c in contexts}),
+        "namespaces": [(str(p), str(ns)) for p, ns in store.namespaces()],
+    })
+    # Section offsets depend on the header length, so lay them out relative to the data start
+    layout = {}
+    offset = 0
+    for name, arr in sections.items():
+        offset = -(-offset // _IMAGE_ALIGN) * _IMAGE_ALIGN
+        layout[name] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+        offset += arr.nbytes
+    header["sections"] = layout
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix_len = len(IMAGE_MAGIC) + 4 + 8 + len(header_bytes)
+    data_start = -(-prefix_len // _IMAGE_ALIGN) * _IMAGE_ALIGN
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(IMAGE_MAGIC)
+        f.write(np.uint32(IMAGE_VERSION).tobytes())
+        f.write(np.uint64(len(header_bytes)).tobytes())
+        f.write(header_bytes)
+        for name, arr in sections.items():
+            f.write(b"\0" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(arr.tobytes())
+    tmp.replace(path)
+    return path
+
+
+def read_image_header(path: Path) -> Optional[Dict[str, Any]]:
+    """Return the JSON header of an ontology image, or None if missing or not a current image."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(IMAGE_MAGIC)) != IMAGE_MAGIC:
+                return None
+            version = int(np.frombuffer(f.read(4), dtype=np.uint32)[0])
+            length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            if version != IMAGE_VERSION:
+                return None
+            header = json.loads(f.read(length).decode("utf-8"))
+    except (OSError, ValueError, IndexError):
+        return None
+    header["data_start"] = -(-(len(IMAGE_MAGIC) + 12 + length) // _IMAGE_ALIGN) * _IMAGE_ALIGN
+    return header
+
+
+class _TermTable:
+    """Sequence view decoding terms on demand from an image's sorted key blob."""
+
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray):
+        self._keys = keys
+        self._offsets = offsets
+        self.term = lru_cache(maxsize=1 << 16)(self._decode)
+
+    def key(self, tid: int) -> bytes:
+        return self._keys[self._offsets[tid]:self._offsets[tid + 1]].tobytes()
+
+    def _decode(self, tid: int) -> Any:
+        return decode_term(self.key(tid))
+
+    def __getitem__(self, tid: int) -> Any:
+        return self.term(tid)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def nbytes(self) -> int:
+        return self._keys.nbytes + self._offsets.nbytes
+
+
+class _TermIndex:
+    """Mapping-like term -> id lookup by binary search over an image's sorted keys."""
+
+    def __init__(self, table: _TermTable):
+        self._table = table
+        self._cache: Dict[Any, Optional[int]] = {}
+
+    def __getitem__(self, tid: int) -> bytes:
+        # Lets bisect search the keys without materialising them
+        return self._table.key(tid)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def get(self, term: Any, default: Optional[int] = None) -> Optional[int]:
+        if term in self._cache:
+            return self._cache[term]
+        try:
+            key = encode_term(term)
+        except TypeError:
+            return default
+        tid = bisect.bisect_left(self, key)
+        found = tid if tid < len(self) and self._table.key(tid) == key else default
+        if len(self._cache) < (1 << 16):
+            self._cache[term] = found
+        return found
+
+
+class ImageStore(ArrayStore):
+    """Read-only :class:`ArrayStore` served from a memory-mapped ontology image.
+
+    Opening an image maps the file and reads its small JSON header; the term
+    dictionary and permutation tables are zero-copy views of the mapped pages,
+    shared by every process that opens the same file.
+    """
+
+    def __init__(self, path: Path, configuration: Optional[str] = None, identifier: Optional[Any] = None):
+        super().__init__(configuration, identifier)
+        self.path = Path(path)
+        header = read_image_header(self.path)
+        if header is None:
+            raise ValueError(f"Not a readable ontology image: {self.path}")
+        self.header = header
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        sections = {}
+        for name, info in header["sections"].items():
+            dtype = np.dtype(info["dtype"])
+            count = int(np.prod(info["shape"]))
+            arr = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=header["data_start"] + info["offset"])
+            sections[name] = arr.reshape(info["shape"])
+        self._terms = _TermTable(sections["term_keys"], sections["term_offsets"])
+        self._ids = _TermIndex(self._terms)
+        self._index = {name: tuple(sections[name]) for name in PERMUTATIONS}
+        self._quads = None
+        for ident in header["graphs"]:
+            gid = self._ids.get(URIRef(ident))
+            if gid is not None:
+                self._graphs[gid] = Graph(store=self, identifier=URIRef(ident))
+        for prefix, ns in header["namespaces"]:
+            self.bind(prefix, URIRef(ns))
+
+    def _ensure_index(self) -> Dict[str, Tuple[np.ndarray, ...]]:
+        return self._index
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise ModificationException()
+
+    add = addN = remove = remove_graph = _read_only
+
+    def add_graph(self, graph: Any) -> None:
+        # Dataset.graph(identifier) registers graphs it hands out; nothing to record here
+        return None
+
+
+class OverlayStore(Store):
+    """Writable view of another store that never modifies it.
+
+    Reads see the union of the base store and the triples added through the
+    overlay, per named graph and across graphs. Adds, removes and namespace
+    bindings go to a private ``Memory`` store, so a shared, possibly
+    read-only graph (e.g. an :class:`ImageStore`) can be extended for the
+    duration of a computation and the overlay simply dropped afterwards.
+    Removing triples or graphs only affects what was added to the overlay.
+    """
+
+    context_aware = True
+    graph_aware = True
+    formula_aware = False
+    transaction_aware = False
+
+    def __init__(self, base: Store, configuration: Optional[str] = None, identifier: Optional[Any] = None):
+        super().__init__(configuration)
+        self.identifier = identifier
+        self.base = base
+        self.overlay = Memory()
+
+    def _added(self, triple_pattern, context: Any) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        """Yield the overlay's matches that the base store does not hold (in ``context``, if given)."""
+        for triple, contexts in self.overlay.triples(triple_pattern, context):
+            if next(self.base.triples(triple, context), None) is None:
+                yield triple, contexts
+
+    def triples(self, triple_pattern, context: Any = None) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        yield from self.base.triples(triple_pattern, context)
+        yield from self._added(triple_pattern, context)
+
+    def __len__(self, context: Any = None) -> int:
+        return self.base.__len__(context) + sum(1 for _ in self._added((None, None, None), context))
+
+    def contexts(self, triple: Optional[Tuple[Any, Any, Any]] = None) -> Iterator[Any]:
+        own = list(self.overlay.contexts(triple))
+        owned = {c.identifier for c in own}
+        return iter(own + [c for c in self.base.contexts(triple) if c.identifier not in owned])
+
+    def add(self, triple: Tuple[Any, Any, Any], context: Any, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        self.overlay.add(triple, context, quoted)
+
+    def addN(self, quads) -> None:
+        self.overlay.addN(quads)
+
+    def remove(self, triple: Tuple[Any, Any, Any], context: Any = None) -> None:
+        Store.remove(self, triple, context)
+        self.overlay.remove(triple, context)
+
+    def add_graph(self, graph: Any) -> None:
+        self.overlay.add_graph(graph)
+
+    def remove_graph(self, graph: Any) -> None:
+        self.overlay.remove_graph(graph)
+
+    def bind(self, prefix: str, namespace: Any, override: bool = True) -> None:
+        self.overlay.bind(prefix, namespace, override)
+
+    def namespace(self, prefix: str) -> Optional[Any]:
+        return _coalesce(self.overlay.namespace(prefix), self.base.namespace(prefix))
+
+    def prefix(self, namespace: Any) -> Optional[str]:
+        return _coalesce(self.overlay.prefix(namespace), self.base.prefix(namespace))
+
+    def namespaces(self) -> Iterator[Tuple[str, Any]]:
+        own = dict(self.overlay.namespaces())
+        yield from own.items()
+        for prefix, namespace in self.base.namespaces():
+            if prefix not in own:
+                yield prefix, namespace
+
+
+class DeadlineExceeded(Exception):
+    """Raised by a :class:`DeadlineStore` read once its deadline has passed."""
+
+
+class DeadlineStore(Store):
+    """Read-only view of another store whose reads fail once a deadline passes.
+
+    SPARQL evaluation pulls every solution out of ``triples`` calls, including
+    eager operators (ORDER BY, GROUP BY, aggregates) that consume their whole
+    input before yielding a row, so checking the clock as triples are read
+    bounds a query evaluated against this view in the calling thread, without
+    a worker thread or process. The clock is read every ``check_every``
+    triples and on every lookup.
+    """
+
+    context_aware = True
+    graph_aware = True
+    formula_aware = False
+    transaction_aware = False
+
+    def __init__(self, base: Store, deadline: float, check_every: int = 256):
+        super().__init__()
+        self.base = base
+        self.deadline = deadline
+        self.check_every = check_every
+
+    def _check(self) -> None:
+        if time.perf_counter() > self.deadline:
+            raise DeadlineExceeded()
+
+    def triples(self, triple_pattern, context: Any = None) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        self._check()
+        for n, match in enumerate(self.base.triples(triple_pattern, context), 1):
+            if n % self.check_every == 0:
+                self._check()
+            yield match
+
+    def __len__(self, context: Any = None) -> int:
+        return self.base.__len__(context)
+
+    def contexts(self, triple: Optional[Tuple[Any, Any, Any]] = None) -> Iterator[Any]:
+        return self.base.contexts(triple)
+
+    def add_graph(self, graph: Any) -> None:
+        pass
+
+    def bind(self, prefix: str, namespace: Any, override: bool = True) -> None:
+        pass
+
+    def namespace(self, prefix: str) -> Optional[Any]:
+        return self.base.namespace(prefix)
+
+    def prefix(self, namespace: Any) -> Optional[str]:
+        return self.base.prefix(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, Any]]:
+        return self.base.namespaces()
@@ -29,7 +29,7 @@ except Exception:
 import yaml
 import json
 
-from src.rdf_manager import RDFManager
+from src.rdf_manager import RDFManager, acquire_rdf_manager, rdflib, release_rdf_manager
 
 # Simple alias for RDF IRIs used in type annotations
 IRI = str
@@ -61,20 +61,26 @@ class WikiGenerator:
             page_items = ((page.get("name") or page.get("id") or "page", page) for page in pages)
         else:
             page_items = []
-        for name, page in page_items:
-            try:
-                self.generate_page(name, page)
-            except Exception as e:
-                logging.error(f"Failed to generate page {name}: {e}")
+        # Enforce the config's query timeout on every page query; max_foreach_rows caps `foreach` sections only
+        policy = wiki_cfg.get("policy") or {}
+        self.max_foreach_rows = policy.get("max_foreach_rows")
+        with self.rdf.query_limits(timeout=policy.get("query_timeout_seconds")):
+            for name, page in page_items:
+                try:
+                    self.generate_page(name, page)
+                except Exception as e:
+                    logging.error(f"Failed to generate page {name}: {e}")
         # Save search index
         self.save_index()
 
-    def __init__(self, config_path: Path):
+    def __init__(self, config_path: Path, profile: Optional[str] = None, rdf: Optional[RDFManager] = None):
         """
         Initialize generator from config file.
 
         Args:
             config_path: Path to wiki.yaml configuration
+            profile: RDFManager load profile name (default: config `load_profile`, else all TTL)
+            rdf: Already-loaded RDFManager to query (default: the shared graph for ttl/ and profile)
         """
         self.config_path = config_path
         self.config = self._load_config(config_path)
@@ -84,7 +90,8 @@ class WikiGenerator:
         self.template_dir = self.base_dir / "src" / "template"
         self.output_dir = self.base_dir / "tmp" / "wiki"
 
-        self.rdf = RDFManager(self.base_dir / "ttl")
+        self._shared_rdf = rdf is None
+        self.rdf = rdf or acquire_rdf_manager(self.base_dir / "ttl", profile=profile or self.config.get("load_profile"))
 
         stats = self.rdf.graph_stats()
         logging.info(f"Loaded {stats.get('triples', 0)} triples from TTL sources")
@@ -102,7 +109,15 @@ class WikiGenerator:
         self.renderer = pystache.Renderer(partials=partials) if pystache is not None else None
         # Search index entries collected during page generation
         self.search_index = []
+        # Row cap for `foreach: true` sections (config `policy.max_foreach_rows`, set by generate_all)
+        self.max_foreach_rows = None
+
 
+    def close(self) -> None:
+        """Release the shared ontology graph acquired by this generator."""
+        if self._shared_rdf:
+            release_rdf_manager(self.rdf)
+            self._shared_rdf = False
 
     def _load_config(self, path: Path) -> Dict[str, Any]:
         """Load YAML configuration. Missing file -> empty config."""
@@ -155,8 +170,12 @@ class WikiGenerator:
                     data.setdefault(f"{sec}_items", []).extend(preds)
             # Query by SPARQL file
             if sec_spec.get("query"):
-                rows = self.find_by_sparql(None, sec_spec.get("query"))
                 t = sec_spec.get("template", "")
+                # Only sections that opt in (`foreach: true`, or their own `max_rows`) are row-capped
+                max_rows = sec_spec.get("max_rows")
+                if max_rows is None and sec_spec.get("foreach"):
+                    max_rows = self.max_foreach_rows
+                rows = self.find_by_sparql(None, sec_spec.get("query"), max_rows=max_rows)
                 if "motifs" in t or "models" in t:
                     # Normalize query rows to `items` expected by templates
                     for r in rows:
@@ -201,17 +220,9 @@ class WikiGenerator:
                     slug = slugify(it.get('title') or motif_uri)
                     detail_dir = (self.output_dir / slug)
                     detail_dir.mkdir(parents=True, exist_ok=True)
-                    # Bind the target motif and run the detail query
-                    # Insert a VALUES binding for ?targetMotif inside the WHERE clause
-                    import re
-                    if re.search(r'WHERE\s*\{', detail_q, flags=re.I):
-                        qtext = re.sub(r'(WHERE\s*\{)', rf"\1 VALUES ?targetMotif {{ <{motif_uri}> }} ", detail_q, flags=re.I, count=1)
-                    else:
-                        # Fallback to prepend, though SPARQL parsers may reject it
-                        qtext = f"VALUES ?targetMotif {{ <{motif_uri}> }}\n" + detail_q
+                    # Bind ?targetMotif and run the detail query (prepared once, reused for every motif)
                     try:
-                        res = self.rdf.execute_query(qtext)
-                        rows = self.rdf.results_to_dicts(res)
+                        rows = self.rdf.query_dicts(detail_q, bindings={"targetMotif": rdflib.URIRef(motif_uri)})
                         detail = rows[0] if rows else {}
                     except Exception as e:
                         logging.error(f"Failed to query detail for {motif_uri}: {e}")
@@ -318,8 +329,7 @@ class WikiGenerator:
         SELECT ?o ?label (COUNT(?s) as ?count) WHERE {{ ?s {pred_ref} ?o . OPTIONAL {{ ?o rdfs:label ?label }} }} GROUP BY ?o ?label ORDER BY ?label
         """
         try:
-            result = self.rdf.execute_query(query)
-            rows = self.rdf.results_to_dicts(result)
+            rows = self.rdf.query_dicts(query)
             out = []
             for r in rows:
                 o = r.get("o") or r.get("o_uri")
@@ -332,16 +342,15 @@ class WikiGenerator:
             logging.error(f"find_by_predicate error for {predicate}: {e}")
             return []
 
-    def find_by_sparql(self, entity: IRI, query: str) -> List[object]:
-        """Execute a SPARQL file or inline query and return list of dicts."""
+    def find_by_sparql(self, entity: IRI, query: str, max_rows: Optional[int] = None) -> List[object]:
+        """Execute a SPARQL file or inline query and return list of dicts (at most max_rows, if given)."""
         try:
-            # If it's a file path, resolve and run
-            if query.strip().endswith('.sparql') or '/' in query or query.strip().startswith('.'):
-                qp = self._resolve_query_path(query)
-                res = self.rdf.execute_query_file(qp)
-            else:
-                res = self.rdf.execute_query(query)
-            return self.rdf.results_to_dicts(res)
+            with self.rdf.query_limits(timeout=self.rdf.query_timeout, max_rows=max_rows if max_rows is not None else self.rdf.max_rows):
+                # If it's a file path, resolve and run
+                if query.strip().endswith('.sparql') or '/' in query or query.strip().startswith('.'):
+                    qp = self._resolve_query_path(query)
+                    return self.rdf.query_file_dicts(qp)
+                return self.rdf.query_dicts(query)
         except FileNotFoundError as e:
             logging.error(e)
             return []
@@ -355,8 +364,7 @@ class WikiGenerator:
         SELECT ?s ?label WHERE {{ ?s a {rdfType} . OPTIONAL {{ ?s rdfs:label ?label }} }} ORDER BY ?label
         """
         try:
-            res = self.rdf.execute_query(query)
-            return self.rdf.results_to_dicts(res)
+            return self.rdf.query_dicts(query)
         except Exception as e:
             logging.error(f"find_by_type failed: {e}")
             return []
@@ -430,13 +438,18 @@ def main():
         default=Path("./tmp/wiki/"),
         help="Override output directory",
     )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="RDFManager load profile (default: load_profile from config)",
+    )
     args = parser.parse_args()
 
     if not args.config.exists():
         logging.log.error(f"Config file not found: {args.config}")
         return 1
 
-    gen = WikiGenerator(args.config)
+    gen = WikiGenerator(args.config, profile=args.profile)
     if args.output:
         gen.output_dir = args.output
 
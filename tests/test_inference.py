@@ -0,0 +1,239 @@
+import json
+from pathlib import Path
+
+import pytest
+import rdflib
+from rdflib.compare import to_isomorphic
+
+from src.infer.compiled import CompiledRule, PredicateIndex, Unsupported, run_compiled
+from src.infer import fixpoint
+from src.infer import run_inference as run_inference_module
+from src.infer.rules import load_rules
+from src.infer.fixpoint import run_fixpoint
+from src.infer.run_inference import run_inference
+from src.infer.schedule import components, critical_path, rule_dependencies, run_scheduled, stages
+from src.rdf_manager import RDFManager
+
+PREFIXES = """@prefix motif: <https://ns.onnx.cloud/motif#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+"""
+
+QUERY_PREFIXES = """PREFIX motif: <https://ns.onnx.cloud/motif#>
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+"""
+
+MOTIF = "https://ns.onnx.cloud/motif#"
+
+
+def write_chain(tmp_path: Path, length: int = 5):
+    """Write a usesMotif chain M0 -> M1 -> ... and rules deriving its transitive closure."""
+    ttl_dir = tmp_path / "ttl"
+    ttl_dir.mkdir()
+    body = "".join(f"motif:M{i} a motif:Motif ; motif:usesMotif motif:M{i + 1} .\n" for i in range(length - 1))
+    (ttl_dir / "chain.ttl").write_text(PREFIXES + body + f'motif:M{length - 1} a motif:Motif ; skos:prefLabel "last" .\n')
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    (rules / "reaches_base.sparql").write_text(
+        QUERY_PREFIXES + "CONSTRUCT { ?a motif:reaches ?b } WHERE { ?a motif:usesMotif ?b }"
+    )
+    (rules / "reaches_step.sparql").write_text(
+        QUERY_PREFIXES + "CONSTRUCT { ?a motif:reaches ?c } WHERE { ?a motif:reaches ?b . ?b motif:usesMotif ?c }"
+    )
+    (rules / "reaches_last.sparql").write_text(
+        QUERY_PREFIXES
+        + "CONSTRUCT { ?a a motif:ReachesLast ; motif:via [ motif:target ?b ] } "
+        + 'WHERE { ?a motif:reaches ?b . OPTIONAL { ?b skos:prefLabel ?l } FILTER(BOUND(?l)) }'
+    )
+    return ttl_dir, rules
+
+
+def test_fixpoint_derives_chained_consequences(tmp_path: Path):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=5)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    rules = load_rules(rules_dir, rdf)
+    assert {r.name for r in rules} == {"reaches_base", "reaches_last", "reaches_step"}
+    before = len(rdf.graph)
+
+    outputs, rounds = run_fixpoint(rdf, rules)
+    reaches = {(str(s), str(o)) for s, _, o in outputs["reaches_step"]} | {(str(s), str(o)) for s, _, o in outputs["reaches_base"]}
+    assert reaches == {(f"{MOTIF}M{i}", f"{MOTIF}M{j}") for i in range(5) for j in range(i + 1, 5)}
+    last = set(outputs["reaches_last"].subjects(rdflib.RDF.type, rdflib.URIRef(MOTIF + "ReachesLast")))
+    assert len(last) == 4
+    # One blank node per solution, not one per round the rule ran in
+    assert len(list(outputs["reaches_last"].subject_objects(rdflib.URIRef(MOTIF + "via")))) == 4
+    assert rounds[-1]["added"] == 0 and len(rounds) == 6
+    assert sum(r["added"] for r in rounds) == 10 + 4 * 3
+    # The inferred triples only live in a private overlay, never in the manager's graph
+    assert len(rdf.graph) == before
+
+    out_dir = tmp_path / "out"
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=rdf, fixpoint=True)
+    written = rdflib.Graph().parse(out_dir / "reaches_step.ttl")
+    assert len(written) == 6
+
+
+def test_fixpoint_leaves_shared_graph_untouched_on_error(tmp_path: Path, monkeypatch):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=4)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    rules = load_rules(rules_dir, rdf)
+    before = set(rdf.graph.quads())
+    contexts = {c.identifier for c in rdf.graph.graphs()}
+    calls = []
+
+    def failing(rule, solution):
+        calls.append(rule.name)
+        if len(calls) > 5:
+            raise RuntimeError("boom")
+        return real(rule, solution)
+
+    real = fixpoint.fill_template
+    monkeypatch.setattr(fixpoint, "fill_template", failing)
+    with pytest.raises(RuntimeError):
+        run_fixpoint(rdf, rules)
+    assert set(rdf.graph.quads()) == before
+    assert {c.identifier for c in rdf.graph.graphs()} == contexts
+
+
+def test_schedule_orders_dependent_rules(tmp_path: Path):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=4)
+    (rules_dir / "labelled.sparql").write_text(
+        QUERY_PREFIXES + "CONSTRUCT { ?m a motif:Labelled } WHERE { ?m skos:prefLabel ?l }"
+    )
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    rules = load_rules(rules_dir, rdf)
+    deps = rule_dependencies(rules)
+    assert deps["reaches_step"] == {"reaches_base", "reaches_step"}
+    assert deps["labelled"] == set() and deps["reaches_base"] == set()
+    comps = components(rules, deps)
+    assert [[comps[i][0].name for i in stage] for stage in stages(comps, deps)] == [
+        ["labelled", "reaches_base"], ["reaches_step"], ["reaches_last"]
+    ]
+    before = len(rdf.graph)
+
+    expected, _ = run_fixpoint(rdf, rules)
+    outputs, times, comps, deps = run_scheduled(rdf, rules, workers=2)
+    assert {n: len(g) for n, g in outputs.items()} == {n: len(g) for n, g in expected.items()}
+    assert set(outputs["reaches_step"]) == set(expected["reaches_step"])
+    path, total = critical_path(comps, deps, times)
+    assert total <= sum(times)
+    # With equal component times the longest dependency chain is critical
+    path, total = critical_path(comps, deps, [1.0] * len(comps))
+    assert [comps[i][0].name for i in path] == ["reaches_base", "reaches_step", "reaches_last"] and total == 3.0
+    assert len(rdf.graph) == before
+
+
+def test_incremental_inference_reruns_only_affected_rules(tmp_path: Path):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=3)
+    out_dir = tmp_path / "out"
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    mtimes = {p.stem: p.stat().st_mtime_ns for p in out_dir.glob("*.ttl")}
+    checked = {name: e["checked"] for name, e in json.loads((out_dir / ".manifest.json").read_text())["rules"].items()}
+    assert set(mtimes) == set(checked) == {"reaches_base", "reaches_last", "reaches_step"}
+
+    # Only rules reading motif:usesMotif are affected; reaches_step re-runs but its (empty) output stays as is
+    with open(ttl_dir / "chain.ttl", "a") as f:
+        f.write("motif:M2 motif:usesMotif motif:M3 .\n")
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    rules = json.loads((out_dir / ".manifest.json").read_text())["rules"]
+    assert rules["reaches_last"]["checked"] == checked["reaches_last"]
+    assert rules["reaches_step"]["checked"] != checked["reaches_step"]
+    assert (out_dir / "reaches_step.ttl").stat().st_mtime_ns == mtimes["reaches_step"]
+    assert (out_dir / "reaches_base.ttl").stat().st_mtime_ns != mtimes["reaches_base"]
+    assert rules["reaches_base"]["triples"] == 3
+
+    # Blank node labels are not fingerprinted, but the structure around them is
+    parts = PREFIXES + 'motif:M0 motif:part [ motif:name "{}" ] .\nmotif:M1 motif:part [ motif:name "{}" ] .\n'
+    (ttl_dir / "parts.ttl").write_text(parts.format("x", "y"))
+    (rules_dir / "part_names.sparql").write_text(
+        QUERY_PREFIXES + "CONSTRUCT { ?a motif:partName ?n } WHERE { ?a motif:part ?p . ?p motif:name ?n }"
+    )
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    checked = {name: e["checked"] for name, e in json.loads((out_dir / ".manifest.json").read_text())["rules"].items()}
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    assert json.loads((out_dir / ".manifest.json").read_text())["rules"]["part_names"]["checked"] == checked["part_names"]
+    (ttl_dir / "parts.ttl").write_text(parts.format("y", "x"))
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    assert json.loads((out_dir / ".manifest.json").read_text())["rules"]["part_names"]["checked"] != checked["part_names"]
+    names = {(str(s), str(o)) for s, _, o in rdflib.Graph().parse(out_dir / "part_names.ttl")}
+    assert names == {(MOTIF + "M0", "y"), (MOTIF + "M1", "x")}
+
+
+def test_incremental_inference_ignores_its_own_loaded_outputs(tmp_path: Path):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=3)
+    out_dir = ttl_dir / "infer"
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    checked = {name: e["checked"] for name, e in json.loads((out_dir / ".manifest.json").read_text())["rules"].items()}
+
+    # The next build loads the outputs with the sources; their triples are not inputs of the rules
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    rules = json.loads((out_dir / ".manifest.json").read_text())["rules"]
+    assert {name: e["checked"] for name, e in rules.items()} == checked
+
+
+def test_failed_output_write_is_not_recorded(tmp_path: Path, monkeypatch):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=3)
+    out_dir = tmp_path / "out"
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    recorded = json.loads((out_dir / ".manifest.json").read_text())["rules"]["reaches_base"]
+
+    with open(ttl_dir / "chain.ttl", "a") as f:
+        f.write("motif:M2 motif:usesMotif motif:M3 .\n")
+
+    def failing(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(run_inference_module, "_write_output", failing)
+    with pytest.raises(OSError):
+        run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    assert json.loads((out_dir / ".manifest.json").read_text())["rules"]["reaches_base"] == recorded
+
+    monkeypatch.undo()
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None))
+    assert len(rdflib.Graph().parse(out_dir / "reaches_base.ttl")) == 3
+
+
+@pytest.fixture(scope="module")
+def ontology():
+    if not Path("ttl").is_dir():
+        pytest.skip("ttl/ tree not available")
+    rdf = RDFManager(Path("ttl"))
+    return rdf, {rule.name: rule for rule in load_rules(Path("sparql/infer"), rdf)}, PredicateIndex(rdf.graph)
+
+
+@pytest.mark.parametrize("name", sorted(p.stem for p in Path("sparql/infer").glob("*.sparql")))
+def test_compiled_rule_matches_sparql_on_ontology(ontology, name: str):
+    rdf, rules, index = ontology
+    compiled = run_compiled(rules[name], index)
+    assert compiled is not None, f"{name} fell back to rdflib"
+    expected = rdf.graph.query(rules[name].text).graph
+    assert to_isomorphic(compiled) == to_isomorphic(expected)
+
+
+def test_compiled_engine_falls_back_to_rdflib(tmp_path: Path):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=3)
+    (rules_dir / "reaches_path.sparql").write_text(
+        QUERY_PREFIXES + "CONSTRUCT { ?a motif:reaches ?b } WHERE { ?a motif:usesMotif+ ?b }"
+    )
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    rules = {rule.name: rule for rule in load_rules(rules_dir, rdf)}
+    index = PredicateIndex(rdf.graph)
+    with pytest.raises(Unsupported):
+        CompiledRule(rules["reaches_path"], index)
+    assert run_compiled(rules["reaches_path"], index) is None
+    assert len(run_compiled(rules["reaches_base"], index)) == 2
+
+    out_dir = tmp_path / "out"
+    run_inference(rules_dir, out_dir, ttl_dir, rdf=rdf)
+    assert len(rdflib.Graph().parse(out_dir / "reaches_path.ttl")) == 3
+
+
+def test_concurrent_run_logs_schedule_and_failures(tmp_path: Path, caplog):
+    ttl_dir, rules_dir = write_chain(tmp_path, length=3)
+    (rules_dir / "broken.sparql").write_text("CONSTRUCT { ?a ?b ?c } WHERE { ?a ?b }")
+    out_dir = tmp_path / "out"
+    with caplog.at_level("INFO", logger="src.infer.run_inference"):
+        run_inference(rules_dir, out_dir, ttl_dir, rdf=RDFManager(ttl_dir, cache_dir=None), workers=2, engine="sparql")
+    assert {p.stem for p in out_dir.glob("*.ttl")} == {"reaches_base", "reaches_last", "reaches_step"}
+    assert any(r.levelname == "ERROR" and "broken.sparql" in r.getMessage() for r in caplog.records)
+    timed = next(r.getMessage() for r in caplog.records if "with timings" in r.getMessage())
+    assert "stage 1: reaches_base" in timed and "critical path:" in timed
@@ -0,0 +1,169 @@
+from pathlib import Path
+
+from src.rdf_cache import GraphSnapshotCache, QueryResultCache
+from src.rdf_index import GraphStatistics
+from src.rdf_manager import RDFManager
+
+PREFIXES = """@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix motif: <https://ns.onnx.cloud/motif#> .
+"""
+
+
+def write_ttl(ttl_dir: Path):
+    (ttl_dir / "motifs").mkdir(parents=True)
+    (ttl_dir / "motifs" / "a.ttl").write_text(PREFIXES + 'motif:A a motif:Motif ; rdfs:label "A" ; motif:hasPart [ rdfs:label "part" ] .\n')
+    (ttl_dir / "b.ttl").write_text(PREFIXES + 'motif:B a motif:Motif ; rdfs:label "B" .\n')
+
+
+def test_snapshot_roundtrip_skips_parsing(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+
+    first = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert GraphSnapshotCache(cache_dir).snapshot_path(ttl_dir).exists()
+
+    def fail(self, ttl_file):
+        raise AssertionError(f"unexpected parse of {ttl_file}")
+
+    monkeypatch.setattr(RDFManager, "_parse_ttl_file", fail)
+    second = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert len(second.graph) == len(first.graph)
+    assert second.find_resources_by_label("part")
+    assert dict(second.graph.namespaces())["motif"] == dict(first.graph.namespaces())["motif"]
+
+
+def test_snapshot_restores_graph_statistics(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    first = RDFManager(ttl_dir, cache_dir=cache_dir)
+    expected = first.graph_stats(), first.graph_histograms()
+
+    def fail(self):
+        raise AssertionError("unexpected statistics scan")
+
+    monkeypatch.setattr(GraphStatistics, "_count", fail)
+    second = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert (second.graph_stats(), second.graph_histograms()) == expected
+
+    # A changed file rewrites the snapshot together with the statistics of the new graph
+    monkeypatch.undo()
+    (ttl_dir / "b.ttl").write_text(PREFIXES + 'motif:B a motif:Motif ; rdfs:label "B", "Bee" .\n')
+    assert RDFManager(ttl_dir, cache_dir=cache_dir).graph_stats()["triples"] == expected[0]["triples"] + 1
+    monkeypatch.setattr(GraphStatistics, "_count", fail)
+    assert RDFManager(ttl_dir, cache_dir=cache_dir).graph_stats()["triples"] == expected[0]["triples"] + 1
+
+
+def test_snapshot_reparses_only_changed_files(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    RDFManager(ttl_dir, cache_dir=cache_dir)
+
+    (ttl_dir / "b.ttl").write_text(PREFIXES + 'motif:B a motif:Motif ; rdfs:label "B2" .\n')
+    parsed = []
+    original = RDFManager._parse_ttl_file
+
+    def tracking(self, ttl_file):
+        parsed.append(ttl_file.name)
+        return original(self, ttl_file)
+
+    monkeypatch.setattr(RDFManager, "_parse_ttl_file", tracking)
+    rdf = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert parsed == ["b.ttl"]
+    assert rdf.find_resources_by_label("B2") and not rdf.find_resources_by_label("B")
+
+
+def test_cache_entries_and_evict(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    cache = GraphSnapshotCache(tmp_path / "cache")
+    write_ttl(ttl_dir)
+    RDFManager(ttl_dir, cache_dir=cache.cache_dir)
+
+    entries = cache.entries()
+    assert len(entries) == 1
+    assert entries[0]["files"] == 2 and entries[0]["triples"] == 6
+    assert cache.evict([entries[0]["key"]]) == 1
+    assert cache.entries() == []
+
+
+def test_failed_file_is_quarantined_until_it_changes(tmp_path: Path, monkeypatch, caplog):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    (ttl_dir / "broken.ttl").write_text(PREFIXES + "motif:X a ;\n")
+    first = RDFManager(ttl_dir, cache_dir=cache_dir)
+    report = {e["path"]: e for e in first.load_report()}
+    assert report["broken.ttl"]["status"] == "failed" and report["broken.ttl"]["error"]
+    assert report["motifs/a.ttl"]["triples"] == 4 and report["motifs/a.ttl"]["bytes"] > 0
+    assert [e["path"] for e in first.load_report(failed_only=True)] == ["broken.ttl"]
+
+    parsed = []
+    original = RDFManager._parse_ttl_file
+
+    def tracking(self, ttl_file):
+        parsed.append(ttl_file.name)
+        return original(self, ttl_file)
+
+    monkeypatch.setattr(RDFManager, "_parse_ttl_file", tracking)
+    caplog.set_level("WARNING", logger="src.rdf_manager")
+    caplog.clear()
+    second = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert parsed == []
+    assert [r.levelname for r in caplog.records] == ["WARNING"] and "broken.ttl" in caplog.text
+    assert second.load_report(failed_only=True)[0]["path"] == "broken.ttl"
+
+    (ttl_dir / "broken.ttl").write_text(PREFIXES + 'motif:X a motif:Motif ; rdfs:label "X" .\n')
+    fixed = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert parsed == ["broken.ttl"]
+    assert fixed.find_resources_by_label("X") and not fixed.load_report(failed_only=True)
+
+
+def test_graph_load_report_breaks_down_load_time(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    (ttl_dir / "broken.ttl").write_text(PREFIXES + "motif:X a ;\n")
+    report = RDFManager(ttl_dir, cache_dir=cache_dir).graph_load_report()
+    files = {e["path"]: e for e in report["files"]}
+    assert files["motifs/a.ttl"]["source"] == "parsed" and files["motifs/a.ttl"]["triples"] == 4
+    assert files["motifs/a.ttl"]["parse_ms"] > 0 and files["motifs/a.ttl"]["bytes"] > 0
+    assert files["broken.ttl"]["status"] == "failed" and files["broken.ttl"]["error"]
+    assert {d["dir"]: d["files"] for d in report["directories"]} == {".": 2, "motifs": 1}
+    assert report["totals"] == dict(report["totals"], files=3, parsed=2, failed=1, triples=6)
+    assert "load_ms" in report["phases"] and report["triples"] == 6
+
+    cached = RDFManager(ttl_dir, cache_dir=cache_dir).graph_load_report()
+    sources = {e["path"]: e["source"] for e in cached["files"]}
+    assert sources == {"motifs/a.ttl": "snapshot", "b.ttl": "snapshot", "broken.ttl": "quarantined"}
+    assert cached["totals"]["parse_ms"] == 0 and cached["totals"]["snapshot"] == 2
+
+
+def test_query_results_are_cached_until_the_graph_changes(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    query = "SELECT ?m ?label ?part WHERE { ?m rdfs:label ?label OPTIONAL { ?m motif:hasPart ?part } } ORDER BY ?label"
+    first = RDFManager(ttl_dir, cache_dir=cache_dir)
+    rows = first.query_dicts(query)
+    assert rows == first.results_to_dicts(first.execute_query(query))
+    assert rows[0] == {"m": "A", "m_uri": "https://ns.onnx.cloud/motif#A", "label": "A", "part": rows[0]["part"]}
+
+    def fail(self, sparql, bindings=None):
+        raise AssertionError("unexpected query evaluation")
+
+    monkeypatch.setattr(RDFManager, "execute_query", fail)
+    second = RDFManager(ttl_dir, cache_dir=cache_dir)
+    assert second.query_dicts(query) == rows
+    assert second.result_cache_info()["hits"] == 1
+
+    monkeypatch.undo()
+    (ttl_dir / "b.ttl").write_text(PREFIXES + 'motif:B a motif:Motif ; rdfs:label "B2" .\n')
+    second.refresh()
+    assert [r["label"] for r in second.query_dicts(query)] == ["A", "B2", "part"]
+    assert second.result_cache_info()["misses"] == 1
+
+    results = QueryResultCache(cache_dir / "results")
+    assert results.info()["entries"] == 2
+    assert results.prune(max_bytes=0) == 2 and results.info()["entries"] == 0
@@ -0,0 +1,424 @@
+import threading
+import time
+from pathlib import Path
+
+import rdflib
+
+from src.fuse_generator import FuseGenerator
+from src.rdf_manager import RDFManager, _sanitize_opset_content, acquire_rdf_manager, release_rdf_manager
+
+PREFIXES = """@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix motif: <https://ns.onnx.cloud/motif#> .
+"""
+
+
+def write_ttl(ttl_dir: Path, count: int = 6):
+    (ttl_dir / "motifs").mkdir(parents=True)
+    for i in range(count):
+        (ttl_dir / "motifs" / f"m{i}.ttl").write_text(
+            PREFIXES + f'motif:M{i} a motif:Motif ; rdfs:label "M{i}" ; motif:hasPart [ rdfs:label "part{i}" ] .\n'
+        )
+    (ttl_dir / "broken.ttl").write_text(PREFIXES + "motif:X a ;\n")
+
+
+def test_parallel_load_matches_serial(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    serial = RDFManager(ttl_dir, cache_dir=None)
+    parallel = RDFManager(ttl_dir, cache_dir=None, workers=2)
+    assert len(parallel.graph) == len(serial.graph) == 24
+    assert parallel.find_resources_by_label("part3")
+    assert dict(parallel.graph.namespaces())["motif"] == dict(serial.graph.namespaces())["motif"]
+
+
+def test_refresh_reparses_only_changed_files(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    before = len(rdf.graph)
+    assert rdf.refresh() == {"added": [], "changed": [], "removed": []}
+
+    parsed = []
+    original = RDFManager._parse_ttl_file
+
+    def tracking(self, ttl_file):
+        parsed.append(ttl_file.name)
+        return original(self, ttl_file)
+
+    monkeypatch.setattr(RDFManager, "_parse_ttl_file", tracking)
+    (ttl_dir / "motifs" / "m1.ttl").write_text(PREFIXES + 'motif:M1 a motif:Motif ; rdfs:label "Renamed" .\n')
+    (ttl_dir / "motifs" / "m2.ttl").unlink()
+    (ttl_dir / "extra.ttl").write_text(PREFIXES + 'motif:M0 a motif:Motif ; rdfs:label "Extra" .\n')
+
+    changes = rdf.refresh()
+    assert changes == {"added": ["extra.ttl"], "changed": ["motifs/m1.ttl"], "removed": ["motifs/m2.ttl"]}
+    assert sorted(parsed) == ["extra.ttl", "m1.ttl"]
+    assert rdf.find_resources_by_label("Renamed") and not rdf.find_resources_by_label("M1")
+    assert not rdf.find_resources_by_label("M2")
+    # motif:M0 a motif:Motif is asserted by two files; the merged view holds it once
+    assert len(rdf.graph) == before - 4 + 2 - 4 + 1
+    rows = list(rdf.execute_query('SELECT ?s WHERE { ?s a <https://ns.onnx.cloud/motif#Motif> }'))
+    assert len(rows) == 5
+
+
+def test_profile_loads_included_subtrees_and_lazy_namespaces(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    (ttl_dir / "onnx").mkdir()
+    (ttl_dir / "onnx" / "ops.ttl").write_text(
+        '@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n'
+        '@prefix onnx: <https://ns.onnx.cloud/onnx#> .\n'
+        'onnx:Add a onnx:Operator ; rdfs:label "Add" .\n'
+    )
+    profile = {
+        "include": ["motifs"],
+        "lazy": [{"namespace": "https://ns.onnx.cloud/onnx", "include": ["onnx"]}],
+    }
+    rdf = RDFManager(ttl_dir, cache_dir=tmp_path / "cache", profile=profile)
+    assert sorted(rdf.file_fingerprints) == [f"motifs/m{i}.ttl" for i in range(6)]
+    assert not rdf.find_resources_by_label("Add")
+
+    # A query that never mentions the namespace leaves the lazy subtree unloaded
+    rdf.execute_query('SELECT ?s WHERE { ?s a <https://ns.onnx.cloud/motif#Motif> }')
+    assert "onnx/ops.ttl" not in rdf.file_fingerprints
+
+    rows = list(rdf.execute_query('PREFIX onnx: <https://ns.onnx.cloud/onnx#> SELECT ?s WHERE { ?s a onnx:Operator }'))
+    assert len(rows) == 1
+    assert "onnx/ops.ttl" in rdf.file_fingerprints
+
+    # The shared snapshot keeps files from every profile
+    full = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    assert "broken.ttl" in full.file_fingerprints and full.find_resources_by_label("Add")
+
+
+OPSET = """# ONNX operator schema — per-operator file
+@prefix onnx: <https://ns.onnx.cloud/onnx#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+onnx:Op a onnx:Operator ;
+  onnx:hasAttribute [ onnx:name "axis" ; onnx:default "0"^^xsd:integer ; ] ;
+  onnx:hasAttribute [ onnx:name "keepdims" ; onnx:default "1"^^xsd:integer ; ] ;
+  onnx:hasAttribute [ onnx:name "axes" ; onnx:default \"\"\"name: "axes"
+ints: 0\"\"\" ; ] ;
+"""
+
+
+def test_sanitizer_only_rewrites_malformed_opset_literals(tmp_path: Path):
+    # Well-formed generated content (typed and triple-quoted defaults) is left untouched
+    assert _sanitize_opset_content(OPSET + "  onnx:since 1 .\n") == OPSET + "  onnx:since 1 .\n"
+
+    ttl_dir = tmp_path / "ttl"
+    (ttl_dir / "onnx").mkdir(parents=True)
+    legacy = OPSET + '  onnx:attributes "axis: "int"\n  keepdims: 1\n" ;\n  onnx:since 1 .\n'
+    (ttl_dir / "onnx" / "Op.ttl").write_text(legacy)
+    rdf = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    attrs = list(rdf.graph.objects(None, rdflib.URIRef("https://ns.onnx.cloud/onnx#attributes")))
+    assert [str(a) for a in attrs] == ['axis: "int" keepdims: 1 ']
+    assert len(list(rdf.graph.objects(None, rdflib.URIRef("https://ns.onnx.cloud/onnx#default")))) == 3
+    assert len(list((tmp_path / "cache" / "sanitized").glob("*.ttl"))) == 1
+
+
+def test_shared_registry_hands_out_one_manager_per_dir_and_profile(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    rdf = acquire_rdf_manager(ttl_dir, cache_dir=None)
+    fuse = FuseGenerator(ttl_dir, tmp_path / "sparql", tmp_path / "fuse")
+    assert fuse.rdf is rdf
+    motifs_only = acquire_rdf_manager(ttl_dir, profile={"include": ["motifs"]}, cache_dir=None)
+    assert motifs_only is not rdf
+
+    fuse.close()
+    fuse.close()
+    assert release_rdf_manager(motifs_only) == 0
+    assert acquire_rdf_manager(ttl_dir) is rdf
+    assert release_rdf_manager(rdf) == 1
+    assert release_rdf_manager(rdf) == 0
+    fresh = acquire_rdf_manager(ttl_dir, cache_dir=None)
+    assert fresh is not rdf
+    release_rdf_manager(fresh)
+
+
+def test_shared_registry_keys_on_options_and_loads_outside_the_lock(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    plain = acquire_rdf_manager(ttl_dir, cache_dir=None)
+    entailed = acquire_rdf_manager(ttl_dir, rdfs=True, cache_dir=None)
+    array = acquire_rdf_manager(ttl_dir, store="array", cache_dir=None)
+    assert len({id(plain), id(entailed), id(array)}) == 3
+    assert entailed.rdfs and not plain.rdfs and array.store == "array"
+    assert acquire_rdf_manager(ttl_dir, rdfs=True) is entailed
+    for rdf in (plain, entailed, entailed, array):
+        release_rdf_manager(rdf)
+
+    # While one graph loads, acquiring another does not wait and acquiring the same one shares the load
+    slow_dir = tmp_path / "slow"
+    write_ttl(slow_dir)
+    started, proceed = threading.Event(), threading.Event()
+    init = RDFManager.__init__
+
+    def slow_init(self, ttl_dir, *args, **kwargs):
+        if Path(ttl_dir) == slow_dir:
+            started.set()
+            assert proceed.wait(10)
+        init(self, ttl_dir, *args, **kwargs)
+
+    monkeypatch.setattr(RDFManager, "__init__", slow_init)
+    acquired = []
+    threads = [threading.Thread(target=lambda: acquired.append(acquire_rdf_manager(slow_dir, cache_dir=None))) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(10)
+    threads[1].start()
+    other = acquire_rdf_manager(ttl_dir, cache_dir=None)
+    proceed.set()
+    for thread in threads:
+        thread.join(10)
+    assert len(acquired) == 2 and acquired[0] is acquired[1] and acquired[0] is not other
+    assert release_rdf_manager(acquired[0]) == 1 and release_rdf_manager(acquired[0]) == 0
+    release_rdf_manager(other)
+
+
+def test_prepared_queries_are_parsed_once_and_take_bindings(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    query = "SELECT ?label WHERE {  # bound: ?m\n  ?m rdfs:label ?label }"
+    labels = []
+    for i in range(3):
+        rows = rdf.execute_query(query, bindings={"m": rdflib.URIRef(f"https://ns.onnx.cloud/motif#M{i}")})
+        labels.extend(str(r.label) for r in rows)
+    # Same query modulo comments and whitespace reuses the prepared form
+    rows = rdf.execute_query("SELECT ?label WHERE { ?m rdfs:label ?label }", bindings={"label": "M4"})
+    assert labels == ["M0", "M1", "M2"] and len(list(rows)) == 1
+    assert rdf.prepared_query_info() == {"size": 1, "hits": 3, "misses": 1}
+
+    rdf.register_namespace("ex", "https://example.org/")
+    assert rdf.prepared_query_info()["size"] == 0
+
+
+def test_label_index_tracks_refresh_and_match_modes(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    (ttl_dir / "skos.ttl").write_text(
+        PREFIXES + '@prefix skos: <http://www.w3.org/2004/02/skos/core#> .\nmotif:M1 skos:prefLabel "Gated Unit" .\n'
+    )
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    m1 = rdflib.URIRef("https://ns.onnx.cloud/motif#M1")
+    assert rdf.find_resources_by_label("M1") == [m1]
+    assert rdf.find_resources_by_label("m1") == [] and rdf.find_resources_by_label("m1", match="casefold") == [m1]
+    assert len(rdf.find_resources_by_label("PART", match="prefix")) == 6
+    assert rdf.find_resources_by_label("gated", match="prefix", predicates=("label", "prefLabel")) == [m1]
+
+    (ttl_dir / "extra.ttl").write_text(PREFIXES + 'motif:M1 rdfs:label "M1" .\n')
+    rdf.refresh()
+    (ttl_dir / "motifs" / "m1.ttl").unlink()
+    rdf.refresh()
+    # Still labelled by extra.ttl
+    assert rdf.find_resources_by_label("M1") == [m1]
+    (ttl_dir / "extra.ttl").unlink()
+    rdf.refresh()
+    assert rdf.find_resources_by_label("M1") == []
+
+
+def test_properties_many_returns_multi_valued_predicates(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=3)
+    (ttl_dir / "extra.ttl").write_text(PREFIXES + "motif:M0 motif:isComponentOf motif:M1 , motif:M2 .\n")
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    uris = [f"https://ns.onnx.cloud/motif#M{i}" for i in range(3)] + ["https://ns.onnx.cloud/motif#Missing"]
+    props = rdf.get_properties_many(uris)
+    assert sorted(props[uris[0]]["isComponentOf"]) == ["M1", "M2"]
+    assert props[uris[1]]["label"] == ["M1"] and props[uris[1]]["type"] == ["Motif"]
+    assert props[uris[3]] == {}
+    single = rdf.get_motif_properties(uris[0])
+    assert single["label"] == "M0" and single["isComponentOf"] in ("M1", "M2")
+
+
+OPERATORS = """@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix onnx: <https://ns.onnx.cloud/onnx#> .
+onnx:Add a onnx:Operator ; rdfs:label "Add" ; onnx:domain "ai.onnx" ; onnx:sinceVersion 14 ;
+  onnx:hasInput [ onnx:name "A" ] , [ onnx:name "B" ] .
+onnx:Add7 a onnx:Operator ; rdfs:label "Add" ; onnx:domain "ai.onnx" ; onnx:sinceVersion 7 .
+"""
+
+
+def test_operator_specs_are_indexed_and_persisted(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=1)
+    (ttl_dir / "onnx.ttl").write_text(OPERATORS)
+    rdf = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    index = rdf.operator_spec_index()
+    assert sorted(rdf.get_operator_specs()) == ["https://ns.onnx.cloud/onnx#Add", "https://ns.onnx.cloud/onnx#Add7"]
+    assert index.find("Add", "ai.onnx", opset=13)["sinceVersion"] == 7
+    assert index.find("Add")["sinceVersion"] == 14 and index.by_key("ai.onnx", "Add", 7)
+    assert len(index.by_label("Add")) == 2
+    spec = rdf.get_operator_spec(rdflib.URIRef("https://ns.onnx.cloud/onnx#Add"))
+    assert sorted(i["name"] for i in spec["inputs"]) == ["A", "B"]
+    # Callers get a copy they may modify
+    spec["inputs"].clear()
+    assert len(rdf.get_operator_spec(rdflib.URIRef("https://ns.onnx.cloud/onnx#Add"))["inputs"]) == 2
+
+    def fail(self, subj):
+        raise AssertionError(f"unexpected walk of {subj}")
+
+    monkeypatch.setattr(RDFManager, "_build_operator_spec", fail)
+    again = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    assert len(again.get_operator_specs()) == 2
+
+
+def test_results_stream_project_and_convert_to_columns(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=3)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    query = "SELECT ?m ?label WHERE { ?m rdfs:label ?label } ORDER BY ?label"
+    rows = rdf.results_to_dicts(rdf.execute_query(query))
+    assert rows[0] == {"m": "M0", "m_uri": "https://ns.onnx.cloud/motif#M0", "label": "M0"}
+    assert list(rdf.iter_result_dicts(rdf.execute_query(query), columns=["label"])) == [{"label": r["label"]} for r in rows]
+    assert next(rdf.iter_result_dicts(rdf.execute_query(query), uris=False)) == {"m": "M0", "label": "M0"}
+
+    cols = rdf.results_to_columns(rdf.execute_query(query))
+    assert cols["label"] == [r["label"] for r in rows]
+    assert cols["m_uri"] == [r.get("m_uri") for r in rows] and cols["m_uri"][-1] is None
+    arrays = rdf.results_to_columns(rdf.execute_query(query), columns=["m"], uris=False, as_numpy=True)
+    assert list(arrays) == ["m"] and arrays["m"].dtype == object and len(arrays["m"]) == 6
+
+
+def test_query_limits_return_partial_results(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=40)
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    query = "SELECT ?a WHERE { ?a rdfs:label ?l }"
+    assert rdf.execute_query(query).type == "SELECT"
+    capped = rdf.execute_query(query, max_rows=5)
+    assert capped.truncated == "max_rows" and len(list(capped)) == 5
+    assert rdf.execute_query(query, max_rows=500).truncated is None
+
+    # A four-way cartesian product (80^4 rows) cannot finish within the deadline
+    product = "SELECT * WHERE { ?a rdfs:label ?x . ?b rdfs:label ?y . ?c rdfs:label ?z . ?d rdfs:label ?w }"
+    with rdf.query_limits(timeout=0.2):
+        rows = rdf.query_dicts(product)
+        assert rdf.execute_query(product).truncated == "timeout"
+    assert rdf.query_timeout is None
+    assert len(rows) < 80 ** 4
+
+    # ORDER BY sorts the whole product before yielding a row; the deadline still holds
+    ordered = "SELECT ?a ?b WHERE { ?a ?p ?x . ?b ?q ?y . ?c ?r ?z } ORDER BY ?a LIMIT 5"
+    start = time.perf_counter()
+    result = rdf.execute_query(ordered, timeout=0.5)
+    assert result.truncated == "timeout" and list(result) == []
+    assert time.perf_counter() - start < 5
+
+    # Limited queries are prepared once in this process and reused
+    rdf.clear_prepared_queries()
+    hits = rdf.prepared_query_info()["hits"]
+    with rdf.query_limits(timeout=10):
+        for _ in range(3):
+            rows = rdf.query_dicts(query)
+            assert len(rows) == 80 and all(row["a"] for row in rows)
+    assert rdf.prepared_query_info()["size"] == 1 and rdf.prepared_query_info()["hits"] == hits + 2
+
+
+def test_graph_stats_and_histograms_follow_refresh(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=3)
+    # A triple asserted by two files is counted once
+    (ttl_dir / "motifs" / "dup.ttl").write_text(PREFIXES + "motif:M0 a motif:Motif .\n")
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+
+    def scanned():
+        g = rdf.graph
+        return {
+            "triples": len(g),
+            "subjects": len(set(g.subjects())),
+            "predicates": len(set(g.predicates())),
+            "objects": len(set(g.objects())),
+        }
+
+    assert rdf.graph_stats() == scanned()
+    assert rdf.graph_histograms()["types"] == {"https://ns.onnx.cloud/motif#Motif": 3}
+    label = rdf.graph_histograms()["predicates"]["http://www.w3.org/2000/01/rdf-schema#label"]
+    assert label == {"triples": 6, "subjects": 6, "objects": 6}
+
+    (ttl_dir / "motifs" / "dup.ttl").unlink()
+    (ttl_dir / "motifs" / "m2.ttl").unlink()
+    rdf.refresh()
+    assert rdf.graph_stats() == scanned()
+    assert rdf.graph_histograms()["types"] == {"https://ns.onnx.cloud/motif#Motif": 2}
+
+
+def test_optimizer_orders_patterns_by_selectivity(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=4)
+    query = "SELECT ?m ?l WHERE { ?x rdfs:label ?l . ?m motif:hasPart ?x . ?m a motif:Motif }"
+    plain = RDFManager(ttl_dir, cache_dir=None)
+    optimized = RDFManager(ttl_dir, cache_dir=None, optimize=True)
+    rows = sorted(r["l"] for r in optimized.results_to_dicts(optimized.execute_query(query)))
+    assert rows == sorted(r["l"] for r in plain.results_to_dicts(plain.execute_query(query))) == ["part0", "part1", "part2", "part3"]
+
+    plan = optimized.explain(query)
+    (steps,) = plan["bgps"]
+    # 8 label triples, 4 hasPart and 4 Motif instances: the label lookup is joined last
+    assert steps[-1]["pattern"] == "?x rdfs:label ?l"
+    assert [s["actual"] for s in steps] == [4, 4, 4] and steps[-1]["estimated"] == 4.0
+    assert plan["optimized"] and plan["rows"] == 4
+
+
+def test_execute_many_runs_batches_on_processes_and_threads(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=3)
+    (tmp_path / "labels.sparql").write_text("SELECT ?l WHERE { ?m a motif:Motif ; rdfs:label ?l } ORDER BY ?l")
+    rdf = RDFManager(ttl_dir, cache_dir=None)
+    queries = [tmp_path / "labels.sparql", "ASK { motif:M1 a motif:Motif }", "SELECT ?x WHERE { ?x motif:nope ?y"]
+    serial = rdf.execute_many(queries, workers=1)
+    assert list(serial) == ["labels", "query-2", "query-3"]
+    assert [r["l"] for r in serial["labels"]["result"]] == ["M0", "M1", "M2"]
+    assert serial["query-2"]["type"] == "ASK" and serial["query-2"]["result"] is True
+    assert serial["query-3"]["error"] and serial["labels"]["ms"] > 0
+    for executor in ("process", "thread"):
+        batch = rdf.execute_many(queries, workers=2, executor=executor)
+        assert {n: (r["result"], bool(r["error"])) for n, r in batch.items()} == {
+            n: (r["result"], bool(r["error"])) for n, r in serial.items()
+        }
+
+    # Result cache lookups made in forked workers are counted in this process
+    cached = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    texts = {f"q{i}": f"SELECT ?l WHERE {{ motif:M{i} rdfs:label ?l }}" for i in range(3)}
+    assert {r["cache"] for r in cached.execute_many(texts, workers=2, executor="process").values()} == {"miss"}
+    assert {r["cache"] for r in cached.execute_many(texts, workers=2, executor="process").values()} == {"hit"}
+    info = cached.result_cache_info()
+    assert (info["hits"], info["misses"]) == (3, 3)
+
+
+def test_rdfs_materialization_is_cached_and_follows_refresh(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir, count=2)
+    (ttl_dir / "motif.rdfs.ttl").write_text(
+        PREFIXES
+        + "motif:Motif a rdfs:Class ; rdfs:subClassOf motif:Pattern .\n"
+        + "motif:Pattern rdfs:subClassOf motif:Thing .\n"
+        + "motif:hasPart rdfs:subPropertyOf motif:related ; rdfs:range motif:Part .\n"
+        + "motif:related rdfs:domain motif:Thing .\n"
+    )
+    cache_dir = tmp_path / "cache"
+    rdf = RDFManager(ttl_dir, cache_dir=cache_dir, rdfs=True)
+    query = "SELECT ?x WHERE { ?x a <https://ns.onnx.cloud/motif#Thing> }"
+    assert len(list(rdf.execute_query(query))) == 2
+    assert len(list(rdf.execute_query("SELECT ?x WHERE { ?x a <https://ns.onnx.cloud/motif#Part> }"))) == 2
+    related = "SELECT ?x ?y WHERE { ?x <https://ns.onnx.cloud/motif#related> ?y }"
+    assert len(list(rdf.execute_query(related))) == 2
+    closure = "SELECT ?c WHERE { <https://ns.onnx.cloud/motif#Motif> rdfs:subClassOf ?c }"
+    assert {str(r.c).split("#")[1] for r in rdf.execute_query(closure)} == {"Motif", "Pattern", "Thing"}
+    assert len(list((cache_dir / "rdfs").glob("*.json"))) == 1
+    assert rdf.graph_stats()["triples"] == len(rdf.graph)
+    assert rdf.graph_fingerprint() != RDFManager(ttl_dir, cache_dir=None).graph_fingerprint()
+
+    # The schema closure comes from the cache while the schema is unchanged; data changes are picked up
+    def recompute(*args, **kwargs):
+        raise AssertionError("schema closure recomputed")
+
+    monkeypatch.setattr("src.rdf_manager.SchemaClosure.from_triples", recompute)
+    (ttl_dir / "motifs" / "m2.ttl").write_text(PREFIXES + "motif:M2 a motif:Motif .\n")
+    rdf.refresh()
+    assert len(list(rdf.execute_query(query))) == 3
+    (ttl_dir / "motifs" / "m2.ttl").unlink()
+    rdf.refresh()
+    assert len(list(rdf.execute_query(query))) == 2
+    assert rdf.graph_stats()["triples"] == len(rdf.graph)
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+import rdflib
+from rdflib.graph import ModificationException
+
+from src.rdf_manager import RDFManager
+from src.rdf_store import ArrayStore, ImageStore
+
+PREFIXES = """@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix motif: <https://ns.onnx.cloud/motif#> .
+"""
+
+
+def write_ttl(ttl_dir: Path):
+    (ttl_dir / "motifs").mkdir(parents=True)
+    for i in range(4):
+        (ttl_dir / "motifs" / f"m{i}.ttl").write_text(
+            PREFIXES
+            + f'motif:M{i} a motif:Motif ; rdfs:label "M{i}" ; motif:hasPart [ rdfs:label "part{i}" ] ;\n'
+            + f'  motif:next motif:M{(i + 1) % 4} .\n'
+        )
+    # Asserted by two files: the union view must hold it once
+    (ttl_dir / "shared.ttl").write_text(PREFIXES + 'motif:M0 a motif:Motif ; rdfs:comment "shared" .\n')
+
+
+def test_array_store_matches_memory_store(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    memory = RDFManager(ttl_dir, cache_dir=tmp_path / "cache")
+    # Restored from the same snapshot, so both hold identical blank nodes
+    array = RDFManager(ttl_dir, cache_dir=tmp_path / "cache", store="array")
+    assert isinstance(array.graph.store, ArrayStore)
+    assert len(array.graph) == len(memory.graph) == 21
+
+    triples = set(memory.graph.triples((None, None, None)))
+    assert set(array.graph.triples((None, None, None))) == triples
+    for s, p, o in triples:
+        for pattern in [(s, None, None), (None, p, None), (None, None, o), (s, p, None), (None, p, o), (s, None, o), (s, p, o)]:
+            assert sorted(array.graph.triples(pattern)) == sorted(memory.graph.triples(pattern))
+    m0 = rdflib.URIRef("https://ns.onnx.cloud/motif#M0")
+    assert sorted(array.graph.predicate_objects(m0)) == sorted(memory.graph.predicate_objects(m0))
+    typed = (m0, rdflib.RDF.type, rdflib.URIRef("https://ns.onnx.cloud/motif#Motif"))
+    assert len(list(array.graph.store.contexts(typed))) == 2
+
+    query = "SELECT ?m ?l WHERE { ?m a <https://ns.onnx.cloud/motif#Motif> ; <https://ns.onnx.cloud/motif#next>/<http://www.w3.org/2000/01/rdf-schema#label> ?l }"
+    assert sorted(array.execute_query(query)) == sorted(memory.execute_query(query))
+    assert array.find_resources_by_label("part2")
+
+
+def test_array_store_refresh_replaces_file_graphs(tmp_path: Path):
+    ttl_dir = tmp_path / "ttl"
+    write_ttl(ttl_dir)
+    rdf = RDFManager(ttl_dir, cache_dir=None, store="array")
+    (ttl_dir / "shared.ttl").unlink()
+    (ttl_dir / "motifs" / "m1.ttl").write_text(PREFIXES + 'motif:M1 a motif:Motif ; rdfs:label "Renamed" .\n')
+    rdf.refresh()
+    assert len(rdf.graph) == 21 - 1 - 5 + 2
+    assert rdf.find_resources_by_label("Renamed") and not rdf.find_resources_by_label("part1")
+    assert len(rdf.graph.graph(rdf.file_graphs["motifs/m1.ttl"])) == 2
+
+
+def test_image_store_is_shared_read_only_and_rebuilt_when_stale(tmp_path: Path, monkeypatch):
+    ttl_dir = tmp_path / "ttl"
+    cache_dir = tmp_path / "cache"
+    write_ttl(ttl_dir)
+    memory = RDFManager(ttl_dir, cache_dir=cache_dir)
+    first = RDFManager(ttl_dir, cache_dir=cache_dir, store="image")
+    assert first.image_path().exists()
+
+    def fail(self, ttl_file):
+        raise AssertionError(f"unexpected parse of {ttl_file}")
+
+    monkeypatch.setattr(RDFManager, "_parse_ttl_file", fail)
+    worker = RDFManager(ttl_dir, cache_dir=cache_dir, store="image")
+    assert isinstance(worker.graph.store, ImageStore)
+    assert set(worker.graph.triples((None, None, None))) == set(memory.graph.triples((None, None, None)))
+    assert len(worker.graph) == 21 and worker.graph_stats() == memory.graph_stats()
+    assert worker.find_resources_by_label("part2")
+    query = "SELECT ?m WHERE { ?m <https://ns.onnx.cloud/motif#next> <https://ns.onnx.cloud/motif#M0> }"
+    assert [str(r.m) for r in worker.execute_query(query)] == ["https://ns.onnx.cloud/motif#M3"]
+    with pytest.raises(ModificationException):
+        worker.graph.add((rdflib.URIRef("urn:x"), rdflib.RDFS.label, rdflib.Literal("x")))
+
+    monkeypatch.undo()
+    (ttl_dir / "motifs" / "m1.ttl").write_text(PREFIXES + 'motif:M1 a motif:Motif ; rdfs:label "Renamed" .\n')
+    assert worker.refresh() == {"added": [], "changed": ["motifs/m1.ttl"], "removed": []}
+    assert worker.find_resources_by_label("Renamed") and not worker.find_resources_by_label("part1")
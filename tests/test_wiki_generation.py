@@ -44,3 +44,28 @@ def test_generate_types_minimal(tmp_path: Path):
     # search index should include generated pages
     si = [s for s in gen.search_index if s.get("category") == "motif"]
     assert len(si) > 0, "Expected search index entries for generated motif pages"
+
+
+def test_foreach_row_cap_applies_to_foreach_sections_only(tmp_path: Path, monkeypatch):
+    gen = WikiGenerator(Path("config/wiki.yaml"))
+    gen.output_dir = tmp_path
+    labels = "SELECT ?item ?label WHERE { ?item rdfs:label ?label }"
+    gen.config = {
+        "policy": {"query_timeout_seconds": 30, "max_foreach_rows": 2},
+        "pages": [
+            {
+                "name": "page",
+                "body": {"query": labels, "template": "cards/motifs.mustache", "foreach": True},
+                "left": {"query": labels, "template": "cards/links.mustache"},
+                "right": {"query": labels, "template": "cards/categories.mustache", "max_rows": 3},
+            }
+        ],
+    }
+    rendered = {}
+    monkeypatch.setattr(gen, "render_page", lambda name, spec, data: rendered.update(data) or "")
+    gen.generate_all()
+
+    # left has no cap and renders its rows as items too
+    assert len(rendered["items"]) == 2 + len(gen.rdf.query_dicts(labels))
+    assert len(rendered["categories"]) == 3
+    assert gen.rdf.query_timeout is None and gen.rdf.max_rows is None